@@ -0,0 +1,240 @@
+# Nama file: calc_context.py
+# Deskripsi: Konteks kalkulasi copy-on-write di atas WellDataStore. Service
+# bekerja pada satu frame kerja, lalu hanya kolom yang baru/berubah yang
+# ditulis kembali ke partisi Arrow sebagai delta. Kolom yang tidak berubah
+# tetap berbagi buffer Arrow yang sama, tanpa salinan tambahan.
+
+from typing import Callable, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .well_store import PROJECTION_COLUMNS, WellDataStore
+
+# Nama index frame kerja. Label baris hanya dipercaya sebagai posisi store jika
+# nama ini masih ada (dropna/filter mempertahankannya; concat dengan
+# ignore_index, merge dan reset_index menghilangkannya)
+ROW_LABEL = '_store_row'
+
+
+class CalculationDelta:
+    """
+    Hasil sebuah kalkulasi relatif terhadap store.
+
+    Attributes:
+        columns (List[str]): Kolom baru atau kolom yang nilainya berubah.
+        values (pd.DataFrame): Nilai kolom-kolom tersebut, satu baris per baris
+            frame kerja (urutan sama dengan WellDataStore.to_pandas(wells)).
+        replacement (pd.DataFrame): Diisi jika jumlah/urutan baris berubah
+            sehingga delta kolom tidak bisa dipakai; partisi sumur diganti utuh.
+        num_rows (int): Jumlah baris hasil service.
+        result (pd.DataFrame): Hasil service yang sudah diselaraskan dengan
+            baris frame kerja (None untuk replacement).
+    """
+
+    def __init__(self, columns: List[str], values: Optional[pd.DataFrame],
+                 replacement: Optional[pd.DataFrame], num_rows: int,
+                 result: Optional[pd.DataFrame] = None):
+        self.columns = columns
+        self.values = values
+        self.replacement = replacement
+        self.num_rows = num_rows
+        self.result = result
+
+    @property
+    def is_replacement(self) -> bool:
+        return self.replacement is not None
+
+
+class CalculationContext:
+    """
+    Menyiapkan frame kerja untuk sumur tertentu (None = semua partisi) dan
+    menghitung/menerapkan delta hasil service.
+
+    Frame kerja adalah satu-satunya salinan pandas selama kalkulasi; service
+    boleh menambah kolom langsung ke frame ini tanpa df.copy().
+
+    Jika `columns` (kolom yang dibaca service) diberikan, frame kerja hanya
+    berisi kolom tersebut ditambah kolom proyeksi (WELL_NAME, MARKER, DEPTH).
+    Kolom lain tidak pernah dikonversi ke pandas; kolom hasil di luar frame
+    kerja dianggap ditulis service dan tidak dibandingkan dengan store.
+
+    Jika `markers` diberikan, frame kerja hanya berisi baris dengan MARKER
+    tersebut. Hasil service digabung kembali ke baris-baris itu saja; baris
+    lain mempertahankan nilai lama (atau NaN untuk kolom baru).
+    """
+
+    def __init__(self, store: WellDataStore, wells: Optional[Iterable] = None,
+                 markers: Optional[Iterable] = None, marker_column: str = 'MARKER',
+                 columns: Optional[Iterable[str]] = None):
+        self.store = store
+        self.wells = None if wells is None else [w for w in wells if store.has_well(w)]
+        self.columns = None  # kolom frame kerja (None = semua kolom store)
+        if columns is not None:
+            wanted = set(columns) | set(PROJECTION_COLUMNS) | {store.well_column, marker_column}
+            self.columns = [col for col in store.columns if col in wanted]
+        self.frame = store.to_pandas(self.wells, self.columns)
+        self.input_columns = list(self.frame.columns)  # sebelum service menambah kolom
+        self.rows = None  # posisi baris terpilih di dalam to_pandas(wells)
+        if markers is not None:
+            if marker_column not in self.frame.columns:
+                raise ValueError(f"Kolom {marker_column} tidak ditemukan untuk filter interval.")
+            mask = self.frame[marker_column].isin(list(markers)).to_numpy()
+            self.rows = np.flatnonzero(mask)
+            self.frame = self.frame[mask]
+        self.frame.index.name = ROW_LABEL
+
+    @property
+    def store_rows(self) -> int:
+        if self.wells is None:
+            return self.store.num_rows
+        return sum(self.store.well_num_rows(w) for w in self.wells)
+
+    def run(self, func: Callable, *args, **kwargs) -> CalculationDelta:
+        """Menjalankan func(frame_kerja, *args, **kwargs) dan mengembalikan deltanya."""
+        return self.diff(func(self.frame, *args, **kwargs))
+
+    def _store_keys(self) -> pd.DataFrame:
+        """(Internal) Kolom sumur dan DEPTH store untuk baris frame kerja."""
+        keys = self.store.to_pandas(self.wells, [self.store.well_column, 'DEPTH'])
+        return keys if self.rows is None else keys.iloc[self.rows]
+
+    def _same_wells(self, result: pd.DataFrame) -> bool:
+        """(Internal) Apakah urutan sumur hasil sama dengan frame kerja, baris per baris."""
+        well_column = self.store.well_column
+        if well_column not in result.columns:
+            return True
+        expected = self._store_keys()[well_column]
+        return np.array_equal(result[well_column].to_numpy(dtype=object),
+                              expected.to_numpy(dtype=object))
+
+    def _align_by_depth(self, result: pd.DataFrame, expected: pd.Index):
+        """
+        (Internal) Menyelaraskan hasil lewat (sumur, DEPTH); dipakai jika service
+        membuang baris/sumur dan label baris asli hilang. None jika kunci
+        tidak ada, tidak unik, atau hasil berisi baris yang tidak ada di store.
+        """
+        well_column = self.store.well_column
+        if well_column not in result.columns or 'DEPTH' not in result.columns:
+            return None, None
+        target = pd.MultiIndex.from_frame(self._store_keys().astype(object))
+        source = pd.MultiIndex.from_frame(result[[well_column, 'DEPTH']].astype(object))
+        if not target.is_unique or not source.is_unique or not source.isin(target).all():
+            return None, None
+        positions = source.get_indexer(target)
+        aligned = result.set_axis(source, axis=0).reindex(target)
+        aligned.index = expected
+        return aligned, positions >= 0
+
+    def _align(self, result: pd.DataFrame):
+        """
+        (Internal) Menyelaraskan baris hasil dengan frame kerja. Mengembalikan
+        (frame, present): present adalah mask baris frame kerja yang ada di
+        hasil (None = semua). Posisional jika jumlah baris dan urutan sumur
+        sama; berdasarkan label baris jika service hanya membuang baris dan
+        label aslinya masih ada (mis. dropna); selain itu lewat (sumur, DEPTH).
+        (None, None) jika baris tidak bisa dipetakan.
+        """
+        expected = pd.RangeIndex(self.store_rows) if self.rows is None else pd.Index(self.rows)
+        if len(result) == len(expected) and self._same_wells(result):
+            # Label index diganti langsung agar data tidak ikut tersalin
+            result.index = expected
+            return result, None
+        if (result.index.name == ROW_LABEL and result.index.is_unique
+                and result.index.isin(expected).all()):
+            return result.reindex(expected), expected.isin(result.index)
+        return self._align_by_depth(result, expected)
+
+    def _store_column(self, col: str) -> Optional[pd.Series]:
+        """(Internal) Nilai satu kolom store untuk sumur konteks; None jika tidak ada."""
+        reference = self.store.to_pandas(self.wells, columns=[col])
+        return reference[col] if col in reference.columns else None
+
+    def diff(self, result: pd.DataFrame) -> CalculationDelta:
+        """
+        Menentukan kolom yang ditulis service. Hanya kolom frame kerja yang
+        dibandingkan dengan store (satu kolom per konversi); kolom di luar
+        frame kerja langsung menjadi bagian delta.
+        """
+        aligned, present = self._align(result)
+        if aligned is None:
+            if self.rows is not None:
+                raise ValueError("Service mengubah jumlah baris; tidak dapat digabung ke interval terpilih.")
+            if self.columns is not None:
+                raise ValueError("Service mengubah jumlah baris; partisi tidak bisa diganti dari frame kerja terproyeksi.")
+            return CalculationDelta(list(result.columns), None, result, len(result))
+
+        existing = set(self.store.columns)
+        read = existing if self.columns is None else set(self.columns)
+        changed = {}
+        for col in aligned.columns:
+            if self.rows is None:
+                reference = None
+                if col in existing and (col in read or present is not None):
+                    reference = self._store_column(col)
+                if reference is not None and present is not None:
+                    # Baris yang dibuang service mempertahankan nilai lama
+                    aligned[col] = aligned[col].where(present, reference)
+                if col in read and reference is not None and aligned[col].equals(reference):
+                    continue
+                changed[col] = aligned[col]
+                continue
+
+            reference = self._store_column(col) if col in existing else None
+            if reference is None:
+                changed[col] = aligned[col].reindex(pd.RangeIndex(self.store_rows))
+            elif col not in read or present is not None or \
+                    not aligned[col].equals(reference.iloc[self.rows]):
+                # Baris di luar interval (atau yang dibuang service)
+                # mempertahankan nilai lama
+                in_rows = np.zeros(len(reference), dtype=bool)
+                in_rows[self.rows if present is None else self.rows[present]] = True
+                changed[col] = aligned[col].reindex(reference.index).where(in_rows, reference)
+
+        values = pd.DataFrame(changed, index=pd.RangeIndex(self.store_rows))
+        return CalculationDelta(list(changed), values, None, len(result), aligned)
+
+    def written_columns(self, delta: CalculationDelta) -> List[str]:
+        """Kolom hasil yang ditulis service: kolom yang berubah dan kolom di luar frame kerja awal."""
+        if delta.is_replacement:
+            return list(delta.replacement.columns)
+        inputs = set(self.input_columns)
+        changed = set(delta.columns)
+        return [col for col in delta.result.columns if col in changed or col not in inputs]
+
+    def split_by_well(self, delta: CalculationDelta, columns: Optional[List[str]] = None) -> dict:
+        """
+        Memecah delta menjadi {sumur: (jenis, DataFrame)} dengan jenis 'columns'
+        (kolom turunan untuk baris sumur tsb.) atau 'replace' (partisi utuh).
+        Jika `columns` diberikan, nilai utuh kolom-kolom tersebut diambil dari
+        hasil service (bukan hanya kolom yang berubah terhadap store), sehingga
+        bagian ini bisa diterapkan ulang apa pun isi store saat itu.
+        Dipanggil sebelum commit, selagi jumlah baris per sumur masih sama.
+        """
+        well_column = self.store.well_column
+        if delta.is_replacement:
+            if well_column not in delta.replacement.columns:
+                return {}
+            return {well: ('replace', df_well.reset_index(drop=True))
+                    for well, df_well in delta.replacement.groupby(well_column, sort=False)}
+
+        wells = self.store.wells if self.wells is None else self.wells
+        parts = {}
+        offset = 0
+        for well in wells:
+            num_rows = self.store.well_num_rows(well)
+            if columns is None:
+                part = delta.values.iloc[offset:offset + num_rows].copy()
+            else:
+                part = delta.result[columns].iloc[offset:offset + num_rows].copy()
+            parts[well] = ('columns', part.reset_index(drop=True))
+            offset += num_rows
+        return parts
+
+    def commit(self, delta: CalculationDelta) -> List[str]:
+        """Menerapkan delta ke store dan mengembalikan kolom yang berubah."""
+        if delta.is_replacement:
+            self.store.update_from_dataframe(delta.replacement)
+        elif delta.columns:
+            self.store.apply_columns(delta.values, self.wells)
+        return delta.columns
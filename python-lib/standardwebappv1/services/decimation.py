@@ -0,0 +1,146 @@
+# Nama file: decimation.py
+# Deskripsi: Decimation kurva log terhadap depth untuk rendering. Memilih
+# subset indeks sampel yang mempertahankan bentuk kurva (spike, crossover,
+# dan celah NaN) sehingga jumlah titik sebanding dengan tinggi plot dalam
+# piksel, bukan jumlah sampel.
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+DECIMATION_METHODS = ('minmax', 'lttb')
+
+
+def _bucket_starts(depth: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    (Internal) Indeks awal tiap bucket. Bucket dibagi rata menurut depth
+    (setara satu piksel vertikal) jika depth monoton naik, selain itu menurut
+    jumlah sampel.
+    """
+    n = len(depth)
+    finite = depth[np.isfinite(depth)]
+    if len(finite) > 1 and np.all(np.diff(finite) >= 0) and finite[-1] > finite[0]:
+        edges = np.linspace(finite[0], finite[-1], n_buckets + 1)[1:-1]
+        starts = np.concatenate(([0], np.searchsorted(depth, edges, side='left')))
+    else:
+        starts = np.linspace(0, n, n_buckets + 1)[:-1].astype(np.intp)
+    # Bucket kosong dibuang agar reduceat tidak mengulang elemen
+    return np.unique(starts[starts < n])
+
+
+def _gap_indices(values: np.ndarray) -> np.ndarray:
+    """(Internal) Sampel di kedua sisi setiap batas nilai valid/NaN."""
+    finite = np.isfinite(values)
+    change = np.flatnonzero(finite[1:] != finite[:-1])
+    return np.concatenate((change, change + 1))
+
+
+def minmax_indices(depth, values, n_buckets: int) -> np.ndarray:
+    """
+    Indeks sampel minimum dan maksimum per bucket depth. Spike dan titik
+    crossover tetap terlihat karena ekstrem setiap bucket selalu dipertahankan.
+
+    Args:
+        depth (array-like): Depth per sampel.
+        values (array-like): Nilai kurva per sampel.
+        n_buckets (int): Jumlah bucket (mis. tinggi plot dalam piksel).
+
+    Returns:
+        np.ndarray: Indeks terurut (unik), termasuk sampel pertama, terakhir,
+        dan batas celah NaN.
+    """
+    depth = np.asarray(depth, dtype=float)
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    starts = _bucket_starts(depth, n_buckets)
+    counts = np.diff(np.append(starts, n))
+    index = np.arange(n)
+
+    nan_mask = np.isnan(values)
+    low = np.where(nan_mask, np.inf, values)
+    high = np.where(nan_mask, -np.inf, values)
+    is_min = low == np.repeat(np.minimum.reduceat(low, starts), counts)
+    is_max = high == np.repeat(np.maximum.reduceat(high, starts), counts)
+    argmin = np.minimum.reduceat(np.where(is_min, index, n), starts)
+    argmax = np.minimum.reduceat(np.where(is_max, index, n), starts)
+
+    selected = np.concatenate(([0, n - 1], argmin, argmax, _gap_indices(values)))
+    return np.unique(selected[selected < n])
+
+
+def lttb_indices(depth, values, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: memilih n_out sampel yang memaksimalkan
+    luas segitiga dengan titik terpilih sebelumnya dan rata-rata bucket
+    berikutnya. Sampel NaN tidak ikut dipilih, tetapi batas celahnya
+    dipertahankan.
+    """
+    depth = np.asarray(depth, dtype=float)
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    valid = np.flatnonzero(np.isfinite(values) & np.isfinite(depth))
+    if len(valid) <= n_out:
+        return np.unique(np.concatenate((valid, [0, n - 1], _gap_indices(values))))
+
+    x = depth[valid]
+    y = values[valid]
+    m = len(valid)
+    edges = (np.linspace(1, m - 1, n_out - 1)).astype(np.intp)
+
+    chosen = np.empty(n_out, dtype=np.intp)
+    chosen[0] = 0
+    chosen[-1] = m - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], max(edges[b + 1], edges[b] + 1)
+        next_lo, next_hi = hi, (edges[b + 2] if b + 2 < len(edges) else m)
+        if next_hi <= next_lo:
+            next_hi = min(next_lo + 1, m)
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        area = np.abs((x[prev] - avg_x) * (y[lo:hi] - y[prev])
+                      - (x[prev] - x[lo:hi]) * (avg_y - y[prev]))
+        prev = lo + int(np.argmax(area))
+        chosen[b + 1] = prev
+
+    selected = np.concatenate((valid[chosen], [0, n - 1], _gap_indices(values)))
+    return np.unique(selected)
+
+
+def decimate_indices(depth, values, max_points: int, method: str = 'minmax') -> np.ndarray:
+    """
+    Indeks sampel yang dipertahankan agar kurva memakai sekitar max_points titik.
+    Kurva yang sudah cukup pendek dikembalikan utuh.
+    """
+    if method not in DECIMATION_METHODS:
+        raise ValueError(f"Metode decimation tidak dikenal: {method}. Pilihan: {DECIMATION_METHODS}")
+    n = len(values)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+    if method == 'lttb':
+        return lttb_indices(depth, values, max_points)
+    # Dua titik (min & max) per bucket
+    return minmax_indices(depth, values, max(1, max_points // 2))
+
+
+def depth_window_indices(depth, depth_range: Optional[Sequence[float]]) -> np.ndarray:
+    """
+    Indeks sampel di dalam rentang depth [top, bottom], ditambah satu sampel
+    di luar setiap tepi agar garis tetap tersambung sampai batas plot.
+    """
+    depth = np.asarray(depth, dtype=float)
+    if depth_range is None:
+        return np.arange(len(depth))
+    top, bottom = sorted(depth_range)
+    inside = np.flatnonzero((depth >= top) & (depth <= bottom))
+    if len(inside) == 0:
+        return inside
+    lo = max(inside[0] - 1, 0)
+    hi = min(inside[-1] + 1, len(depth) - 1)
+    return np.unique(np.concatenate(([lo, hi], inside)))
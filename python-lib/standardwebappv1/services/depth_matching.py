@@ -6,6 +6,10 @@ from scipy.interpolate import interp1d
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Implementasi C (warping_path_fast) jika tersedia di versi dtaidistance
+_dtw_path = getattr(dtw, 'warping_path_fast', dtw.warping_path)
 
 
 def normalize(series):
@@ -16,10 +20,62 @@ def normalize(series):
     return (series - np.mean(series)) / std_dev
 
 
-def depth_matching(ref_las_path: str, lwd_las_path: str, num_chunks: int = 10):
+def _warping_path(lwd_signal, ref_signal, window=None, max_dist=None):
+    """
+    (Internal) Warping path DTW dengan band Sakoe-Chiba (`window`) dan/atau
+    batas `max_dist`. Jika batas max_dist terlampaui, path dihitung ulang
+    tanpa batas tersebut.
+    """
+    settings = {}
+    if window is not None:
+        settings['window'] = int(window)
+    if max_dist is not None:
+        settings['max_dist'] = float(max_dist)
+
+    path, distance = _dtw_path(lwd_signal, ref_signal, include_distance=True, **settings)
+    if max_dist is not None and not np.isfinite(distance):
+        settings.pop('max_dist')
+        path = _dtw_path(lwd_signal, ref_signal, **settings)
+    return np.asarray(path, dtype=np.intp)
+
+
+def _align_chunk(ref_depth, ref_gr, lwd_dgrcc, core, window=None, max_dist=None):
+    """
+    (Internal) Menyelaraskan satu chunk (yang sudah diperluas dengan overlap)
+    dan mengembalikan hasil hanya untuk baris inti referensi `core` (slice).
+    """
+    ref_signal = normalize(ref_gr)
+    lwd_signal = normalize(lwd_dgrcc)
+
+    path = _warping_path(lwd_signal, ref_signal, window=window, max_dist=max_dist)
+
+    # Pemetaan path dengan fancy indexing
+    aligned_depths = ref_depth[path[:, 1]]
+    aligned_dgrcc = lwd_dgrcc[path[:, 0]]
+    order = np.argsort(aligned_depths, kind='quicksort')
+
+    interp_func = interp1d(aligned_depths[order], aligned_dgrcc[order],
+                           kind='linear', bounds_error=False, fill_value="extrapolate")
+
+    return pd.DataFrame({
+        "Depth": ref_depth[core],
+        "REF_GR": ref_gr[core],
+        "LWD_DGRCC_Aligned": interp_func(ref_depth[core])
+    })
+
+
+def depth_matching(ref_las_path: str, lwd_las_path: str, num_chunks: int = 10,
+                   window: int = None, max_dist: float = None,
+                   overlap: int = 0, n_jobs: int = None):
     """
     Menjalankan logika DTW dan mengembalikan tiga DataFrame: 
     data referensi, data LWD asli, dan data hasil alignment.
+
+    Args:
+        window (int): Lebar band Sakoe-Chiba (sampel); None = tanpa batas.
+        max_dist (float): Batas jarak DTW untuk early-abandon; None = tanpa batas.
+        overlap (int): Jumlah sampel overlap di kedua sisi setiap chunk.
+        n_jobs (int): Jumlah proses paralel; None = semua core, 1 = sekuensial.
     """
     try:
         ref_las = lasio.read(ref_las_path)
@@ -31,59 +87,47 @@ def depth_matching(ref_las_path: str, lwd_las_path: str, num_chunks: int = 10):
         lwd_df = lwd_las.df().reset_index()[["DEPTH", "DGRCC"]].dropna()
         lwd_df.columns = ["Depth", "DGRCC"]
 
+        ref_depth = ref_df["Depth"].values
+        ref_gr = ref_df["GR"].values
+        lwd_dgrcc = lwd_df["DGRCC"].values
+
         N_ref = len(ref_df)
         N_lwd = len(lwd_df)
 
         ref_chunk_size = N_ref // num_chunks
         lwd_chunk_size = N_lwd // num_chunks
 
-        all_chunks = []
-
+        tasks = []
         for i in range(num_chunks):
             ref_start = i * ref_chunk_size
             ref_end = N_ref if i == num_chunks - \
                 1 else (i + 1) * ref_chunk_size
-            ref_chunk = ref_df.iloc[ref_start:ref_end]
 
             lwd_start = i * lwd_chunk_size
             lwd_end = N_lwd if i == num_chunks - \
                 1 else (i + 1) * lwd_chunk_size
-            lwd_chunk = lwd_df.iloc[lwd_start:lwd_end]
 
-            if len(ref_chunk) < 2 or len(lwd_chunk) < 2:
+            if ref_end - ref_start < 2 or lwd_end - lwd_start < 2:
                 continue
 
-            ref_signal = normalize(ref_chunk["GR"].values)
-            lwd_signal = normalize(lwd_chunk["DGRCC"].values)
-
-            path = dtw.warping_path(lwd_signal, ref_signal)
-
-            aligned_depths = []
-            aligned_dgrcc = []
-            for lwd_idx, ref_idx in path:
-                aligned_depths.append(ref_chunk.iloc[ref_idx]["Depth"])
-                aligned_dgrcc.append(lwd_chunk.iloc[lwd_idx]["DGRCC"])
-
-            aligned_df = pd.DataFrame({
-                "Depth": aligned_depths,
-                "Aligned_DGRCC": aligned_dgrcc
-            }).sort_values(by="Depth")
-
-            interp_func = interp1d(aligned_df["Depth"], aligned_df["Aligned_DGRCC"],
-                                   kind='linear', bounds_error=False, fill_value="extrapolate")
-            interp_dgrcc = interp_func(ref_chunk["Depth"].values)
+            # Perluas chunk dengan overlap agar sambungan antar chunk mulus
+            ref_lo, ref_hi = max(0, ref_start - overlap), min(N_ref, ref_end + overlap)
+            lwd_lo, lwd_hi = max(0, lwd_start - overlap), min(N_lwd, lwd_end + overlap)
+            core = slice(ref_start - ref_lo, ref_end - ref_lo)
 
-            chunk_result = pd.DataFrame({
-                "Depth": ref_chunk["Depth"].values,
-                "REF_GR": ref_chunk["GR"].values,
-                "LWD_DGRCC_Aligned": interp_dgrcc
-            })
+            tasks.append((ref_depth[ref_lo:ref_hi], ref_gr[ref_lo:ref_hi],
+                          lwd_dgrcc[lwd_lo:lwd_hi], core, window, max_dist))
 
-            all_chunks.append(chunk_result)
+        n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(tasks)))
+        if n_jobs == 1:
+            all_chunks = [_align_chunk(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                all_chunks = list(executor.map(_align_chunk, *zip(*tasks)))
 
-            final_df = pd.concat(all_chunks, ignore_index=True)
-            final_df = final_df.drop_duplicates(
-                subset="Depth").sort_values(by="Depth")
+        final_df = pd.concat(all_chunks, ignore_index=True)
+        final_df = final_df.drop_duplicates(
+            subset="Depth").sort_values(by="Depth")
 
     except Exception as e:
         print(f"Error di dalam depth_matching_logic: {e}")
@@ -0,0 +1,273 @@
+# Nama file: depth_pyramid.py
+# Deskripsi: Piramida level-of-detail per sumur untuk tampilan log. Level-level
+# berturut-turut merangkum 2, 4, 8, ... sampel berurutan (menurut depth)
+# menjadi satu bucket berisi min/max/mean float32, sehingga plot overview dan zoom-out tidak
+# perlu menyentuh data mentah. Piramida disinkronkan dengan WellDataStore
+# lewat versi kolom: hanya kolom baru/berubah yang dihitung ulang.
+
+import copy
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .well_store import WellDataStore
+
+# Level paling kasar masih memiliki setidaknya sekian bucket
+MIN_BUCKETS = 64
+
+
+def _reduce_level(values: np.ndarray, factor: int):
+    """(Internal) min/max/mean (float32) per bucket `factor` sampel; NaN diabaikan."""
+    n_buckets = -(-len(values) // factor)
+    padded = np.full(n_buckets * factor, np.nan)
+    padded[:len(values)] = values
+    blocks = padded.reshape(n_buckets, factor)
+
+    valid = ~np.isnan(blocks)
+    count = valid.sum(axis=1)
+    total = np.where(valid, blocks, 0.0).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+    low = np.where(valid, blocks, np.inf).min(axis=1)
+    high = np.where(valid, blocks, -np.inf).max(axis=1)
+    empty = count == 0
+    low[empty] = np.nan
+    high[empty] = np.nan
+    return low.astype(np.float32), high.astype(np.float32), mean.astype(np.float32)
+
+
+class DepthPyramid:
+    """
+    Piramida satu sumur. Level 0 = bucket 2 sampel, level k = 2^(k+1) sampel.
+
+    Attributes:
+        num_rows (int): Jumlah baris sumur saat piramida dibangun.
+        order (np.ndarray): Posisi baris sumur menurut depth naik (tanpa
+            depth NaN); bucket i di level k mencakup order[i*f:(i+1)*f].
+        factors (List[int]): Jumlah sampel per bucket untuk setiap level.
+        versions (dict): Versi kolom store yang sudah tercermin di piramida.
+    """
+
+    def __init__(self, depth, min_buckets: int = MIN_BUCKETS):
+        depth = np.asarray(depth, dtype=float)
+        self.num_rows = len(depth)
+        order = np.argsort(depth, kind='stable')
+        self.order = order[~np.isnan(depth[order])]
+        sorted_depth = depth[self.order]
+
+        self.factors = []
+        factor = 2
+        while len(sorted_depth) // factor >= min_buckets:
+            self.factors.append(factor)
+            factor *= 2
+
+        # Batas depth setiap bucket, untuk pemotongan jendela dan plot
+        self.depth_top = []
+        self.depth_bottom = []
+        for factor in self.factors:
+            starts = np.arange(0, len(sorted_depth), factor)
+            stops = np.minimum(starts + factor, len(sorted_depth)) - 1
+            self.depth_top.append(sorted_depth[starts].astype(np.float32))
+            self.depth_bottom.append(sorted_depth[stops].astype(np.float32))
+
+        self.stats: Dict[str, List[tuple]] = {}
+        self.versions = {}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.stats)
+
+    @property
+    def nbytes(self) -> int:
+        total = sum(a.nbytes for a in self.depth_top) + sum(a.nbytes for a in self.depth_bottom)
+        for levels in self.stats.values():
+            total += sum(array.nbytes for level in levels for array in level)
+        return total + self.order.nbytes
+
+    def set_column(self, name: str, values, version: int = 0) -> None:
+        """Menghitung (ulang) semua level untuk satu kolom; values urut baris sumur."""
+        values = np.asarray(values, dtype=float)[self.order]
+        self.stats[name] = [_reduce_level(values, factor) for factor in self.factors]
+        self.versions[name] = version
+
+    def drop_column(self, name: str) -> None:
+        self.stats.pop(name, None)
+        self.versions.pop(name, None)
+
+    def choose_level(self, num_samples: int, max_points: Optional[int]) -> Optional[int]:
+        """
+        Level paling kasar yang masih memberi >= max_points titik (min + max
+        per bucket) untuk `num_samples` sampel; None jika data mentah sudah
+        cukup kecil atau tidak ada level yang sesuai.
+        """
+        if not max_points or num_samples <= max_points:
+            return None
+        chosen = None
+        for level, factor in enumerate(self.factors):
+            if 2 * (num_samples // factor) >= max_points:
+                chosen = level
+            else:
+                break
+        return chosen
+
+    def bucket_slice(self, level: int, top: Optional[float] = None,
+                     bottom: Optional[float] = None) -> slice:
+        """Bucket level `level` yang beririsan dengan [top, bottom], plus satu di setiap sisi."""
+        n = len(self.depth_top[level])
+        start = 0 if top is None else int(np.searchsorted(self.depth_bottom[level], top, side='left'))
+        stop = n if bottom is None else int(np.searchsorted(self.depth_top[level], bottom, side='right'))
+        return slice(max(start - 1, 0), min(stop + 1, n))
+
+    def envelope(self, level: int, columns: Optional[Iterable[str]] = None,
+                 top: Optional[float] = None, bottom: Optional[float] = None,
+                 depth_column: str = 'DEPTH') -> pd.DataFrame:
+        """
+        Frame envelope untuk level tertentu: dua baris per bucket (depth atas
+        dengan nilai min, depth bawah dengan nilai max), sehingga spike tetap
+        tergambar. Kolom '_ROW' berisi posisi baris sumber di awal bucket,
+        untuk mengambil kolom non-numerik (mis. MARKER) dari store.
+        """
+        columns = self.columns if columns is None else [c for c in columns if c in self.stats]
+        buckets = self.bucket_slice(level, top, bottom)
+        n = buckets.stop - buckets.start
+
+        frame = {depth_column: np.empty(2 * n, dtype=np.float32)}
+        frame[depth_column][0::2] = self.depth_top[level][buckets]
+        frame[depth_column][1::2] = self.depth_bottom[level][buckets]
+        for col in columns:
+            low, high, _ = self.stats[col][level]
+            values = np.empty(2 * n, dtype=np.float32)
+            values[0::2] = low[buckets]
+            values[1::2] = high[buckets]
+            frame[col] = values
+
+        factor = self.factors[level]
+        starts = np.arange(buckets.start, buckets.stop) * factor
+        frame['_ROW'] = np.repeat(self.order[starts], 2)
+        return pd.DataFrame(frame)
+
+    def mean(self, level: int, column: str) -> np.ndarray:
+        return self.stats[column][level][2]
+
+    def copy(self) -> 'DepthPyramid':
+        """Salinan dangkal: array level dibagi, daftar kolom/versi milik sendiri."""
+        pyramid = copy.copy(self)
+        pyramid.stats = dict(self.stats)
+        pyramid.versions = dict(self.versions)
+        return pyramid
+
+
+class WellPyramids:
+    """
+    Kumpulan DepthPyramid per sumur di atas sebuah WellDataStore. Kolom
+    numerik dirangkum; kolom lain diambil dari store pada baris awal bucket.
+    """
+
+    def __init__(self, store: WellDataStore, depth_column: str = 'DEPTH',
+                 min_buckets: int = MIN_BUCKETS):
+        self.store = store
+        self.depth_column = depth_column
+        self.min_buckets = min_buckets
+        self._pyramids: Dict[object, DepthPyramid] = {}
+
+    def __contains__(self, well_name) -> bool:
+        return well_name in self._pyramids
+
+    def __len__(self) -> int:
+        return len(self._pyramids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(p.nbytes for p in self._pyramids.values())
+
+    def _numeric_columns(self, well_name) -> List[str]:
+        table = self.store.well_table(well_name)
+        skip = {self.depth_column, self.store.well_column}
+        return [field.name for field in table.schema
+                if field.name not in skip
+                and (pa.types.is_floating(field.type) or pa.types.is_integer(field.type))]
+
+    def get(self, well_name) -> Optional[DepthPyramid]:
+        """Piramida sumur, dibangun atau disinkronkan dengan store bila perlu."""
+        if not self.store.has_well(well_name):
+            return None
+        versions = self.store.column_versions(well_name)
+        pyramid = self._pyramids.get(well_name)
+
+        rebuild = (pyramid is None
+                   or pyramid.num_rows != self.store.well_num_rows(well_name)
+                   or pyramid.versions.get(self.depth_column) != versions.get(self.depth_column))
+        if rebuild:
+            table = self.store.well_table(well_name, [self.depth_column])
+            if self.depth_column not in table.column_names:
+                return None
+            pyramid = DepthPyramid(table.column(self.depth_column).to_numpy(zero_copy_only=False),
+                                   self.min_buckets)
+            pyramid.versions[self.depth_column] = versions.get(self.depth_column, 0)
+            self._pyramids[well_name] = pyramid
+
+        # Hanya kolom baru atau yang versinya berubah yang dihitung ulang
+        numeric = self._numeric_columns(well_name)
+        stale = [col for col in numeric if pyramid.versions.get(col) != versions.get(col, 0)]
+        if stale:
+            table = self.store.well_table(well_name, stale)
+            for col in stale:
+                pyramid.set_column(col, table.column(col).to_numpy(zero_copy_only=False),
+                                   versions.get(col, 0))
+        for col in set(pyramid.columns) - set(numeric):
+            pyramid.drop_column(col)
+        return pyramid
+
+    def build(self, wells: Optional[Iterable] = None) -> None:
+        for well_name in (self.store.wells if wells is None else wells):
+            self.get(well_name)
+
+    def refresh(self, wells: Iterable) -> None:
+        """Menyinkronkan piramida yang sudah ada (mis. setelah run_calculation)."""
+        for well_name in wells:
+            if well_name in self._pyramids:
+                self.get(well_name)
+
+    def clear(self) -> None:
+        self._pyramids.clear()
+
+    def fork(self, store: WellDataStore) -> 'WellPyramids':
+        """
+        Piramida untuk store turunan (WellDataStore.fork): level yang sudah
+        dihitung dipakai bersama, kolom yang nanti berubah di `store` dihitung
+        ulang hanya di salinan ini.
+        """
+        pyramids = WellPyramids(store, self.depth_column, self.min_buckets)
+        pyramids._pyramids = {well: p.copy() for well, p in list(self._pyramids.items())}
+        return pyramids
+
+    def frame(self, well_name, max_points: Optional[int], top: Optional[float] = None,
+              bottom: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """
+        Frame plot dari level paling kasar yang masih memenuhi max_points untuk
+        jendela [top, bottom]; None jika data mentah harus dipakai.
+        """
+        if not max_points or self.store.well_num_rows(well_name) <= max_points:
+            return None
+        pyramid = self.get(well_name)
+        if pyramid is None or not pyramid.factors:
+            return None
+
+        finest = pyramid.bucket_slice(0, top, bottom)
+        num_samples = (finest.stop - finest.start) * pyramid.factors[0]
+        level = pyramid.choose_level(num_samples, max_points)
+        if level is None:
+            return None
+
+        frame = pyramid.envelope(level, top=top, bottom=bottom, depth_column=self.depth_column)
+        others = [col for col in self.store.well_columns(well_name)
+                  if col not in frame.columns]
+        if others:
+            extra = self.store.well_table(well_name, others).take(pa.array(frame['_ROW'].to_numpy()))
+            frame = pd.concat([frame, extra.to_pandas()], axis=1)
+        frame = frame.drop(columns='_ROW')
+        # Urutan kolom mengikuti store
+        ordered = [col for col in self.store.well_columns(well_name) if col in frame.columns]
+        return frame[ordered]
@@ -5,33 +5,11 @@
 from typing import Optional
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
 import os
 
-
-def _interpolate_coeffs(depth, coeff_df):
-    """(Internal) Melakukan interpolasi linear pada koefisien regresi."""
-    if coeff_df.empty:
-        return np.array([np.nan] * 4)
-
-    target_cols = ['b0', 'b1', 'b2', 'b3']
-
-    if depth <= coeff_df['DEPTH'].min():
-        return coeff_df.iloc[0][target_cols].values
-    if depth >= coeff_df['DEPTH'].max():
-        return coeff_df.iloc[-1][target_cols].values
-
-    lower = coeff_df[coeff_df['DEPTH'] <= depth].iloc[-1]
-    upper = coeff_df[coeff_df['DEPTH'] > depth].iloc[0]
-
-    if upper['DEPTH'] == lower['DEPTH']:
-        return lower[target_cols].values
-
-    weight = (depth - lower['DEPTH']) / (upper['DEPTH'] - lower['DEPTH'])
-    interpolated = lower[target_cols] + weight * \
-        (upper[target_cols] - lower[target_cols])
-
-    return interpolated.values
+from .gsa_regression import fit_window_coeffs, evaluate_baseline
+from .progress import ProgressCallback
+from .well_executor import process_wells
 
 
 def process_dgsa_for_well(df_well: pd.DataFrame, params: dict,
@@ -74,60 +52,23 @@ def process_dgsa_for_well(df_well: pd.DataFrame, params: dict,
     gr_filter = filters.get('GR', (5, 180))
     rhob_filter = filters.get('RHOB', (1.5, 3.0))
 
-    coeffs = []
+    coeff_df = fit_window_coeffs(
+        df_dgsa['DEPTH'].values, df_dgsa['GR'].values, df_dgsa['RHOB'].values,
+        window_size=window_size, step=step,
+        min_points=min_points_in_window,
+        ref_filter=gr_filter, target_filter=rhob_filter,
+        log_target=False)
 
-    for start in range(0, len(df_dgsa) - window_size, step):
-        window = df_dgsa.iloc[start:start+window_size]
-        gr = window['GR'].values
-        dens = window['RHOB'].values
-
-        mask = (gr > gr_filter[0]) & (gr < gr_filter[1]) & (
-            dens > rhob_filter[0]) & (dens < rhob_filter[1])
-        gr_filtered = gr[mask]
-        dens_filtered = dens[mask]
-
-        if len(gr_filtered) < min_points_in_window:
-            continue
-
-        gr_scaled = 0.01 * gr_filtered
-
-        X = np.vstack([gr_scaled, gr_scaled**2, gr_scaled**3]).T
-        y = dens_filtered
-
-        try:
-            model = LinearRegression().fit(X, y)
-            if hasattr(model, 'coef_') and len(model.coef_) == 3:
-                coeffs.append({
-                    'DEPTH': window['DEPTH'].mean(),
-                    'b0': model.intercept_, 'b1': model.coef_[0],
-                    'b2': model.coef_[1], 'b3': model.coef_[2]
-                })
-        except Exception as e:
-            print(
-                f"Peringatan: Gagal melakukan regresi pada kedalaman sekitar {window['DEPTH'].mean()}: {e}")
-            continue
-
-    if not coeffs:
+    if coeff_df.empty:
         print("Peringatan: Tidak ada koefisien regresi yang berhasil dihitung.")
         return None
 
-    coeff_df = pd.DataFrame(coeffs)
-
     # --- STEP 3: INTERPOLASI & HITUNG DGSA ---
-    dgsa_list = []
-    for _, row in df_dgsa.iterrows():
-        depth, gr = row['DEPTH'], row['GR']
-
-        if not (gr_filter[0] < gr < gr_filter[1]):
-            dgsa_list.append(np.nan)
-            continue
-
-        b0, b1, b2, b3 = _interpolate_coeffs(depth, coeff_df)
-        grfix = 0.01 * gr
-        dgsa = b0 + b1*grfix + b2*grfix**2 + b3*grfix**3
-        dgsa_list.append(dgsa)
-
-    df_dgsa['DGSA'] = dgsa_list
+    gr = df_dgsa['GR'].values
+    dgsa_values = evaluate_baseline(
+        df_dgsa['DEPTH'].values, gr, coeff_df, log_output=False)
+    gr_in_range = (gr > gr_filter[0]) & (gr < gr_filter[1])
+    df_dgsa['DGSA'] = np.where(gr_in_range, dgsa_values, np.nan)
 
     # --- STEP 4: GABUNGKAN HASIL DAN ANALISIS ---
     df_merged = pd.merge(
@@ -159,43 +100,23 @@ def process_dgsa_for_well(df_well: pd.DataFrame, params: dict,
     return df_merged
 
 
-def process_all_wells_dgsa(df_well: str, params: dict, selected_intervals: list):
+def process_all_wells_dgsa(df_well: pd.DataFrame, params: dict, selected_intervals: list,
+                           n_jobs: Optional[int] = None, backend: str = 'process',
+                           progress: Optional[ProgressCallback] = None):
     """
     Fungsi orkestrator utama: memproses DGSA untuk semua sumur dengan parameter kustom.
+    Dataset dipecah sekali per WELL_NAME dan sumur diproses paralel oleh
+    `n_jobs` worker (None = semua core, 1 = sekuensial). `progress`
+    menerima event per sumur (indeks, waktu berjalan, baris/detik).
     """
-
-    unique_wells = df_well['WELL_NAME'].unique()
-    print(f"📊 Memproses DGSA untuk {len(unique_wells)} sumur...")
-
-    processed_wells = []
-    failed_wells = []
-
-    for i, well_name in enumerate(unique_wells, 1):
-        print(f"\n🔍 Memproses sumur {i}/{len(unique_wells)}: {well_name}")
-        df_well = df_well[df_well['WELL_NAME'] ==
-                          well_name].copy().reset_index(drop=True)
-
-        result_df = process_dgsa_for_well(df_well, params,
-                                          marker_column='MARKER',
-                                          selected_intervals=selected_intervals)
-
-        if result_df is not None:
-            processed_wells.append(result_df)
-            print(f"✅ {well_name} - DGSA berhasil dihitung.")
-        else:
-            failed_wells.append(well_name)
-            print(f"❌ {well_name} - DGSA gagal dihitung.")
-
-    if processed_wells:
-        df_final = pd.concat(processed_wells, ignore_index=True)
-
-        print(
-            f"\n✅ Proses selesai. Hasil gabungan pada file asli.")
-
-        # Menampilkan ringkasan statistik (opsional)
-        # print_summary_statistics_dgsa(df_final, len(processed_wells), failed_wells)
-    else:
-        print("\n❌ Tidak ada sumur yang berhasil diproses!")
+    df_final, report = process_wells(
+        df_well, process_dgsa_for_well, params,
+        n_jobs=n_jobs, backend=backend, label='DGSA', progress=progress,
+        marker_column='MARKER', selected_intervals=selected_intervals)
+
+    # Menampilkan ringkasan statistik (opsional)
+    # if df_final is not None:
+    #     print_summary_statistics_dgsa(df_final, len(report['processed']), report['failed'])
 
     return df_final
 
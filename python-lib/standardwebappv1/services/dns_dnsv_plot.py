@@ -1,6 +1,6 @@
 # In your services/dns_dnsv_plot.py or equivalent file
 
-from plotly.subplots import make_subplots
+from .figure_builder import make_subplots
 # Ensure all your helper functions are imported from your plotting service
 from .plotting_service import (
     extract_markers_with_mean_depth,
@@ -9,9 +9,7 @@ from .plotting_service import (
     plot_xover_log_normal,
     plot_flag,
     plot_texts_marker,
-    layout_range_all_axis,
-    layout_draw_lines,
-    layout_axis
+    apply_layout_template
 )
 
 def plot_dns_dnsv(df, title='DNS + DNSV Analysis'):
@@ -68,7 +66,6 @@ def plot_dns_dnsv(df, title='DNS + DNSV Analysis'):
 
 
     # 5. Finalize Layout
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
     fig.update_layout(
         margin=dict(l=20, r=20, t=40, b=20),
         height=1400,
@@ -85,7 +82,6 @@ def plot_dns_dnsv(df, title='DNS + DNSV Analysis'):
         autorange=False 
     )
     fig.update_traces(yaxis='y')
-    fig = layout_draw_lines(fig, ratio_plots_seq, df, xgrid_intv=50)
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df, xgrid_intv=50)
 
     return fig
\ No newline at end of file
@@ -0,0 +1,109 @@
+# Nama file: figure_benchmark.py
+# Deskripsi: Benchmark perakitan figure per jenis plot: jalur dict
+# (figure_builder) dibandingkan jalur plotly.graph_objects tervalidasi.
+# Waktu diukur sampai JSON yang dikirim ke frontend (dumps_figure).
+
+import time
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from . import figure_builder
+from .dns_dnsv_plot import plot_dns_dnsv
+from .figure_serialization import dumps_figure
+from .plotting_service import (
+    extract_markers_with_mean_depth,
+    plot_gsa_main,
+    plot_log_default,
+    plot_normalization,
+    plot_phie_den,
+    plot_rwa_indo,
+    plot_smoothing,
+    plot_sw_indo,
+    plot_vsh_linear,
+)
+from .rgbe_rpbe import plot_rgbe_rpbe
+from .rt_r0_plot import plot_rt_r0
+from .swgrad_plot import plot_swgrad
+
+
+def _with_markers(builder):
+    def build(df, max_points):
+        return builder(df, extract_markers_with_mean_depth(df), df, max_points=max_points)
+    return build
+
+
+# Jenis plot -> fungsi(df, max_points) yang mengembalikan figure
+PLOT_BUILDERS: Dict[str, Callable] = {
+    'default': _with_markers(plot_log_default),
+    'porosity': _with_markers(plot_phie_den),
+    'vsh': _with_markers(plot_vsh_linear),
+    'sw': _with_markers(plot_sw_indo),
+    'rwa': _with_markers(plot_rwa_indo),
+    'smoothing': _with_markers(plot_smoothing),
+    'normalization': lambda df, max_points: plot_normalization(df, max_points=max_points),
+    'gsa': lambda df, max_points: plot_gsa_main(df, max_points=max_points),
+    'dns_dnsv': lambda df, max_points: plot_dns_dnsv(df),
+    'rgbe_rpbe': lambda df, max_points: plot_rgbe_rpbe(df),
+    'rt_r0': lambda df, max_points: plot_rt_r0(df),
+    'swgrad': lambda df, max_points: plot_swgrad(df),
+}
+
+
+def _time_build(builder, df, max_points, repeat):
+    """(Internal) Waktu terbaik (build, build + serialisasi) dari `repeat` kali."""
+    best_build = best_total = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig = builder(df.copy(), max_points)
+        built = time.perf_counter()
+        dumps_figure(fig)
+        end = time.perf_counter()
+        best_build = min(best_build, built - start)
+        best_total = min(best_total, end - start)
+    return best_build, best_total
+
+
+def benchmark_plot_builders(df_well: pd.DataFrame, plot_types=None, max_points: Optional[int] = None,
+                            repeat: int = 3) -> pd.DataFrame:
+    """
+    Membandingkan jalur dict dan graph_objects untuk setiap jenis plot.
+
+    Args:
+        df_well (pd.DataFrame): Data satu sumur dengan kolom yang dibutuhkan plot.
+        plot_types (list, optional): Subset kunci PLOT_BUILDERS; default semua.
+        max_points (int, optional): Budget titik per kurva (decimation).
+        repeat (int): Jumlah pengulangan; diambil waktu terbaik.
+
+    Returns:
+        pd.DataFrame: Per jenis plot: waktu build dan build+JSON (detik) untuk
+        kedua jalur serta speedup-nya. Plot yang gagal dibangun (kolom
+        tidak ada) dicatat di kolom 'error'.
+    """
+    rows = []
+    validate = figure_builder.VALIDATE_FIGURES
+    try:
+        for plot_type in (plot_types or list(PLOT_BUILDERS)):
+            builder = PLOT_BUILDERS[plot_type]
+            row = {'plot_type': plot_type}
+            try:
+                figure_builder.set_validation(True)
+                go_build, go_total = _time_build(builder, df_well, max_points, repeat)
+                figure_builder.set_validation(False)
+                dict_build, dict_total = _time_build(builder, df_well, max_points, repeat)
+            except Exception as e:
+                row['error'] = str(e)
+                rows.append(row)
+                continue
+            row.update({
+                'go_build_s': go_build,
+                'dict_build_s': dict_build,
+                'build_speedup': go_build / dict_build,
+                'go_total_s': go_total,
+                'dict_total_s': dict_total,
+                'total_speedup': go_total / dict_total,
+            })
+            rows.append(row)
+    finally:
+        figure_builder.set_validation(validate)
+    return pd.DataFrame(rows)
@@ -0,0 +1,270 @@
+# Nama file: figure_builder.py
+# Deskripsi: Perakitan figure plot log sebagai dict trace/layout biasa, tanpa
+# validasi plotly.graph_objects per properti. API-nya mengikuti subset
+# go.Figure yang dipakai plotting_service (add_trace dengan row/col,
+# update_layout, update_xaxes/update_yaxes, update_traces, add_annotation)
+# dan hasilnya dibaca oleh figure_serialization lewat to_plotly_json() tanpa
+# salinan.
+# Struktur subplot dan template default diambil dari make_subplots Plotly
+# sekali per konfigurasi lalu di-cache.
+
+import contextlib
+import copy
+import re
+from typing import Dict, Optional
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.basedatatypes import BaseFigure, BasePlotlyType
+from plotly.subplots import make_subplots as go_make_subplots
+
+# True: factory di bawah mengembalikan objek graph_objects tervalidasi
+# (untuk debugging properti dan benchmark pembanding)
+VALIDATE_FIGURES = False
+
+
+def set_validation(enabled: bool) -> None:
+    """Mengaktifkan jalur plotly.graph_objects (tervalidasi) untuk figure baru."""
+    global VALIDATE_FIGURES
+    VALIDATE_FIGURES = bool(enabled)
+
+
+_prop_paths: Dict[str, tuple] = {}
+
+
+def _prop_path(key: str) -> tuple:
+    """(Internal) 'title_text' -> ('title', 'text'), 'xaxis1' -> ('xaxis',), seperti Plotly."""
+    path = _prop_paths.get(key)
+    if path is None:
+        path = tuple(BaseFigure._str_to_dict_path(key))
+        if path[0] in ('xaxis1', 'yaxis1'):
+            path = (path[0][:-1],) + path[1:]
+        _prop_paths[key] = path
+    return path
+
+
+# Properti berisi referensi subplot; 'x1'/'y1' dinormalisasi Plotly menjadi 'x'/'y'
+_SUBPLOT_REF_PROPS = {'xaxis', 'yaxis', 'xref', 'yref', 'anchor', 'overlaying', 'matches', 'scaleanchor'}
+_SUBPLOT_REF_ONE = re.compile(r'^([xy])1(?=$| )')
+
+
+def _copy_prop(key, value):
+    if key in _SUBPLOT_REF_PROPS and isinstance(value, str):
+        return _SUBPLOT_REF_ONE.sub(r'\1', value)
+    return _copy_value(value)
+
+
+def _copy_value(value):
+    """(Internal) Salinan dict/list; Series/Index menjadi array numpy (seperti validator Plotly)."""
+    if isinstance(value, dict):
+        return _nest(value)
+    if isinstance(value, (list, tuple)):
+        return [_copy_value(v) for v in value]
+    if isinstance(value, BasePlotlyType):
+        return value.to_plotly_json()
+    if hasattr(value, 'to_numpy') and not isinstance(value, np.ndarray):
+        return value.to_numpy(copy=True)
+    return value
+
+
+def _merge_into(target: dict, update: dict) -> dict:
+    """
+    (Internal) Update rekursif di tempat dengan semantik update() Plotly:
+    dict digabung, list dict (annotations, shapes) digabung per elemen lalu
+    sisanya ditambahkan, nilai lain diganti.
+    """
+    for key, value in update.items():
+        current = target.get(key)
+        if key == 'template':
+            # Template dibagi antar figure: diganti, tidak pernah diubah di tempat
+            if isinstance(value, str):
+                target[key] = _template_dict(value)
+            else:
+                target[key] = _merge_into(copy.deepcopy(current) if isinstance(current, dict) else {},
+                                          value)
+        elif isinstance(value, dict) and isinstance(current, dict):
+            _merge_into(current, value)
+        elif (isinstance(value, (list, tuple)) and value and isinstance(current, list) and current
+              and all(isinstance(v, dict) for v in value)):
+            for element, element_update in zip(current, value):
+                _merge_into(element, element_update)
+            current.extend(_copy_value(v) for v in value[len(current):])
+        else:
+            target[key] = _copy_prop(key, value)
+    return target
+
+
+def _nest(props: dict) -> dict:
+    """(Internal) Kwargs datar (line_color=..., xaxis1=...) menjadi dict bersarang."""
+    nested = {}
+    for key, value in props.items():
+        path = _prop_path(key)
+        target = nested
+        for part in path[:-1]:
+            target = target.setdefault(part, {})
+        if isinstance(value, dict) and isinstance(target.get(path[-1]), dict):
+            _merge_into(target[path[-1]], value)
+        else:
+            target[path[-1]] = _copy_prop(path[-1], value)
+    return nested
+
+
+class DictTrace(dict):
+    """
+    Trace sebagai dict biasa. Properti juga bisa dibaca sebagai atribut
+    (trace.x, trace.type); properti yang belum diisi bernilai None seperti
+    pada objek trace Plotly.
+    """
+
+    def __missing__(self, key):
+        return None
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return self.get(name)
+
+    def update(self, other=None, **kwargs):
+        _merge_into(self, _nest(dict(other or {}, **kwargs)))
+        return self
+
+
+def _make_trace(trace_type: str, props: dict) -> DictTrace:
+    trace = DictTrace(type=trace_type)
+    trace.update(props)
+    return trace
+
+
+def Scatter(**props):
+    return go.Scatter(**props) if VALIDATE_FIGURES else _make_trace('scatter', props)
+
+
+def Scattergl(**props):
+    return go.Scattergl(**props) if VALIDATE_FIGURES else _make_trace('scattergl', props)
+
+
+def Bar(**props):
+    return go.Bar(**props) if VALIDATE_FIGURES else _make_trace('bar', props)
+
+
+def Heatmap(**props):
+    return go.Heatmap(**props) if VALIDATE_FIGURES else _make_trace('heatmap', props)
+
+
+_templates = {}
+
+
+def _template_dict(name):
+    """(Internal) Template Plotly terdaftar dalam bentuk dict (dibagi, jangan dimutasi)."""
+    if name not in _templates:
+        template = pio.templates[name] if name is not None else None
+        _templates[name] = template.to_plotly_json() if template is not None else None
+    return _templates[name]
+
+
+class DictFigure:
+    """
+    Figure Plotly dalam bentuk dict biasa. Atribut _data dan _layout memakai
+    nama yang sama dengan go.Figure sehingga decimate_figure membacanya
+    dengan jalur yang sama; to_plotly_json() mengembalikan dict tersebut
+    tanpa salinan.
+    """
+
+    def __init__(self, layout: Optional[dict] = None, grid_ref=None):
+        self._data = []
+        self._layout = {}
+        template = _template_dict(pio.templates.default)
+        if template is not None:
+            self._layout['template'] = template
+        if layout:
+            _merge_into(self._layout, layout)
+        self._grid_ref = grid_ref
+
+    @property
+    def data(self) -> tuple:
+        return tuple(self._data)
+
+    @property
+    def layout(self) -> dict:
+        return self._layout
+
+    def add_trace(self, trace, row: Optional[int] = None, col: Optional[int] = None):
+        if isinstance(trace, BasePlotlyType):
+            trace = _make_trace(trace.type, trace.to_plotly_json())
+        elif not isinstance(trace, DictTrace):
+            trace = _make_trace(trace.get('type', 'scatter'), trace)
+        if row is not None and col is not None:
+            if self._grid_ref is None:
+                raise ValueError("add_trace dengan row/col membutuhkan figure dari make_subplots")
+            trace.update(self._grid_ref[row - 1][col - 1])
+        self._data.append(trace)
+        return self
+
+    def update_layout(self, dict1: Optional[dict] = None, overwrite: bool = False, **kwargs):
+        update = _nest(dict(dict1 or {}, **kwargs))
+        if overwrite:
+            self._layout.update(update)
+        else:
+            _merge_into(self._layout, update)
+        return self
+
+    def _update_axes(self, prefix: str, patch: Optional[dict], kwargs: dict):
+        update = _nest(dict(patch or {}, **kwargs))
+        for key in list(self._layout):
+            if key.startswith(prefix) and key[len(prefix):].isdigit() or key == prefix:
+                _merge_into(self._layout[key], update)
+        return self
+
+    def update_xaxes(self, patch: Optional[dict] = None, **kwargs):
+        return self._update_axes('xaxis', patch, kwargs)
+
+    def update_yaxes(self, patch: Optional[dict] = None, **kwargs):
+        return self._update_axes('yaxis', patch, kwargs)
+
+    def update_traces(self, patch: Optional[dict] = None, selector: Optional[dict] = None, **kwargs):
+        update = _nest(dict(patch or {}, **kwargs))
+        for trace in self._data:
+            if selector and any(trace.get(k) != v for k, v in selector.items()):
+                continue
+            _merge_into(trace, update)
+        return self
+
+    def add_annotation(self, arg: Optional[dict] = None, **kwargs):
+        annotation = _nest(dict(arg or {}, **kwargs))
+        self._layout.setdefault('annotations', []).append(annotation)
+        return self
+
+    @contextlib.contextmanager
+    def batch_update(self):
+        yield self
+
+    def to_plotly_json(self) -> dict:
+        return {'data': [dict(trace) for trace in self._data], 'layout': self._layout}
+
+    def to_dict(self) -> dict:
+        return copy.deepcopy(self.to_plotly_json())
+
+
+_subplot_layouts = {}
+
+
+def make_subplots(**kwargs):
+    """
+    Pengganti plotly.subplots.make_subplots yang menghasilkan DictFigure.
+    Layout subplot dan referensi axis per sel dihitung Plotly sekali per
+    kombinasi argumen.
+    """
+    if VALIDATE_FIGURES:
+        return go_make_subplots(**kwargs)
+    key = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in kwargs.items()))
+    cached = _subplot_layouts.get(key)
+    if cached is None:
+        fig = go_make_subplots(**kwargs)
+        layout = fig.to_plotly_json()['layout']
+        layout.pop('template', None)
+        grid_ref = [[cell[0].trace_kwargs if cell else {} for cell in row] for row in fig._grid_ref]
+        cached = (layout, grid_ref)
+        _subplot_layouts[key] = cached
+    layout, grid_ref = cached
+    return DictFigure(layout, grid_ref)
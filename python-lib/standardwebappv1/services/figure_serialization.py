@@ -0,0 +1,133 @@
+# Nama file: figure_serialization.py
+# Deskripsi: Serialisasi figure Plotly yang cepat untuk endpoint plot. Array
+# numerik dikirim sebagai typed array base64 (format `bdata` Plotly:
+# {"dtype": "f8", "bdata": "...", "shape": "r, c"}) dan JSON ditulis dengan
+# orjson/ujson bila tersedia. app.js mendekode kembali menjadi TypedArray.
+
+import base64
+import json
+import math
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Tipe yang dikenali plotly.js (tanpa int64)
+_DTYPE_CODES = {
+    'float64': 'f8', 'float32': 'f4',
+    'int32': 'i4', 'uint32': 'u4',
+    'int16': 'i2', 'uint16': 'u2',
+    'int8': 'i1', 'uint8': 'u1',
+}
+
+# List pendek lebih murah dikirim apa adanya
+MIN_BINARY_LENGTH = 16
+
+
+def encode_array(values: np.ndarray, float32: bool = False):
+    """
+    Mengubah array numerik menjadi dict bdata. Array non-numerik (string,
+    object) dikembalikan sebagai list biasa.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'b':
+        values = values.astype(np.uint8)
+    elif values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+        # plotly.js tidak punya int64: turunkan ke int32 jika muat, selain itu float64
+        if values.size and (values.min() < np.iinfo(np.int32).min or values.max() > np.iinfo(np.int32).max):
+            values = values.astype(np.float64)
+        else:
+            values = values.astype(np.int32)
+    elif values.dtype.kind == 'f' and values.dtype.name not in _DTYPE_CODES:
+        values = values.astype(np.float64)
+
+    if values.dtype.name not in _DTYPE_CODES:
+        return _to_plain(values.tolist(), binary=False)
+
+    if float32 and values.dtype == np.float64:
+        values = values.astype(np.float32)
+
+    values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+    encoded = {
+        'dtype': _DTYPE_CODES[values.dtype.name],
+        'bdata': base64.b64encode(values.tobytes()).decode('ascii'),
+    }
+    if values.ndim > 1:
+        encoded['shape'] = ', '.join(str(n) for n in values.shape)
+    return encoded
+
+
+def _is_numeric_list(values: list) -> bool:
+    for v in values:
+        if v is None or isinstance(v, bool) or not isinstance(v, (int, float, np.number)):
+            return False
+    return True
+
+
+def _to_plain(obj, binary: bool = True, float32: bool = False):
+    """
+    (Internal) Menelusuri struktur figure menjadi tipe JSON murni. Dengan
+    binary=True array numerik disandikan sebagai bdata.
+    """
+    if isinstance(obj, dict):
+        return {key: _to_plain(value, binary, float32) for key, value in obj.items()}
+    if isinstance(obj, np.ndarray) or hasattr(obj, 'to_numpy'):  # termasuk Series/Index
+        values = obj if isinstance(obj, np.ndarray) else obj.to_numpy()
+        if binary:
+            return encode_array(values, float32)
+        return _to_plain(values.tolist(), binary=False)
+    if isinstance(obj, (list, tuple)):
+        if binary and len(obj) >= MIN_BINARY_LENGTH and _is_numeric_list(obj):
+            return encode_array(np.asarray(obj, dtype=float), float32)
+        return [_to_plain(value, binary, float32) for value in obj]
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+def figure_payload(fig, float32: bool = False) -> dict:
+    """
+    Dict {'data', 'layout'} siap-JSON. Array numerik di dalam trace memakai
+    format bdata; layout tetap JSON biasa (sama seperti Figure.to_dict Plotly).
+    NaN di dalam bdata tetap NaN (plotly.js menggambarnya sebagai celah);
+    NaN di list/nilai JSON biasa menjadi null.
+
+    DictFigure.to_plotly_json() tidak menyalin apa pun; pada go.Figure
+    to_plotly_json() melakukan deepcopy.
+    """
+    figure = fig.to_plotly_json() if hasattr(fig, 'to_plotly_json') else fig
+    data, layout = figure.get('data', []), figure.get('layout', {})
+    return {
+        'data': [_to_plain(trace, True, float32) for trace in data],
+        'layout': _to_plain(layout, binary=False),
+    }
+
+
+def dumps_payload(payload) -> str:
+    """JSON string memakai encoder tercepat yang tersedia (orjson > ujson > json)."""
+    if orjson is not None:
+        return orjson.dumps(payload).decode('utf-8')
+    if ujson is not None:
+        return ujson.dumps(payload, ensure_ascii=False)
+    return json.dumps(payload, separators=(',', ':'))
+
+
+def dumps_figure(fig, float32: bool = False) -> str:
+    """
+    Serialisasi figure Plotly (atau dict figure) ke JSON dengan typed array.
+
+    Args:
+        fig: plotly.graph_objects.Figure atau dict {'data', 'layout'}.
+        float32 (bool): Turunkan array float64 ke float32 (payload ~2x lebih kecil).
+    """
+    return dumps_payload(figure_payload(fig, float32))
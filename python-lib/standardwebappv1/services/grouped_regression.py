@@ -0,0 +1,71 @@
+# Nama file: grouped_regression.py
+# Deskripsi: Regresi linear per segmen (run IQUAL / GROUP_ID) untuk seluruh
+# segmen sekaligus, memakai jumlah per segmen dari np.add.reduceat.
+
+import numpy as np
+
+
+def segment_starts(keys) -> np.ndarray:
+    """
+    Indeks awal setiap segmen kontigu dari array kunci grup.
+    Baris harus sudah terurut per kunci (seperti GROUP_ID hasil cumsum).
+    """
+    keys = np.asarray(keys)
+    if len(keys) == 0:
+        return np.array([], dtype=np.intp)
+    change = np.empty(len(keys), dtype=bool)
+    change[0] = True
+    change[1:] = keys[1:] != keys[:-1]
+    return np.flatnonzero(change)
+
+
+def segment_counts(starts, size: int) -> np.ndarray:
+    """Jumlah baris per segmen."""
+    return np.diff(np.append(starts, size))
+
+
+def segment_is_constant(values, starts) -> np.ndarray:
+    """
+    True untuk segmen yang nilai non-NaN-nya hanya satu macam
+    (setara dengan group[col].nunique() == 1).
+    """
+    values = np.asarray(values, dtype=float)
+    if len(starts) == 0:
+        return np.array([], dtype=bool)
+    n_valid = np.add.reduceat((~np.isnan(values)).astype(np.intp), starts)
+    vmax = np.fmax.reduceat(values, starts)
+    vmin = np.fmin.reduceat(values, starts)
+    return (n_valid > 0) & (vmax == vmin)
+
+
+def segment_linregress(x, y, starts):
+    """
+    Padanan scipy.stats.linregress untuk setiap segmen sekaligus.
+
+    Returns:
+        tuple: (slope, intercept, r) berupa array sepanjang jumlah segmen.
+        Segmen dengan NaN menghasilkan NaN; r = 0 jika variansi x atau y nol.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(starts) == 0:
+        empty = np.array([], dtype=float)
+        return empty, empty, empty
+
+    counts = segment_counts(starts, len(x))
+    x_mean = np.add.reduceat(x, starts) / counts
+    y_mean = np.add.reduceat(y, starts) / counts
+
+    # Jumlah kuadrat terpusat (dua langkah agar stabil secara numerik)
+    dx = x - np.repeat(x_mean, counts)
+    dy = y - np.repeat(y_mean, counts)
+    ssxm = np.add.reduceat(dx * dx, starts) / counts
+    ssym = np.add.reduceat(dy * dy, starts) / counts
+    ssxym = np.add.reduceat(dx * dy, starts) / counts
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = ssxym / ssxm
+        r = np.clip(ssxym / np.sqrt(ssxm * ssym), -1.0, 1.0)
+    r = np.where((ssxm == 0) | (ssym == 0), 0.0, r)
+    intercept = y_mean - slope * x_mean
+    return slope, intercept, r
@@ -1,27 +1,12 @@
 from typing import Optional
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
 
+from .gsa_regression import fit_window_coeffs, evaluate_baseline
 from .rgsa import process_rgsa_for_well
 from .ngsa import process_ngsa_for_well
 from .dgsa import process_dgsa_for_well
 
-def _interpolate_coeffs(depth, coeff_df):
-    """(Internal) Melakukan interpolasi linear pada koefisien regresi."""
-    if coeff_df.empty:
-        return np.array([np.nan] * 4)
-    if depth <= coeff_df['DEPTH'].min():
-        return coeff_df.iloc[0][['b0', 'b1', 'b2', 'b3']].values
-    if depth >= coeff_df['DEPTH'].max():
-        return coeff_df.iloc[-1][['b0', 'b1', 'b2', 'b3']].values
-    lower = coeff_df[coeff_df['DEPTH'] <= depth].iloc[-1]
-    upper = coeff_df[coeff_df['DEPTH'] > depth].iloc[0]
-    weight = (depth - lower['DEPTH']) / (upper['DEPTH'] - lower['DEPTH'])
-    row = lower + weight * (upper - lower)
-    return row[['b0', 'b1', 'b2', 'b3']].values
-
-
 def _classify_zone(score):
     """(Internal) Memberikan nama zona berdasarkan skor anomali."""
     if score == 3:
@@ -40,7 +25,6 @@ def calculate_gsa_log(df_input: pd.DataFrame, params: dict, ref_log: str, target
     """
     df_input = df_input.copy()
     df_valid = df_input[['DEPTH', ref_log, target_log]].dropna().copy()
-    coeffs = []
 
     window_size = int(params.get('window_size', 106))
     step = int(params.get('step', 20))
@@ -48,57 +32,26 @@ def calculate_gsa_log(df_input: pd.DataFrame, params: dict, ref_log: str, target
 
     print(f"Memulai kalkulasi {output_log_name}...")
 
-    for start in range(0, len(df_valid) - window_size, step):
-        window = df_valid.iloc[start:start + window_size]
-        gr = window[ref_log].values
-        target = window[target_log].values
-
-        mask = (gr > 5) & (gr < 180) & (target > 0.1) & (target < 1000)
-        gr, target = gr[mask], target[mask]
-
-        if len(gr) < min_points:
-            continue
-
-        gr_scaled = 0.01 * gr
-        y = np.log10(target) if output_log_name == 'RGSA' else target
-        X = np.vstack([gr_scaled, gr_scaled**2, gr_scaled**3]).T
+    coeff_df = fit_window_coeffs(
+        df_valid['DEPTH'].values, df_valid[ref_log].values, df_valid[target_log].values,
+        window_size=window_size, step=step, min_points=min_points,
+        ref_filter=(5, 180), target_filter=(0.1, 1000),
+        log_target=(output_log_name == 'RGSA'))
 
-        model = LinearRegression().fit(X, y)
-        coeffs.append({
-            'DEPTH': window['DEPTH'].mean(),
-            'b0': model.intercept_,
-            'b1': model.coef_[0],
-            'b2': model.coef_[1],
-            'b3': model.coef_[2]
-        })
-
-    if not coeffs:
+    if coeff_df.empty:
         print(
             f"⚠️ Tidak ada koefisien dihitung untuk {output_log_name}, seluruh output akan NaN.")
         df_input[output_log_name] = np.nan
         return df_input
 
-    coeff_df = pd.DataFrame(coeffs)
-
-    # Siapkan array hasil
-    gsa_array = np.full(len(df_input), np.nan)
-
-    for i, row in df_input.iterrows():
-        if pd.isna(row[ref_log]) or pd.isna(row['DEPTH']):
-            continue
-
-        gr_val = row[ref_log]
-        if gr_val < 5 or gr_val > 180:
-            continue
-
-        b0, b1, b2, b3 = _interpolate_coeffs(row['DEPTH'], coeff_df)
-        if np.isnan(b0):
-            continue
+    # Evaluasi baseline untuk seluruh baris sekaligus
+    depth = df_input['DEPTH'].values.astype(float)
+    gr = df_input[ref_log].values.astype(float)
+    gsa_values = evaluate_baseline(
+        depth, gr, coeff_df, log_output=(output_log_name == 'RGSA'))
 
-        grfix = 0.01 * gr_val
-        log_gsa = b0 + b1 * grfix + b2 * grfix**2 + b3 * grfix**3
-        gsa_val = 10**log_gsa if output_log_name == 'RGSA' else log_gsa
-        gsa_array[i] = gsa_val
+    valid = ~np.isnan(depth) & ~np.isnan(gr) & (gr >= 5) & (gr <= 180)
+    gsa_array = np.where(valid, gsa_values, np.nan)
 
     df_input[output_log_name] = gsa_array
     return df_input
@@ -0,0 +1,159 @@
+# Nama file: gsa_regression.py
+# Deskripsi: Mesin regresi baseline bersama untuk RGSA, NGSA dan DGSA.
+# Seluruh posisi sliding window diregresikan sekaligus (batched normal equation)
+# di atas strided view dari design matrix kubik GR.
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+COEFF_COLS = ['b0', 'b1', 'b2', 'b3']
+
+# Window dengan condition number Gram matrix di atas batas ini tidak
+# diselesaikan dengan normal equation (presisinya hilang), tetapi dengan
+# pseudo-inverse design matrix
+GRAM_COND_LIMIT = 1e10
+
+
+def fit_window_coeffs(depth, ref, target,
+                      window_size: int = 106,
+                      step: int = 20,
+                      min_points: int = 30,
+                      ref_filter: tuple = (5, 180),
+                      target_filter: tuple = (0.1, 1000),
+                      log_target: bool = False) -> pd.DataFrame:
+    """
+    Menghitung koefisien regresi kubik target ~ GR untuk setiap posisi window.
+
+    Hasilnya setara dengan memanggil LinearRegression().fit() per window:
+    filter GR/target diterapkan sebagai mask (sampel NaN tidak lolos), window
+    dengan titik valid kurang dari `min_points` dilewati, dan DEPTH window
+    adalah rata-rata seluruh kedalaman di dalam window.
+
+    Window yang terkondisi baik diselesaikan dengan normal equation. Window
+    dengan GR konstan (variansi nol) atau Gram matrix yang ill-conditioned
+    (condition number > GRAM_COND_LIMIT) memakai solusi minimum-norm dari
+    SVD, seperti lstsq yang dipakai LinearRegression; untuk GR konstan
+    koefisien b1..b3 bernilai nol dan b0 = rata-rata target.
+
+    Returns:
+        pd.DataFrame: Kolom DEPTH, b0, b1, b2, b3 (kosong jika tidak ada window valid).
+    """
+    depth = np.asarray(depth, dtype=float)
+    ref = np.asarray(ref, dtype=float)
+    target = np.asarray(target, dtype=float)
+
+    starts = np.arange(0, len(depth) - window_size, step)
+    if len(starts) == 0:
+        return pd.DataFrame(columns=['DEPTH'] + COEFF_COLS)
+
+    # Perbandingan dengan NaN selalu False, jadi sampel NaN ikut tersaring
+    mask = (ref > ref_filter[0]) & (ref < ref_filter[1]) & (
+        target > target_filter[0]) & (target < target_filter[1])
+
+    # Nilai yang tidak lolos filter diganti agar NaN tidak ikut terbawa ke
+    # perkalian dengan bobot nol (NaN * 0 = NaN) dan log10 tetap aman
+    y = np.where(mask, target, 1.0)
+    if log_target:
+        y = np.log10(y)
+
+    x = 0.01 * np.where(mask, ref, 0.0)
+    design = np.stack([x, x**2, x**3], axis=1)
+
+    # Strided view (n_window, window_size[, 3]) lalu ambil posisi start saja
+    win_mask = sliding_window_view(mask, window_size)[starts]
+    win_depth = sliding_window_view(depth, window_size)[starts]
+    win_y = sliding_window_view(y, window_size)[starts]
+    win_X = sliding_window_view(design, window_size, axis=0)[starts]
+    win_X = np.moveaxis(win_X, -1, 1)
+
+    counts = win_mask.sum(axis=1)
+    keep = counts >= min_points
+    if not keep.any():
+        return pd.DataFrame(columns=['DEPTH'] + COEFF_COLS)
+
+    win_mask, win_depth = win_mask[keep], win_depth[keep]
+    win_y, win_X, counts = win_y[keep], win_X[keep], counts[keep]
+
+    # Pusatkan data terhadap rata-rata titik valid (sama seperti sklearn)
+    weights = win_mask.astype(float)
+    x_mean = np.einsum('wn,wnk->wk', weights, win_X) / counts[:, None]
+    y_mean = np.einsum('wn,wn->w', weights, win_y) / counts
+    Xc = (win_X - x_mean[:, None, :]) * weights[:, :, None]
+    yc = (win_y - y_mean[:, None]) * weights
+
+    gram = np.einsum('wni,wnj->wij', Xc, Xc)
+    rhs = np.einsum('wni,wn->wi', Xc, yc)
+
+    # Normal equation hanya untuk window yang terkondisi baik
+    ill = ~(np.linalg.cond(gram) <= GRAM_COND_LIMIT)  # termasuk cond inf/NaN
+    coef = np.zeros_like(rhs)
+    if (~ill).any():
+        coef[~ill] = np.linalg.solve(gram[~ill], rhs[~ill][..., None])[..., 0]
+    if ill.any():
+        # Solusi minimum-norm seperti lstsq, dari SVD design matrix terpusat
+        # (bukan Gram matrix, yang condition number-nya dikuadratkan).
+        # Singular value di bawah derau pembulatan pemusatan dianggap nol,
+        # sehingga GR konstan menghasilkan b1..b3 = 0 dan b0 = rata-rata target.
+        u, sv, vt = np.linalg.svd(Xc[ill], full_matrices=False)
+        tol = np.finfo(float).eps * max(window_size, win_X.shape[-1]) * \
+            np.abs(win_X[ill] * weights[ill][:, :, None]).max(axis=(1, 2))
+        inv_sv = np.where(sv > tol[:, None], 1.0 / np.where(sv > 0, sv, 1.0), 0.0)
+        uty = np.einsum('wnk,wn->wk', u, yc[ill])
+        coef[ill] = np.einsum('wkj,wk->wj', vt, inv_sv * uty)
+
+    intercept = y_mean - np.einsum('wk,wk->w', x_mean, coef)
+
+    return pd.DataFrame({
+        'DEPTH': win_depth.mean(axis=1),
+        'b0': intercept,
+        'b1': coef[:, 0],
+        'b2': coef[:, 1],
+        'b3': coef[:, 2],
+    })
+
+
+def evaluate_baseline(depth, ref, coeff_df: pd.DataFrame,
+                      log_output: bool = False) -> np.ndarray:
+    """
+    Mengevaluasi baseline kubik untuk seluruh array kedalaman sekaligus.
+
+    Koefisien diinterpolasi linear antar DEPTH pusat window (posisi dicari
+    dengan np.searchsorted) dan di-clamp ke window pertama/terakhir di luar
+    rentang, sama seperti interpolasi per baris sebelumnya.
+
+    Args:
+        depth: Array kedalaman yang akan dievaluasi.
+        ref: Array log referensi (GR) pada kedalaman yang sama.
+        coeff_df (pd.DataFrame): Hasil fit_window_coeffs.
+        log_output (bool): True untuk RGSA (hasil = 10**baseline).
+
+    Returns:
+        np.ndarray: Nilai baseline; NaN jika depth/ref NaN atau coeff_df kosong.
+    """
+    depth = np.asarray(depth, dtype=float)
+    ref = np.asarray(ref, dtype=float)
+
+    if coeff_df.empty:
+        return np.full(len(depth), np.nan)
+
+    coeff_df = coeff_df.sort_values('DEPTH', kind='mergesort')
+    xp = coeff_df['DEPTH'].values
+    coeffs = coeff_df[COEFF_COLS].values
+
+    if len(xp) == 1:
+        b = np.repeat(coeffs, len(depth), axis=0)
+    else:
+        # upper = window pertama dengan DEPTH > depth, lower = sebelumnya
+        upper = np.searchsorted(xp, depth, side='right').clip(1, len(xp) - 1)
+        lower = upper - 1
+        span = xp[upper] - xp[lower]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(span == 0, 0.0, (depth - xp[lower]) / span)
+        b = coeffs[lower] + weight[:, None] * (coeffs[upper] - coeffs[lower])
+        b[depth <= xp[0]] = coeffs[0]
+        b[depth >= xp[-1]] = coeffs[-1]
+
+    grfix = 0.01 * ref
+    baseline = b[:, 0] + b[:, 1] * grfix + b[:, 2] * grfix**2 + b[:, 3] * grfix**3
+    return 10**baseline if log_output else baseline
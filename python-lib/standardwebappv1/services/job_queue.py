@@ -0,0 +1,233 @@
+# Nama file: job_queue.py
+# Deskripsi: Antrian job latar belakang untuk kalkulasi yang lama (SWGRAD,
+# GSA semua sumur, depth matching). Request hanya mendaftarkan job dan
+# langsung mendapat job id; job dijalankan di worker pool, lalu status,
+# progres per sumur dan hasilnya diambil lewat polling.
+
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+# Jumlah kalkulasi yang berjalan bersamaan
+DEFAULT_MAX_WORKERS = 2
+# Job yang sudah selesai disimpan sekian detik untuk diambil hasilnya
+DEFAULT_RETENTION = 60 * 60
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Dilempar oleh Job.check_cancelled() untuk menghentikan job di antara sumur."""
+
+
+class Job:
+    """
+    Satu job di antrian. Fungsi job menerima objek ini sebagai argumen
+    pertama untuk melaporkan progres dan memeriksa pembatalan.
+
+    Attributes:
+        id (str): Job id (uuid4 hex).
+        kind (str): Jenis job (mis. nama kalkulasi), untuk tampilan.
+        owner (str): Pemilik job (session id); job hanya terlihat oleh pemiliknya.
+        status (str): queued, running, completed, failed atau cancelled.
+        wells_total (int): Jumlah sumur yang akan diproses (0 = belum diketahui).
+        wells_done (int): Jumlah sumur yang sudah selesai (berhasil atau gagal).
+        current_well: Sumur yang sedang diproses.
+        failed_wells (dict): {sumur: pesan error}.
+        result (dict): Hasil fungsi job setelah selesai.
+        error (str): Pesan error jika job gagal.
+    """
+
+    def __init__(self, kind: str = '', owner: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.owner = owner
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.wells_total = 0
+        self.wells_done = 0
+        self.current_well = None
+        self.failed_wells = {}
+        self.result = None
+        self.error = None
+        self.future = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # Progres (dipanggil dari fungsi job)
+    # -----------------------------
+    def set_total(self, wells_total: int) -> None:
+        with self._lock:
+            self.wells_total = int(wells_total)
+
+    def start_well(self, well_name) -> None:
+        with self._lock:
+            self.current_well = well_name
+
+    def finish_well(self, well_name, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.wells_done += 1
+            if error:
+                self.failed_wells[well_name] = error
+            if self.current_well == well_name:
+                self.current_well = None
+
+    def check_cancelled(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled(f"Job {self.id} dibatalkan")
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def status_dict(self) -> dict:
+        """Status dan progres job dalam bentuk yang bisa di-JSON-kan."""
+        with self._lock:
+            now = self.finished_at or time.time()
+            return {
+                "job_id": self.id,
+                "kind": self.kind,
+                "job_status": self.status,
+                "cancel_requested": self._cancel.is_set(),
+                "progress": {
+                    "wells_total": self.wells_total,
+                    "wells_done": self.wells_done,
+                    "current_well": self.current_well,
+                    "failed_wells": dict(self.failed_wells),
+                    "fraction": self.wells_done / self.wells_total if self.wells_total else 0.0,
+                },
+                "created_at": self.created_at,
+                "elapsed": now - (self.started_at or now),
+                "error": self.error,
+            }
+
+
+class JobQueue:
+    """
+    Worker pool (thread) untuk job. Pembatalan bersifat kooperatif: job yang
+    masih antre dibatalkan langsung, job yang berjalan berhenti pada
+    pemeriksaan check_cancelled() berikutnya (biasanya di antara sumur).
+
+    Worker adalah daemon thread: job yang masih antre/berjalan tidak menahan
+    interpreter saat proses backend berhenti (ThreadPoolExecutor menunggu
+    seluruh antriannya selesai saat exit).
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 retention: float = DEFAULT_RETENTION):
+        self.max_workers = max_workers
+        self.retention = retention
+        self._queue = queue.Queue()
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._workers = [threading.Thread(target=self._worker, name=f'calc-job_{i}', daemon=True)
+                         for i in range(max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, func: Callable, *args, kind: str = '', owner: Optional[str] = None,
+               **kwargs) -> Job:
+        """Mendaftarkan func(job, *args, **kwargs); hasilnya (dict) menjadi job.result."""
+        job = Job(kind, owner)
+        job.future = Future()
+        with self._lock:
+            self._purge_locked(time.time())
+            self._jobs[job.id] = job
+        self._queue.put((job, func, args, kwargs))
+        return job
+
+    def _worker(self) -> None:
+        """(Internal) Loop worker; berhenti saat menerima None dari shutdown()."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            job, func, args, kwargs = item
+            if not job.future.set_running_or_notify_cancel():
+                continue  # dibatalkan selagi antre
+            try:
+                self._run(job, func, args, kwargs)
+            except BaseException as e:
+                job.future.set_exception(e)
+            else:
+                job.future.set_result(None)
+
+    def _run(self, job: Job, func: Callable, args: tuple, kwargs: dict) -> None:
+        """(Internal) Menjalankan job di worker dan mencatat status akhirnya."""
+        if job.cancel_requested:
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+        job.started_at = time.time()
+        job.status = RUNNING
+        try:
+            job.result = func(job, *args, **kwargs)
+            job.status = COMPLETED
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.current_well = None
+            job.finished_at = time.time()
+
+    def get(self, job_id: str, owner: Optional[str] = None) -> Optional[Job]:
+        """Job dengan id tersebut (None jika tidak ada atau milik sesi lain)."""
+        job = self._jobs.get(job_id)
+        if job is None or (owner is not None and job.owner != owner):
+            return None
+        return job
+
+    def cancel(self, job_id: str, owner: Optional[str] = None) -> Optional[Job]:
+        job = self.get(job_id, owner)
+        if job is None:
+            return None
+        job._cancel.set()
+        if job.future is not None and job.future.cancel():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        return job
+
+    def _purge_locked(self, now: float) -> None:
+        """(Internal) Membuang job selesai yang lebih tua dari retention."""
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.is_finished and now - job.finished_at > self.retention]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def jobs(self, owner: Optional[str] = None) -> list:
+        with self._lock:
+            return [job for job in self._jobs.values() if owner is None or job.owner == owner]
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {"max_workers": self.max_workers, "jobs": counts}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Membatalkan semua job (yang antre langsung, yang berjalan di antara sumur) dan menghentikan worker."""
+        for job in self.jobs():
+            self.cancel(job.id)
+        for _ in self._workers:
+            self._queue.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
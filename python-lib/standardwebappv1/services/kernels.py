@@ -0,0 +1,233 @@
+# Nama file: kernels.py
+# Deskripsi: Kernel Numba (JIT) untuk rumus petrofisika per sampel, dengan
+# saklar global. Backend Numba bersifat opt-in; jika numba tidak tersedia
+# (atau tidak diaktifkan), setiap service memakai implementasi NumPy miliknya
+# sendiri.
+
+import os
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# Saklar global, default mati; diaktifkan lewat env STANDARDWEBAPP_USE_NUMBA=1
+# atau set_numba_enabled(True)
+_use_numba = False
+
+
+def set_numba_enabled(enabled: bool) -> bool:
+    """
+    Mengaktifkan/menonaktifkan backend Numba untuk seluruh proses.
+    Saat diaktifkan, semua kernel langsung dikompilasi (warm_up) sehingga
+    JIT dan penulisan cache tidak terjadi di request pertama.
+    Mengembalikan status akhir (selalu False jika numba tidak terpasang).
+    """
+    global _use_numba
+    enabled = bool(enabled) and NUMBA_AVAILABLE
+    if enabled and not _use_numba:
+        warm_up()
+    _use_numba = enabled
+    return _use_numba
+
+
+def numba_enabled() -> bool:
+    """Apakah service harus memakai kernel Numba."""
+    return _use_numba
+
+
+def _as_float_array(values):
+    return np.ascontiguousarray(values, dtype=np.float64).ravel()
+
+
+# ---------------------------------------------------------------------------
+# SWGRAD: sweep Indonesia untuk seluruh salinitas
+# ---------------------------------------------------------------------------
+@njit(cache=True, parallel=True, error_model='numpy')
+def _indonesia_sweep_nb(rw_in, phie, ct, vsh, a, m, n, rtsh):
+    rows, cols = rw_in.shape
+    out = np.empty((rows, cols))
+    for i in prange(rows):
+        vsh_dd = vsh[i] ** (2 - vsh[i])
+        phie_m = phie[i] ** m
+        aa = vsh_dd / rtsh
+        for j in range(cols):
+            bb = phie_m / (a * rw_in[i, j])
+            cc = 2 * np.sqrt((vsh_dd * phie_m) / (a * rw_in[i, j] * rtsh))
+            denominator = aa + bb + cc
+            if denominator == 0:
+                swe = 1.0
+            else:
+                swe = (ct[i] / denominator) ** (1 / n)
+                if np.isnan(swe) or swe > 1.0:
+                    swe = 1.0
+                elif swe < 0.0:
+                    swe = 0.0
+            out[i, j] = swe
+    return out
+
+
+def indonesia_sweep(rw_in, phie, ct, vsh, a, m, n, rtsh):
+    """Matriks SW Indonesia (N x K) untuk rw_in (N x K) dan log per sampel (N)."""
+    rw_in = np.ascontiguousarray(rw_in, dtype=np.float64)
+    return _indonesia_sweep_nb(rw_in, _as_float_array(phie), _as_float_array(ct),
+                               _as_float_array(vsh), float(a), float(m),
+                               float(n), float(rtsh))
+
+
+# ---------------------------------------------------------------------------
+# Porosity: crossplot density-neutron
+# ---------------------------------------------------------------------------
+@njit(cache=True, parallel=True, error_model='numpy')
+def _dn_xplot_nb(rho0, nphi0, rho_ma, rho_max, rho_fl):
+    size = rho0.shape[0]
+    phix = np.empty(size)
+    rma = np.empty(size)
+    for i in prange(size):
+        phid = (rho_ma - rho0[i] * 1000) / (rho_ma - rho_fl)
+        if nphi0[i] >= phid:
+            pda = (rho_ma - rho_max) / (rho_ma - rho_fl)
+            pna = 0.7 - 10 ** (-5 * nphi0[i] - 0.16)
+        else:
+            pda = 1.0
+            pna = -2.06 * nphi0[i] - 1.17 + 10 ** (-16 * nphi0[i] - 0.4)
+
+        denom = pda - pna
+        if np.isnan(denom) or abs(denom) <= 1e-8:
+            phix[i] = np.nan
+            rma[i] = np.nan
+            continue
+
+        value = (pda * nphi0[i] - phid * pna) / denom
+        if np.isnan(value) or abs(1 - value) <= 1e-8:
+            phix[i] = np.nan
+            rma[i] = np.nan
+            continue
+
+        phix[i] = value
+        rma[i] = (rho0[i] * 1000 - value * rho_fl) / (1 - value)
+    return phix, rma
+
+
+def dn_xplot(rho0, nphi0, rho_ma, rho_max, rho_fl):
+    """Padanan Numba dari porosity.dn_xplot (mengembalikan PHIX, RMA)."""
+    rho0, nphi0 = np.broadcast_arrays(np.asarray(rho0, dtype=float),
+                                      np.asarray(nphi0, dtype=float))
+    phix, rma = _dn_xplot_nb(_as_float_array(rho0), _as_float_array(nphi0),
+                             float(rho_ma), float(rho_max), float(rho_fl))
+    return phix.reshape(rho0.shape), rma.reshape(rho0.shape)
+
+
+# ---------------------------------------------------------------------------
+# RT-R0
+# ---------------------------------------------------------------------------
+@njit(cache=True, parallel=True, error_model='numpy')
+def _r0_nb(phie, m, a, rw, vsh, rtsh):
+    size = phie.shape[0]
+    out = np.empty(size)
+    for i in prange(size):
+        aa = phie[i] ** m[i] / (a[i] * rw[i])
+        bb = vsh[i] ** (2 - vsh[i]) / rtsh[i]
+        out[i] = 1 / (aa + 2 * np.sqrt(aa * bb) + bb)
+    return out
+
+
+def r0(phie, m, a, rw, vsh, rtsh):
+    """R0 Indonesia per sampel; semua argumen berupa array sepanjang well."""
+    size = len(phie)
+    args = [np.broadcast_to(np.asarray(v, dtype=float), (size,))
+            for v in (phie, m, a, rw, vsh, rtsh)]
+    return _r0_nb(*[_as_float_array(v) for v in args])
+
+
+# ---------------------------------------------------------------------------
+# SW Indonesia
+# ---------------------------------------------------------------------------
+@njit(cache=True, parallel=True, error_model='numpy')
+def _sw_indonesia_nb(rt, phie, vsh, rw_temp, a, m, n, rt_sh):
+    size = rt.shape[0]
+    out = np.empty(size)
+    for i in prange(size):
+        v = vsh[i] ** 2
+        ff_times_rw_temp = a / phie[i] ** m * rw_temp
+        if ff_times_rw_temp == 0:
+            ff_times_rw_temp = np.nan
+
+        f1 = 1 / ff_times_rw_temp
+        f2 = 2 * np.sqrt(v / (ff_times_rw_temp * rt_sh))
+        f3 = v / rt_sh
+        denom = f1 + f2 + f3
+        if denom == 0:
+            denom = np.nan
+
+        sw = (1 / (rt[i] * denom)) ** (1 / n)
+        if phie[i] < 0.005:
+            sw = 1.0
+        if sw < 0.0:
+            sw = 0.0
+        elif sw > 1.0:
+            sw = 1.0
+        out[i] = sw
+    return out
+
+
+def sw_indonesia(rt, phie, vsh, rw_temp, a, m, n, rt_sh):
+    """SW Indonesia (sudah di-clip 0-1, PHIE < 0.005 -> 1.0)."""
+    return _sw_indonesia_nb(_as_float_array(rt), _as_float_array(phie),
+                            _as_float_array(vsh), float(rw_temp), float(a),
+                            float(m), float(n), float(rt_sh))
+
+
+# ---------------------------------------------------------------------------
+# RWA (Full, Simple, Tar)
+# ---------------------------------------------------------------------------
+@njit(cache=True, parallel=True, error_model='numpy')
+def _rwa_nb(rt, phie, vsh, a, m, rt_sh):
+    size = rt.shape[0]
+    out = np.empty((3, size))
+    for i in prange(size):
+        f1 = (phie[i] ** m) / a
+        f2 = 1 / rt[i]
+        # Eksponen VSH untuk Full, Simple dan Tar Sand
+        for k in range(3):
+            if k == 0:
+                v = vsh[i] ** (2 - vsh[i])
+            elif k == 1:
+                v = vsh[i] ** 2
+            else:
+                v = vsh[i] ** (2 - 2 * vsh[i])
+            f3 = v / rt_sh
+            f4 = np.sqrt(v / (rt[i] * rt_sh))
+            rwa = f1 / (f2 + f3 - f4)
+            out[k, i] = 0.0 if rwa < 0.0 else rwa
+    return out
+
+
+def rwa_indonesia(rt, phie, vsh, a, m, rt_sh):
+    """RWA_FULL, RWA_SIMPLE, RWA_TAR (sudah di-clip >= 0)."""
+    out = _rwa_nb(_as_float_array(rt), _as_float_array(phie),
+                  _as_float_array(vsh), float(a), float(m), float(rt_sh))
+    return out[0], out[1], out[2]
+
+
+def warm_up() -> None:
+    """Mengompilasi semua kernel dengan input kecil (dipanggil saat Numba diaktifkan)."""
+    ones = np.ones(2)
+    indonesia_sweep(np.ones((2, 2)), ones, ones, ones, 1.0, 2.0, 2.0, 1.0)
+    dn_xplot(ones * 2.3, ones * 0.2, 2650.0, 2900.0, 1000.0)
+    r0(ones * 0.2, ones * 2.0, ones, ones * 0.1, ones * 0.3, ones)
+    sw_indonesia(ones, ones * 0.2, ones * 0.3, 0.1, 1.0, 2.0, 2.0, 1.0)
+    rwa_indonesia(ones, ones * 0.2, ones * 0.3, 1.0, 2.0, 1.0)
+
+
+if NUMBA_AVAILABLE and os.environ.get('STANDARDWEBAPP_USE_NUMBA', '0') == '1':
+    set_numba_enabled(True)
@@ -16,7 +16,9 @@ import random
 import math
 import plotly.graph_objects as go
 import plotly.express as px
-from plotly.subplots import make_subplots
+
+from .decimation import decimate_indices, depth_window_indices
+from .figure_builder import DictFigure, make_subplots, Bar, Scatter, Scattergl
 
 colors = px.colors.qualitative.G10
 colors_dict = {
@@ -398,6 +400,21 @@ thres = {
     'X_RT_RHOB': 0.02
 }
 
+# Nilai kode tertinggi per flag numerik (skala warna flag_color)
+flag_max_value = {
+    'TEST': 3,
+    'CLASS': 6,
+    'ZONA': 4,
+    'RESERVOIR_CLASS': 4,
+    'IQUAL': 1,
+    'CTC': 6,
+}
+
+# Palet tetap untuk flag kategorikal: nilai ke-i (urutan kemunculan) selalu
+# mendapat warna ke-i, sehingga hasil plot deterministik
+FLAG_PALETTE = (px.colors.qualitative.Alphabet + px.colors.qualitative.Dark24
+                + px.colors.qualitative.Light24)
+
 line_width = 0.9
 
 # ----------------------------- Plot Function ------------------------------
@@ -463,6 +480,134 @@ def xover_label_df(df_well, key, type=1):
     return xover_dfs
 
 
+def xover_fill_bounds(df_well, key):
+    """
+    Kolom batas area crossover dan label per baris, setara xover_label_df
+    tanpa groupby.
+
+    Returns:
+        tuple: (left, right, label) berupa array numpy. Area fill berada di
+        antara `left` dan `right`; label 1 = crossover (left > right).
+    """
+    cols = data_col[key]
+    if key in ['X_RT_RO', 'X_RWA_RW', 'X_RT_F', 'X_RT_RHOB']:
+        left = df_well[cols[0]].to_numpy(dtype=float)
+        right = np.full(len(df_well), float(thres[key]))
+    elif key == 'NPHI_RHOB' or key == 'RT_RHOB':
+        left = df_well[cols[2]].to_numpy(dtype=float)
+        right = df_well[cols[3]].to_numpy(dtype=float)
+    else:
+        left = df_well[cols[0]].to_numpy(dtype=float)
+        right = df_well[cols[1]].to_numpy(dtype=float)
+    label = (left > right).astype(np.int8)
+    return left, right, label
+
+
+def xover_polygons(depth_values, left, right, mask, keep=None):
+    """
+    Koordinat poligon untuk setiap run baris berurutan dengan mask True:
+    `left` menurun sepanjang run lalu `right` kembali ke atas, dipisah NaN.
+    Dipakai dengan fill='toself' sehingga semua run menjadi satu trace.
+    `keep` (indeks baris terurut, opsional) membatasi titik poligon ke baris
+    hasil decimation; run tetap ditentukan dari baris asli.
+    """
+    depth_values = np.asarray(depth_values, dtype=float)
+    valid = (np.asarray(mask, dtype=bool) & np.isfinite(left)
+             & np.isfinite(right) & np.isfinite(depth_values))
+    rows = np.flatnonzero(valid)
+    if len(rows) == 0:
+        return np.array([]), np.array([])
+
+    # Run = baris valid yang indeksnya bersambung
+    new_run = np.empty(len(rows), dtype=bool)
+    new_run[0] = True
+    new_run[1:] = np.diff(rows) != 1
+    run_id = np.cumsum(new_run) - 1
+    if keep is not None:
+        kept = np.isin(rows, keep)
+        rows, run_id = rows[kept], run_id[kept]
+        if len(rows) == 0:
+            return np.array([]), np.array([])
+        new_run = np.empty(len(rows), dtype=bool)
+        new_run[0] = True
+        new_run[1:] = np.diff(run_id) != 0
+        run_id = np.cumsum(new_run) - 1
+    run_start = np.flatnonzero(new_run)
+    run_len = np.diff(np.append(run_start, len(rows)))
+
+    # Setiap run memakai 2*L titik + 1 pemisah NaN
+    offset = np.concatenate(([0], np.cumsum(2 * run_len + 1)[:-1]))
+    k = np.arange(len(rows)) - run_start[run_id]
+    forward = offset[run_id] + k
+    backward = offset[run_id] + 2 * run_len[run_id] - 1 - k
+
+    size = int(np.sum(2 * run_len + 1))
+    x = np.full(size, np.nan)
+    y = np.full(size, np.nan)
+    x[forward] = left[rows]
+    y[forward] = depth_values[rows]
+    x[backward] = right[rows]
+    y[backward] = depth_values[rows]
+    return x[:-1], y[:-1]
+
+
+def xover_rows(depth_values, left, right, max_points):
+    """
+    Baris yang dipakai poligon crossover agar satu poligon (left turun lalu
+    right naik) memakai sekitar max_points titik: gabungan indeks minmax
+    untuk left dan right. None bila tidak perlu decimation.
+    """
+    if not max_points or 2 * len(depth_values) <= max_points:
+        return None
+    budget = max(2, max_points // 4)
+    return np.union1d(decimate_indices(depth_values, left, budget),
+                      decimate_indices(depth_values, right, budget))
+
+
+def add_xover_fill(fig, df_well, key, fill_colors, xaxis, yaxis, left=None, right=None, label=None,
+                   max_points=None):
+    """
+    Menambahkan area crossover sebagai satu trace poligon per warna.
+
+    Parameters:
+    -----------
+    fill_colors : dict
+        {label: warna}; label 1 = crossover, label 0 = bukan crossover.
+        Warna transparan dilewati.
+    left, right, label : array, optional
+        Batas dan label kustom; default dari xover_fill_bounds(df_well, key).
+    max_points : int, optional
+        Batas titik per poligon; baris input di-decimate sebelum poligon
+        dibangun karena decimate_figure tidak bisa memotong poligon.
+    """
+    if left is None:
+        left, right, label = xover_fill_bounds(df_well, key)
+    depth_values = df_well[depth].to_numpy(dtype=float)
+    keep = xover_rows(depth_values, left, right, max_points)
+    for value, color in fill_colors.items():
+        if color in (None, 'rgba(0,0,0,0)'):
+            continue
+        x, y = xover_polygons(depth_values, left, right, label == value, keep)
+        if len(x) == 0:
+            continue
+        fig.add_trace(
+            Scatter(
+                x=x,
+                y=y,
+                mode='lines',
+                name='xover',
+                fill='toself',
+                fillcolor=color,
+                showlegend=False,
+                line=dict(color='rgba(0,0,0,0)', width=0),
+                xaxis=xaxis,
+                yaxis=yaxis,
+                hoverinfo="skip"
+            )
+        )
+    return fig
+
+
 def plot_line(df_well, fig, axes, base_key, n_seq, type=None, col=None, label=None):
     """
     Plot a line curve on the well log plot.
@@ -503,7 +648,7 @@ def plot_line(df_well, fig, axes, base_key, n_seq, type=None, col=None, label=No
 
     # Add trace to figure
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[col],
             y=df_well[depth],
             line=dict(color=color_col[base_key][0], width=line_width),
@@ -547,7 +692,7 @@ def plot_fill_x_to_int(df_well, fig, axes, key, n_seq, index):
 
     x_g = [t_g for x in df_well[col]]
     fig.add_trace(
-        go.Scatter(x=x_g, y=df_well[depth],
+        Scatter(x=x_g, y=df_well[depth],
                    line=dict(color='rgba(0,0,0,0)', width=0),
                    showlegend=False,
                    name='dummy'+col,
@@ -555,7 +700,7 @@ def plot_fill_x_to_int(df_well, fig, axes, key, n_seq, index):
         row=1, col=n_seq)
 
     fig.add_trace(
-        go.Scatter(
+        Scatter(
             x=df_well[col],
             y=df_well[depth],
             line=dict(color=color_col[key][index], width=line_width),
@@ -591,7 +736,7 @@ def plot_dual_gr(df_well, fig, axes, key, n_seq, counter, n_plots):
     # Plot kurva pertama (GR)
     col1 = data_col[key][0]  # 'GR'
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[col1],
             y=df_well[depth],
             line=dict(color=color_col[key][0], width=line_width),
@@ -608,7 +753,7 @@ def plot_dual_gr(df_well, fig, axes, key, n_seq, counter, n_plots):
     col2 = data_col[key][1]  # 'GR_NORM'
 
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[col2],
             y=df_well[depth],
             line=dict(color=color_col[key][1], width=line_width),
@@ -642,7 +787,8 @@ def plot_dual_gr(df_well, fig, axes, key, n_seq, counter, n_plots):
     return fig, axes, counter
 
 
-def plot_gsa_crossover(df_well, fig, axes, key, n_seq, counter, n_plots, fill_color_red='red', fill_color_blue=colors_dict['blue']):
+def plot_gsa_crossover(df_well, fig, axes, key, n_seq, counter, n_plots, fill_color_red='red', fill_color_blue=colors_dict['blue'],
+                       max_points=None):
     axes[key].append('yaxis'+str(n_seq))
     axes[key].append('xaxis'+str(n_seq))
 
@@ -668,7 +814,7 @@ def plot_gsa_crossover(df_well, fig, axes, key, n_seq, counter, n_plots, fill_co
 
     # Plot kurva utama terlebih dahulu
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[data_col[key][0]],
             y=df_well[depth],
             line=dict(color=color_col[key][0], width=line_width),
@@ -685,7 +831,7 @@ def plot_gsa_crossover(df_well, fig, axes, key, n_seq, counter, n_plots, fill_co
     axes[key].append('xaxis'+str(n_plots+counter))
 
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[data_col[key][1]],
             y=df_well[depth],
             line=dict(color=color_col[key][1], width=line_width),
@@ -705,99 +851,17 @@ def plot_gsa_crossover(df_well, fig, axes, key, n_seq, counter, n_plots, fill_co
     counter += 1
     axes[key].append('xaxis'+str(n_plots+counter))
 
-    # Buat DataFrame untuk crossover RED
-    xover_red_df = pd.DataFrame({
-        data_col[key][0]: df_well[data_col[key][0]],
-        data_col[key][1]: df_well[data_col[key][1]],
-        depth: df_well[depth],
-        'label_red': condition_red.astype(int)
-    })
-
-    # Buat DataFrame untuk crossover BLUE
-    xover_blue_df = pd.DataFrame({
-        data_col[key][0]: df_well[data_col[key][0]],
-        data_col[key][1]: df_well[data_col[key][1]],
-        depth: df_well[depth],
-        'label_blue': condition_blue.astype(int)
-    })
-
-    # Group berdasarkan perubahan label RED
-    xover_red_df['group'] = xover_red_df['label_red'].ne(
-        xover_red_df['label_red'].shift()).cumsum()
-    xover_red_groups = xover_red_df.groupby('group')
-
-    # Plot area fill RED untuk setiap group yang memenuhi kondisi
-    for _, group_data in xover_red_groups:
-        if group_data['label_red'].iloc[0] == 1:
-            # Baseline (invisible line)
-            fig.add_trace(
-                go.Scatter(
-                    x=group_data[data_col[key][0]],
-                    y=group_data[depth],
-                    name='baseline_red',
-                    showlegend=False,
-                    line=dict(color='rgba(0,0,0,0)', width=0),
-                    xaxis='x'+str(n_plots+counter-1),  # GUNAKAN AXIS KETIGA
-                    yaxis='y'+str(n_seq),
-                    hoverinfo="skip"
-                )
-            )
-
-            # Fill area RED (tonextx)
-            fig.add_trace(
-                go.Scatter(
-                    x=group_data[data_col[key][1]],
-                    y=group_data[depth],
-                    line=dict(color='rgba(0,0,0,0)', width=0),
-                    name='fill_area_red',
-                    fill='tonextx',
-                    showlegend=False,
-                    fillcolor=fill_color_red,
-                    # GUNAKAN AXIS KETIGA YANG SAMA
-                    xaxis='x'+str(n_plots+counter-1),
-                    yaxis='y'+str(n_seq),
-                    hoverinfo="skip"
-                )
-            )
-
-    # Group berdasarkan perubahan label BLUE
-    xover_blue_df['group'] = xover_blue_df['label_blue'].ne(
-        xover_blue_df['label_blue'].shift()).cumsum()
-    xover_blue_groups = xover_blue_df.groupby('group')
-
-    # Plot area fill BLUE untuk setiap group yang memenuhi kondisi
-    for _, group_data in xover_blue_groups:
-        if group_data['label_blue'].iloc[0] == 1:
-            # Baseline (invisible line)
-            fig.add_trace(
-                go.Scatter(
-                    x=group_data[data_col[key][0]],
-                    y=group_data[depth],
-                    name='baseline_blue',
-                    showlegend=False,
-                    line=dict(color='rgba(0,0,0,0)', width=0),
-                    xaxis='x'+str(n_plots+counter),  # GUNAKAN AXIS KEEMPAT
-                    yaxis='y'+str(n_seq),
-                    hoverinfo="skip"
-                )
-            )
-
-            # Fill area BLUE (tonextx)
-            fig.add_trace(
-                go.Scatter(
-                    x=group_data[data_col[key][1]],
-                    y=group_data[depth],
-                    line=dict(color='rgba(0,0,0,0)', width=0),
-                    name='fill_area_blue',
-                    fill='tonextx',
-                    showlegend=False,
-                    fillcolor=fill_color_blue,
-                    # GUNAKAN AXIS KEEMPAT YANG SAMA
-                    xaxis='x'+str(n_plots+counter),
-                    yaxis='y'+str(n_seq),
-                    hoverinfo="skip"
-                )
-            )
+    # Area fill RED (axis ketiga) dan BLUE (axis keempat), satu trace per warna
+    left = df_well[data_col[key][0]].to_numpy(dtype=float)
+    right = df_well[data_col[key][1]].to_numpy(dtype=float)
+    fig = add_xover_fill(fig, df_well, key, {1: fill_color_red},
+                         xaxis='x'+str(n_plots+counter-1), yaxis='y'+str(n_seq),
+                         left=left, right=right, label=condition_red.to_numpy().astype(np.int8),
+                         max_points=max_points)
+    fig = add_xover_fill(fig, df_well, key, {1: fill_color_blue},
+                         xaxis='x'+str(n_plots+counter), yaxis='y'+str(n_seq),
+                         left=left, right=right, label=condition_blue.to_numpy().astype(np.int8),
+                         max_points=max_points)
 
     # Update axis layout untuk axis pertama
     xaxis1 = "xaxis"+str(n_seq)
@@ -902,7 +966,7 @@ def plot_two_features_simple(df_well, fig, axes, key, n_seq, counter, n_plots, l
 
     # Plot kurva pertama (solid line) - menggunakan axis pertama
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[data_col[key][0]],
             y=df_well[depth],
             line=dict(
@@ -923,7 +987,7 @@ def plot_two_features_simple(df_well, fig, axes, key, n_seq, counter, n_plots, l
 
     # Plot kurva kedua (dashed line) - menggunakan axis kedua
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[data_col[key][1]],
             y=df_well[depth],
             line=dict(
@@ -994,7 +1058,7 @@ def plot_three_features_simple(df_well, fig, axes, key, n_seq, counter, n_plots,
 
     # Plot kurva pertama (solid line) - menggunakan axis pertama
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[data_col[key][0]],
             y=df_well[depth],
             line=dict(
@@ -1015,7 +1079,7 @@ def plot_three_features_simple(df_well, fig, axes, key, n_seq, counter, n_plots,
 
     # Plot kurva kedua (dashed line) - menggunakan axis kedua
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[data_col[key][1]],
             y=df_well[depth],
             line=dict(
@@ -1037,7 +1101,7 @@ def plot_three_features_simple(df_well, fig, axes, key, n_seq, counter, n_plots,
 
     # Plot kurva ketiga (dotted line) - menggunakan axis ketiga
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[data_col[key][2]],
             y=df_well[depth],
             line=dict(
@@ -1132,7 +1196,7 @@ def plot_four_features_simple(df_well, fig, axes, key, n_seq, counter, n_plots,
     for i in range(4):
         # Plot kurva
         fig.add_trace(
-            go.Scattergl(
+            Scattergl(
                 x=df_well[data_col[key][i]],
                 y=df_well[depth],
                 line=dict(
@@ -1186,45 +1250,18 @@ def plot_four_features_simple(df_well, fig, axes, key, n_seq, counter, n_plots,
     return fig, axes, counter
 
 
-def plot_xover(df_well, fig, axes, key, n_seq, counter, n_plots, y_color='limegreen', n_color='lightgray'):
+def plot_xover(df_well, fig, axes, key, n_seq, counter, n_plots, y_color='limegreen', n_color='lightgray', max_points=None):
     axes[key].append('yaxis'+str(n_seq))
     axes[key].append('xaxis'+str(n_seq))
 
     # Plot Area Xover
-    xover_dfs = xover_label_df(df_well, key, type=1)
-    for xover_df in xover_dfs:
-        fig.add_traces(
-            go.Scatter(
-                x=xover_df[data_col[key][0]],
-                y=xover_df[depth],
-                name='xover',
-                showlegend=False,
-                line=dict(color='rgba(0,0,0,0)', width=0),
-                xaxis='x'+str(n_seq),
-                yaxis='y'+str(n_seq),
-                hoverinfo="skip"
-            ),
-        )
-
-        fig.add_traces(
-            go.Scatter(
-                x=xover_df[data_col[key][1]],
-                y=xover_df[depth],
-                line=dict(color='rgba(0,0,0,0)', width=0),
-                name='xover',
-                fill='tonextx',
-                showlegend=False,
-                fillcolor=fillcol(xover_df['label'].iloc[0], y_color, n_color),
-                xaxis='x'+str(n_seq),
-                yaxis='y'+str(n_seq),
-                hoverinfo="skip"
-            ),
-        )
+    fig = add_xover_fill(fig, df_well, key, {1: y_color},
+                         xaxis='x'+str(n_seq), yaxis='y'+str(n_seq), max_points=max_points)
 
     # Plot Line
     col = data_col[key][0]
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[col],
             y=df_well[depth],
             line=dict(color=color_col[key][0], width=line_width),
@@ -1237,7 +1274,7 @@ def plot_xover(df_well, fig, axes, key, n_seq, counter, n_plots, y_color='limegr
 
     col = data_col[key][1]
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[col],
             y=df_well[depth],
             line=dict(color=color_col[key][1], width=line_width),
@@ -1260,7 +1297,7 @@ def plot_xover(df_well, fig, axes, key, n_seq, counter, n_plots, y_color='limegr
     counter += 1
     axes[key].append('xaxis'+str(n_plots+counter))
     fig.add_trace(
-        go.Scatter(
+        Scatter(
             x=[], y=[],
             line=dict(color="rgba(0,0,0,0)", width=0),
             name=col,
@@ -1285,45 +1322,18 @@ def plot_xover(df_well, fig, axes, key, n_seq, counter, n_plots, y_color='limegr
     return fig, axes, counter
 
 
-def plot_xover_thres(df_well, fig, axes, key, n_seq, counter, y_color=colors_dict['red'], n_color='lightgray'):
+def plot_xover_thres(df_well, fig, axes, key, n_seq, counter, y_color=colors_dict['red'], n_color='lightgray', max_points=None):
     axes[key].append('yaxis'+str(n_seq))
     axes[key].append('xaxis'+str(n_seq))
 
     # Plot Area Xover
-    xover_dfs = xover_label_df(df_well, key, type=1)
-    for xover_df in xover_dfs:
-        fig.add_traces(
-            go.Scatter(
-                x=xover_df[data_col[key][0]],
-                y=xover_df[depth],
-                name='xover',
-                showlegend=False,
-                line=dict(color='rgba(0,0,0,0)', width=0),
-                xaxis='x'+str(n_seq),
-                yaxis='y'+str(n_seq),
-                hoverinfo="skip"
-            ),
-        )
-
-        fig.add_traces(
-            go.Scatter(
-                x=xover_df['thres'],
-                y=xover_df[depth],
-                line=dict(color='rgba(0,0,0,0)', width=0),
-                name='xover',
-                fill='tonextx',
-                showlegend=False,
-                fillcolor=fillcol(xover_df['label'].iloc[0], y_color, n_color),
-                xaxis='x'+str(n_seq),
-                yaxis='y'+str(n_seq),
-                hoverinfo="skip"
-            ),
-        )
+    fig = add_xover_fill(fig, df_well, key, {1: y_color},
+                         xaxis='x'+str(n_seq), yaxis='y'+str(n_seq), max_points=max_points)
 
     # Plot Line
     col = data_col[key][0]
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=df_well[col],
             y=df_well[depth],
             line=dict(color=color_col[key][0], width=line_width),
@@ -1335,7 +1345,7 @@ def plot_xover_thres(df_well, fig, axes, key, n_seq, counter, y_color=colors_dic
     )
 
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=[thres[key]]*len(df_well[depth]),
             y=df_well[depth],
             line=dict(color=colors_dict['red'], width=line_width),
@@ -1356,13 +1366,14 @@ def plot_xover_thres(df_well, fig, axes, key, n_seq, counter, y_color=colors_dic
     return fig, axes, counter
 
 
-def plot_xover_log_normal(df_well, fig, axes, key, n_seq, counter, n_plots, y_color='limegreen', n_color='lightgray', type=1, exclude_crossover=False):
+def plot_xover_log_normal(df_well, fig, axes, key, n_seq, counter, n_plots, y_color='limegreen', n_color='lightgray', type=1, exclude_crossover=False,
+                          max_points=None):
     axes[key] = ['yaxis'+str(n_seq), 'xaxis'+str(n_seq)]  # Initialize
     col = data_col[key][0]
     range_type = 'log' if col == 'RT' else "-"
     range_axis = [np.log10(range_col[key][0][0]), np.log10(
         range_col[key][0][1])] if range_type == 'log' else range_col[key][0]
-    fig.add_trace(go.Scattergl(x=df_well[col], y=df_well[depth], line=dict(
+    fig.add_trace(Scattergl(x=df_well[col], y=df_well[depth], line=dict(
         color=color_col[key][0], width=line_width), name=col, legend=legends[n_seq-1], showlegend=False), row=1, col=n_seq)
     fig.update_layout(
         **{"xaxis"+str(n_seq): dict(side="top", type=range_type, range=range_axis)})
@@ -1373,7 +1384,7 @@ def plot_xover_log_normal(df_well, fig, axes, key, n_seq, counter, n_plots, y_co
     range_type = 'log' if col == 'RT' else "-"
     range_axis = [np.log10(range_col[key][1][0]), np.log10(
         range_col[key][1][1])] if range_type == 'log' else range_col[key][1]
-    fig.add_trace(go.Scattergl(x=df_well[col], y=df_well[depth], line=dict(color=color_col[key][1], width=line_width),
+    fig.add_trace(Scattergl(x=df_well[col], y=df_well[depth], line=dict(color=color_col[key][1], width=line_width),
                   name=col, legend=legends[n_seq-1], showlegend=False, xaxis='x'+str(n_plots+counter), yaxis='y'+str(n_seq)))
     fig.update_layout(**{"xaxis"+str(n_plots+counter): dict(overlaying="x" +
                       str(n_seq), side="top", type=range_type, range=range_axis)})
@@ -1381,12 +1392,10 @@ def plot_xover_log_normal(df_well, fig, axes, key, n_seq, counter, n_plots, y_co
     if not exclude_crossover:
         counter += 1
         axes[key].append('xaxis'+str(n_plots+counter))
-        xover_dfs = xover_label_df(df_well, key, type=type)
-        for xover_df in xover_dfs:
-            fig.add_traces(go.Scatter(x=xover_df[data_col[key][2]], y=xover_df[depth], name='xover', showlegend=False, line=dict(
-                color='rgba(0,0,0,0)'), xaxis='x'+str(n_plots+counter), yaxis='y'+str(n_seq), hoverinfo="skip"))
-            fig.add_traces(go.Scatter(x=xover_df[data_col[key][3]], y=xover_df[depth], line=dict(color='rgba(0,0,0,0)'), name='xover', fill='tonextx', showlegend=False, fillcolor=fillcol(
-                xover_df['label'].iloc[0], y_color, n_color), xaxis='x'+str(n_plots+counter), yaxis='y'+str(n_seq), hoverinfo="skip"))
+        # type=1: hanya run crossover; type=2: run lain diberi n_color
+        fill_colors = {1: y_color} if type == 1 else {1: y_color, 0: n_color}
+        fig = add_xover_fill(fig, df_well, key, fill_colors,
+                             xaxis='x'+str(n_plots+counter), yaxis='y'+str(n_seq), max_points=max_points)
         fig.update_layout(**{"xaxis"+str(n_plots+counter): dict(visible=False,
                           overlaying="x"+str(n_seq), side="top", range=range_col[key][0])})
 
@@ -1396,7 +1405,7 @@ def plot_xover_log_normal(df_well, fig, axes, key, n_seq, counter, n_plots, y_co
 def plot_fill_x_to_zero(df_well, fig, axes, key, n_seq, index):
     col = data_col[key][index]
     fig.add_trace(
-        go.Scatter(
+        Scatter(
             x=df_well[col],
             y=df_well[depth],
             line=dict(color=color_col[key][index], width=line_width),
@@ -1429,7 +1438,7 @@ def plot_n_fill_x_to_zero(df_well, fig, axes, key, n_seq, counter, n_plots):
     axes[key].append('xaxis'+str(n_seq))
     for ind, col in enumerate(data_col[key]):
         fig.add_trace(
-            go.Scatter(
+            Scatter(
                 x=df_well[col],
                 y=df_well[depth],
                 line=dict(color=color_col[key][ind], width=line_width),
@@ -1452,7 +1461,7 @@ def plot_n_fill_x_to_zero(df_well, fig, axes, key, n_seq, counter, n_plots):
     for j in range(1, len(data_col[key])):
         counter += 1
         fig.add_trace(
-            go.Scatter(
+            Scatter(
                 x=[],
                 y=[],
                 line=dict(color="rgba(0,0,0,0)", width=0),
@@ -1477,71 +1486,104 @@ def plot_n_fill_x_to_zero(df_well, fig, axes, key, n_seq, counter, n_plots):
     return fig, axes, counter
 
 
+def depth_cell_edges(depth_values):
+    """
+    Batas sel setiap sampel depth (titik tengah antar sampel), sama seperti
+    sel go.Heatmap. Panjang hasil = jumlah sampel + 1.
+    """
+    depth_values = np.asarray(depth_values, dtype=float)
+    if len(depth_values) == 0:
+        return np.array([])
+    if len(depth_values) == 1:
+        return np.array([depth_values[0] - 0.5, depth_values[0] + 0.5])
+    mid = (depth_values[1:] + depth_values[:-1]) / 2
+    first = depth_values[0] - (mid[0] - depth_values[0])
+    last = depth_values[-1] + (depth_values[-1] - mid[-1])
+    return np.concatenate(([first], mid, [last]))
+
+
+def flag_runs(codes):
+    """Indeks awal dan akhir (eksklusif) setiap run kode yang sama berurutan."""
+    codes = np.asarray(codes)
+    if len(codes) == 0:
+        return np.array([], dtype=np.intp), np.array([], dtype=np.intp)
+    change = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    stops = np.append(change, len(codes))
+    return starts, stops
+
+
+def flag_codes(df_well, key):
+    """
+    Kode integer per sampel beserta nama dan warna per kode.
+
+    Flag numerik (TEST, CLASS, ZONA, ...) memakai flag_color/flags_name dengan
+    warna menurut posisi, sama seperti colorscale heatmap sebelumnya. Flag
+    kategorikal (MARKER, RGBE, RPBE) dikodekan menurut urutan kemunculan;
+    kode 0 = kosong (transparan) dan warnanya diambil dari FLAG_PALETTE.
+
+    Returns:
+        tuple: (codes, names, colors); codes -1 = tidak digambar.
+    """
+    col = data_col[key][0]
+    if key in ['MARKER', 'RGBE', 'RPBE']:
+        codes, uniques = pd.factorize(df_well[col], use_na_sentinel=True)
+        names = {0: ''}
+        colors = {0: 'rgba(0,0,0,0)'}
+        for i, value in enumerate(uniques):
+            names[i + 1] = str(value)
+            colors[i + 1] = FLAG_PALETTE[i % len(FLAG_PALETTE)]
+        return codes + 1, names, colors
+
+    max_val = flag_max_value[key]
+    palette = list(flag_color[key].values())
+    values = pd.to_numeric(df_well[col], errors='coerce').to_numpy(dtype=float)
+    codes = np.where(np.isnan(values), -1, np.nan_to_num(values)).astype(int)
+    colors = {}
+    for code in np.unique(codes[codes >= 0]):
+        position = int(np.floor(code * len(palette) / max_val + 1e-9))
+        colors[int(code)] = palette[min(max(position, 0), len(palette) - 1)]
+    return codes, flags_name[key], colors
+
+
 def plot_flag(df_well, fig, axes, key, n_seq):
+    """
+    Track flag/marker sebagai satu batang (go.Bar horizontal) per run nilai
+    yang berurutan, dengan satu label hover per run. Biaya sebanding dengan
+    jumlah interval, bukan jumlah sampel.
+    """
     col = data_col[key][0]
-    if key == 'TEST':
-        flag_colors = flag_color[key]
-        flags_names = flags_name[key]
-        max_val = 3
-    elif key == 'CLASS':
-        flag_colors = flag_color[key]
-        flags_names = flags_name[key]
-        max_val = 6
-    elif key == 'ZONA':
-        flag_colors = flag_color[key]
-        flags_names = flags_name[key]
-        max_val = 4
-    elif key == 'RESERVOIR_CLASS':
-        flag_colors = flag_color[key]
-        flags_names = flags_name[key]
-        max_val = 4
-    elif key == 'IQUAL':
-        flag_colors = flag_color[key]
-        flags_names = flags_name[key]
-        max_val = 1
-    elif key == 'CTC':
-        flag_colors = flag_color[key]
-        flags_names = flags_name[key]
-        max_val = 6
-    elif key in ['MARKER', 'RGBE', 'RPBE']:
-        df_well, flags_names = encode_with_nan(df_well, key)
-        max_val = len(flags_names.keys())
-        flag_colors = {}
-        for i in range(max_val):
-            flag_colors[int(i)] = generate_new_color(
-                flag_colors, pastel_factor=0)
-
-        for i in range(max_val):
-            flag_colors[int(i)] = rgb_to_hex(flag_colors[int(i)])
-
-        flag_colors[0] = 'rgba(0,0,0,0)'
-
-    ones = np.ones((len(df_well[depth]), 1))
-    arr = np.array(df_well[col]/max_val).reshape(-1, 1)
-    fill = np.multiply(ones, arr)
-
-    bvals = []
-    for i in range(1, len(flag_colors.values())+2):
-        bvals.append(i)
-    colors = list(flag_colors.values())
-    colorscale = discrete_colorscale(bvals, colors)
-
-    custom_data = []
-    flag_names = df_well[col].map(flags_names.get)
-    for i in flag_names:
-        custom_data.append([i]*int(max_val+1))
+    codes, names, colors = flag_codes(df_well, key)
+    edges = depth_cell_edges(df_well[depth])
+    starts, stops = flag_runs(codes)
+
+    run_codes = codes[starts] if len(starts) else codes[:0]
+    visible = np.array([code >= 0 and colors.get(int(code)) != 'rgba(0,0,0,0)'
+                        for code in run_codes], dtype=bool)
+    starts, stops, run_codes = starts[visible], stops[visible], run_codes[visible]
 
     fig.add_trace(
-        go.Heatmap(z=fill, zmin=0, zmax=1, y=df_well[depth], name=col,
-                   customdata=custom_data, colorscale=colorscale, showscale=False, hovertemplate="%{customdata}"),
+        Bar(
+            x=np.ones(len(starts)),
+            y=edges[starts],
+            base=0,
+            width=edges[stops] - edges[starts],
+            offset=0,
+            orientation='h',
+            marker=dict(color=[colors[int(c)] for c in run_codes], line=dict(width=0)),
+            customdata=[names.get(int(c), str(c)) for c in run_codes],
+            hovertemplate="%{customdata}",
+            name=col,
+            showlegend=False,
+        ),
         row=1, col=n_seq, )
 
-    xaxis = "xaxis"+str(n_seq)
     xaxis = "xaxis"+str(n_seq)
     fig.update_layout(
         **{xaxis: dict(
             side="top",
             showticklabels=False,
+            range=[0, 1],
         )}
     )
 
@@ -1553,7 +1595,7 @@ def plot_flag(df_well, fig, axes, key, n_seq):
 
 def plot_xpt(df_well, fig, axes, key, n_seq):
     fig.add_trace(
-        go.Scattergl(
+        Scattergl(
             x=[1]*len(df_well[depth]),
             y=df_well[depth],
             line=dict(color="rgba(0,0,0,0)", width=0),
@@ -1646,7 +1688,7 @@ def plot_text_values(df_text, depth_btm, fig, axes, key, n_seq):
         # Membuat trace kosong untuk mendefinisikan axes
         # Menggunakan scatter plot kosong sebagai placeholder
         fig.add_trace(
-            go.Scatter(
+            Scatter(
                 x=[0, 1],  # range x sederhana
                 y=[df_text['Mean Depth'].min(), df_text['Mean Depth'].max()
                    ],  # range y berdasarkan data
@@ -1708,21 +1750,58 @@ def plot_text_values(df_text, depth_btm, fig, axes, key, n_seq):
 # ---------------------------- Layout FUnction -----------------------------
 
 
-def layout_range_all_axis(fig, axes, plot_sequence):
+def _layout_axis_name(axis):
+    # 'xaxis1'/'yaxis1' disimpan Plotly sebagai 'xaxis'/'yaxis'
+    return axis[:-1] if axis in ('xaxis1', 'yaxis1') else axis
+
+
+def _copy_layout_props(value):
+    """(Internal) Salinan dict/list properti layout (array numpy dipakai bersama)."""
+    if isinstance(value, dict):
+        return {key: _copy_layout_props(v) for key, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_layout_props(v) for v in value]
+    return value
+
+
+def _merge_layout_props(base, update):
+    """(Internal) Gabungan rekursif dua dict properti layout; nilai update menang."""
+    merged = dict(base) if base else {}
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge_layout_props(merged[key], value)
+        else:
+            merged[key] = _copy_layout_props(value)
+    return merged
+
+
+def _add_axis_props(axis_props, axis, props):
+    name = _layout_axis_name(axis)
+    axis_props[name] = _merge_layout_props(axis_props.get(name), props)
+
+
+def _line_positions(ratio_plots):
+    ratio_plots = np.array(ratio_plots)
+    line_pos = []
+    for i in ratio_plots:
+        line_pos.append(
+            i*(1/(ratio_plots/len(ratio_plots)).sum())/len(ratio_plots))
+    return line_pos
+
+
+def _range_axis_props(axes, axis_props=None):
+    """(Internal) Properti tickvals/grid per axis (isi layout_range_all_axis)."""
+    axis_props = {} if axis_props is None else axis_props
     for key, axess in axes.items():
         for axis in axess:
-            # key = plot_sequence[i]
             if axis.startswith('yaxis'):
-                fig.update_layout(
-                    **{axis: dict(
-                        domain=[0, 0.9],
-                        gridcolor='gainsboro',
-                        showspikes=True,
-                        showgrid=True,
-                        showticklabels=False if axis.startswith(
-                            'xaxis') else True,
-                    )}
-                )
+                _add_axis_props(axis_props, axis, dict(
+                    domain=[0, 0.9],
+                    gridcolor='gainsboro',
+                    showspikes=True,
+                    showgrid=True,
+                    showticklabels=True,
+                ))
             elif key in ['RT_RO', 'PERM', 'RWAPP_RW', 'RT_F', 'RT_RHOB', 'RT_RGSA', 'RT', 'RT_GR', 'RT_PHIE']:
                 a = range_col[key][0][0]
                 b = range_col[key][0][1]
@@ -1732,94 +1811,59 @@ def layout_range_all_axis(fig, axes, plot_sequence):
                     arr = arr + list(np.arange(10**(j-1), 10**j, 10**(j-1)))
                 arr = arr + list(np.arange(1000, b+1, 1000))
 
-                fig.update_layout(
-                    **{axis: dict(
-                        # gridcolor='rgba(0,0,0,0)',
-                        tickvals=arr,
-                        gridcolor='gainsboro',
-                        side="top",
-                        fixedrange=True,
-                        showticklabels=False if axis.startswith(
-                            'xaxis') else True,
-                    )}
-                )
+                _add_axis_props(axis_props, axis, dict(
+                    tickvals=arr,
+                    gridcolor='gainsboro',
+                    side="top",
+                    fixedrange=True,
+                    showticklabels=False if axis.startswith('xaxis') else True,
+                ))
             elif key in ['GR', 'SP', 'GR_NORM', 'GR_DUAL', 'RTRO', 'NPHI_RHOB', 'SW', 'PHIE_PHIT', 'VCL', 'X_RWA_RW', 'X_RT_F', 'X_RT_RHOB', 'NPHI_NGSA', 'RHOB_DGSA', 'VSH_LINEAR', 'VSH_DN', 'VSH_SP', 'RHOB', 'PHIE_DEN', 'PHIT_DEN', 'RWA', 'PHIE', 'DNS', 'DNSV', 'VSH']:
-                fig.update_layout(
-                    **{axis: dict(
-                        # gridcolor='rgba(0,0,0,0)',
-                        tickvals=list(np.linspace(
-                            range_col[key][0][0], range_col[key][0][1], 5)),
-                        gridcolor='gainsboro',
-                        side="top",
-                        fixedrange=True,
-                        showticklabels=False if axis.startswith(
-                            'xaxis') else True,
-                    )}
-                )
-    return fig
-
-
-def layout_draw_lines(fig, ratio_plots, df_well, xgrid_intv):
-    # Menambahkan garis pembatas
-    ratio_plots = np.array(ratio_plots)
-    line_pos = []
-    for i in ratio_plots:
-        line_pos.append(
-            i*(1/(ratio_plots/len(ratio_plots)).sum())/len(ratio_plots))
-    shapes = []
-
-    shapes.append(
-        dict(
-            type='line', xref='paper', yref='paper', x0=0, x1=0, y0=1, y1=0,
-            line=dict(color='black', width=1, dash='solid')
-        )
-    )
+                _add_axis_props(axis_props, axis, dict(
+                    tickvals=list(np.linspace(
+                        range_col[key][0][0], range_col[key][0][1], 5)),
+                    gridcolor='gainsboro',
+                    side="top",
+                    fixedrange=True,
+                    showticklabels=False if axis.startswith('xaxis') else True,
+                ))
+    return axis_props
+
+
+def _border_shapes(ratio_plots):
+    """(Internal) Garis pembatas track dan header (tanpa grid depth)."""
+    line_style = dict(color='black', width=1, dash='solid')
+    shapes = [dict(type='line', xref='paper', yref='paper', x0=0, x1=0, y0=1, y1=0,
+                   line=line_style)]
 
     x = 0
-    for pos in line_pos:
+    for pos in _line_positions(ratio_plots):
         x += pos
-        shapes.append(
-            dict(
-                type='line', xref='paper', yref='paper', x0=x, x1=x, y0=1, y1=0,
-                line=dict(color='black', width=1, dash='solid')
-            )
-        )
-
-    for i in range(2):
-        shapes.append(
-            dict(
-                type='line', xref='paper', yref='paper', x0=0, x1=1, y0=i, y1=i,
-                line=dict(color='black', width=1, dash='solid')
-            )
-        )
-
-    shapes.append(
-        dict(
-            type='line', xref='paper', yref='paper', x0=0, x1=1, y0=0.9, y1=0.9,
-            line=dict(color='black', width=1, dash='solid')
-        )
-    )
-
-    # plot grid
-    if xgrid_intv is not None and xgrid_intv != 0:
-        shapes = shapes + [dict(layer='below',
-                                type="line",
-                                x0=0, x1=1,
-                                xref="paper",
-                                y0=y, y1=y,
-                                line=dict(color="gainsboro", width=1)) for y in range(0, int(df_well[depth].max()), xgrid_intv)]  # Setiap 2 satuan
-
-        fig.update_layout(shapes=shapes, yaxis=dict(showgrid=False))
-    else:
-        fig.update_layout(shapes=shapes)
-
-    return fig
-
-# ---panggil layout axis
-
-
-def layout_axis(fig, axes, ratio_plots, plot_sequence):
-    fig.add_annotation(
+        shapes.append(dict(type='line', xref='paper', yref='paper', x0=x, x1=x, y0=1, y1=0,
+                           line=line_style))
+
+    for y in (0, 1, 0.9):
+        shapes.append(dict(type='line', xref='paper', yref='paper', x0=0, x1=1, y0=y, y1=y,
+                           line=line_style))
+    return shapes
+
+
+def _grid_shapes(df_well, xgrid_intv):
+    """(Internal) Garis grid depth setiap xgrid_intv; bergantung pada depth maksimum data."""
+    if xgrid_intv is None or xgrid_intv == 0:
+        return []
+    return [dict(layer='below',
+                 type="line",
+                 x0=0, x1=1,
+                 xref="paper",
+                 y0=y, y1=y,
+                 line=dict(color="gainsboro", width=1)) for y in range(0, int(df_well[depth].max()), xgrid_intv)]
+
+
+def _header_layout(axes, ratio_plots, axis_props=None):
+    """(Internal) Properti axis header dan anotasi nama/unit/range (isi layout_axis)."""
+    axis_props = {} if axis_props is None else axis_props
+    annotations = [
         dict(font=dict(color='black', size=12),
              x=-0.001,
              y=0.97,
@@ -1831,19 +1875,13 @@ def layout_axis(fig, axes, ratio_plots, plot_sequence):
              xref='paper',
              yref="paper"
              )
-    )
-    pos_x_c = 0
-    ratio_plots = np.array(ratio_plots)
-    line_pos = []
-    for i in ratio_plots:
-        line_pos.append(
-            i*(1/(ratio_plots/len(ratio_plots)).sum())/len(ratio_plots))
+    ]
+    line_pos = _line_positions(ratio_plots)
 
+    pos_x_c = 0
     pos_x_t = 0
     for i, key in enumerate(axes.keys()):
-        # key = plot_sequence[i]
         pos_x = line_pos[i]
-        # pos_y = 0.85
         pos_y = 0.92
         pos_x_c += 0.5*pos_x
 
@@ -1854,80 +1892,34 @@ def layout_axis(fig, axes, ratio_plots, plot_sequence):
             axis_range = axes[key][1:3]  # Hanya 2 axis pertama
 
         for j, axis in enumerate(axis_range):
-            # print(f'{i}:{j}')
-            fig.update_layout(
-                **{axis: dict(
-                    tickfont=dict(color=color_col[key][j], size=9),
-                    anchor="free",
-                    showline=True,
-                    position=pos_y,
-                    showticklabels=False,
-                    linewidth=1.5,
-                    linecolor=color_col[key][j],
-                )}
-            )
-
-            # Add Text Parameter
-            fig.add_annotation(
-                dict(font=dict(color=color_col[key][j], size=12),
-                     # x=x_loc,
-                     x=pos_x_c,
-                     y=pos_y,
-                     xanchor="center",
-                     yanchor="bottom",
-                     showarrow=False,
-                     text=data_col[key][j],
-                     textangle=0,
-                     xref='paper',
-                     yref="paper"
-                     )
-            )
-
-            # Add Text Unit
-            fig.add_annotation(
-                dict(font=dict(color=color_col[key][j], size=10),
-                     x=pos_x_c,
-                     y=pos_y,
-                     xanchor="center",
-                     yanchor="top",
-                     showarrow=False,
-                     text=unit_col[key][j],
-                     textangle=0,
-                     xref='paper',
-                     yref="paper"
-                     )
-            )
-
-            # Add Text Min Max Range
+            color = color_col[key][j]
+            _add_axis_props(axis_props, axis, dict(
+                tickfont=dict(color=color, size=9),
+                anchor="free",
+                showline=True,
+                position=pos_y,
+                showticklabels=False,
+                linewidth=1.5,
+                linecolor=color,
+            ))
+
+            text_style = dict(showarrow=False, textangle=0, xref='paper', yref="paper")
+            # Text Parameter dan Unit
+            annotations.append(dict(font=dict(color=color, size=12), x=pos_x_c, y=pos_y,
+                                    xanchor="center", yanchor="bottom",
+                                    text=data_col[key][j], **text_style))
+            annotations.append(dict(font=dict(color=color, size=10), x=pos_x_c, y=pos_y,
+                                    xanchor="center", yanchor="top",
+                                    text=unit_col[key][j], **text_style))
+
+            # Text Min Max Range
             if key not in ['CLASS', 'TEST', 'XPT', 'MARKER', 'ZONA', 'RESERVOIR_CLASS', 'RGBE', 'RPBE', 'IQUAL', 'RGBE_TEXT', 'RPBE_TEXT']:
-                fig.add_annotation(
-                    dict(font=dict(color=color_col[key][j], size=10),
-                         x=pos_x_t,
-                         y=pos_y,
-                         xanchor="left",
-                         yanchor="top",
-                         showarrow=False,
-                         text=range_col[key][j][0],
-                         textangle=0,
-                         xref='paper',
-                         yref="paper"
-                         )
-                )
-
-                fig.add_annotation(
-                    dict(font=dict(color=color_col[key][j], size=10),
-                         # x=x_loc,
-                         x=pos_x_t+pos_x,
-                         y=pos_y,
-                         xanchor="right",
-                         yanchor="top",
-                         showarrow=False,
-                         text=range_col[key][j][1],
-                         textangle=0,
-                         xref='paper',
-                         yref="paper"
-                         )
-                )
+                annotations.append(dict(font=dict(color=color, size=10), x=pos_x_t, y=pos_y,
+                                        xanchor="left", yanchor="top",
+                                        text=range_col[key][j][0], **text_style))
+                annotations.append(dict(font=dict(color=color, size=10), x=pos_x_t+pos_x, y=pos_y,
+                                        xanchor="right", yanchor="top",
+                                        text=range_col[key][j][1], **text_style))
 
             pos_y += 0.03
             pos_y = min(pos_y, 1.0)
@@ -1935,6 +1927,117 @@ def layout_axis(fig, axes, ratio_plots, plot_sequence):
         pos_x_t += pos_x
         pos_x_c += 0.5*pos_x
 
+    return axis_props, annotations
+
+
+def stamp_layout(fig, props, annotations=None):
+    """
+    Menerapkan dict layout yang sudah tervalidasi ke figure tanpa validasi
+    ulang per properti (seperti Plotly menerapkan template default). Dict axis
+    digabung dengan yang sudah ada; anotasi ditambahkan ke anotasi figure.
+    Berlaku untuk go.Figure maupun DictFigure.
+    """
+    # DictFigure tidak punya objek layout: dict-nya langsung diisi
+    layout = None if isinstance(fig, DictFigure) else fig.layout
+    if layout is not None:
+        layout._validate = False
+    try:
+        # Template di-cache: figure selalu menerima salinan
+        for key, value in props.items():
+            current = fig._layout.get(key)
+            if isinstance(value, dict) and isinstance(current, dict):
+                # Assignment subplot (xaxis2, ...) lewat layout[key] selalu
+                # divalidasi Plotly. Untuk axis yang sudah ada cukup dict-nya
+                # yang diganti: objek axis membaca propertinya dari dict layout
+                fig._layout[key] = _merge_layout_props(current, value)
+            elif layout is None:
+                fig._layout[key] = _copy_layout_props(value)
+            else:
+                layout[key] = _copy_layout_props(value)
+        if annotations:
+            merged = list(fig._layout.get('annotations', ())) + _copy_layout_props(annotations)
+            if layout is None:
+                fig._layout['annotations'] = merged
+            else:
+                layout['annotations'] = merged
+    finally:
+        if layout is not None:
+            layout._validate = fig._validate
+    return fig
+
+
+# Template layout per (urutan track + axis, ratio_plots, grid); jumlahnya
+# terbatas pada kombinasi track yang dipakai builder
+_layout_templates = {}
+
+
+def layout_template(axes, ratio_plots, grid=False):
+    """
+    Properti layout (axis, garis pembatas, anotasi header) untuk satu susunan
+    track, dihitung dan divalidasi sekali lalu di-cache.
+
+    Returns:
+        dict: {'props': dict layout, 'annotations': list anotasi header}.
+        Jangan dimutasi.
+    """
+    cache_key = (tuple((key, tuple(axess)) for key, axess in axes.items()),
+                 tuple(float(r) for r in ratio_plots), bool(grid))
+    template = _layout_templates.get(cache_key)
+    if template is None:
+        axis_props = _range_axis_props(axes)
+        if grid:
+            _add_axis_props(axis_props, 'yaxis', dict(showgrid=False))
+        axis_props, annotations = _header_layout(axes, ratio_plots, axis_props)
+        props = dict(axis_props, shapes=_border_shapes(ratio_plots))
+        # Validasi sekali di sini (error sama seperti update_layout); hasil JSON
+        # yang sudah dinormalisasi Plotly dipakai ulang untuk figure berikutnya
+        layout = go.Layout(props, annotations=annotations).to_plotly_json()
+        annotations = layout.pop('annotations', [])
+        template = {'props': layout, 'annotations': annotations}
+        _layout_templates[cache_key] = template
+    return template
+
+
+def apply_layout_template(fig, axes, ratio_plots, df_well=None, xgrid_intv=0):
+    """
+    Menerapkan seluruh layout track (range axis, garis pembatas, grid depth,
+    header) sekaligus dari template cache. Pengganti rangkaian
+    layout_range_all_axis + layout_draw_lines + layout_axis.
+    """
+    grid_shapes = _grid_shapes(df_well, xgrid_intv) if df_well is not None else []
+    template = layout_template(axes, ratio_plots, grid=bool(grid_shapes))
+    props = template['props']
+    if grid_shapes:
+        props = dict(props, shapes=props['shapes'] + grid_shapes)
+    return stamp_layout(fig, props, template['annotations'])
+
+
+def layout_range_all_axis(fig, axes, plot_sequence):
+    fig.update_layout(**_range_axis_props(axes))
+    return fig
+
+
+def layout_draw_lines(fig, ratio_plots, df_well, xgrid_intv):
+    # Menambahkan garis pembatas
+    shapes = _border_shapes(ratio_plots)
+
+    # plot grid
+    grid_shapes = _grid_shapes(df_well, xgrid_intv)
+    if grid_shapes:
+        fig.update_layout(shapes=shapes + grid_shapes, yaxis=dict(showgrid=False))
+    else:
+        fig.update_layout(shapes=shapes)
+
+    return fig
+
+# ---panggil layout axis
+
+
+def layout_axis(fig, axes, ratio_plots, plot_sequence):
+    axis_props, annotations = _header_layout(axes, ratio_plots)
+    fig.update_layout(**axis_props)
+    for annotation in annotations:
+        fig.add_annotation(annotation)
     return fig
 
 
@@ -2311,11 +2414,68 @@ def rgb_to_hex(rgb):
         int(rgb[2] * 255)
     )
 
+
+# Atribut per-titik yang ikut dipotong bersama x/y saat decimation
+_POINT_ATTRS = ('customdata', 'text', 'hovertext')
+
+
+def decimate_figure(fig, max_points=None, depth_range=None, method='minmax'):
+    """
+    Mengurangi jumlah titik setiap trace garis (scatter/scattergl, y = depth)
+    menjadi sekitar max_points dengan algoritma yang mempertahankan bentuk
+    kurva ('minmax' per bucket depth atau 'lttb').
+
+    Parameters:
+    -----------
+    fig : plotly Figure object
+        Figure hasil salah satu fungsi plot_*.
+    max_points : int, optional
+        Batas titik per trace; None = tanpa decimation.
+    depth_range : [top, bottom], optional
+        Hanya sampel di rentang depth ini yang dikirim (ditambah satu sampel
+        di luar setiap tepi).
+    method : str
+        'minmax' (default) atau 'lttb'.
+
+    Returns:
+    --------
+    fig : plotly Figure object
+        Figure yang sama dengan trace yang sudah di-decimate.
+    """
+    if not max_points and depth_range is None:
+        return fig
+
+    with fig.batch_update():
+        for trace in fig.data:
+            if trace.type not in ('scatter', 'scattergl') or trace.x is None or trace.y is None:
+                continue
+            y = np.asarray(trace.y)
+            if len(y) != len(trace.x) or y.dtype.kind not in 'fiu':
+                continue
+            x = np.asarray(trace.x)
+            keep = depth_window_indices(y, depth_range)
+            if trace.fill == 'toself':
+                # Poligon crossover sudah di-decimate di add_xover_fill; hanya
+                # dipotong ke rentang depth dengan pemisah NaN antar run tetap ada
+                keep = np.union1d(keep, np.flatnonzero(np.isnan(y)))
+            elif max_points and len(keep) > max_points and x.dtype.kind in 'fiu':
+                keep = keep[decimate_indices(y[keep], x[keep], max_points, method)]
+            if len(keep) == len(y):
+                continue
+
+            updates = {'x': x[keep], 'y': y[keep]}
+            for attr in _POINT_ATTRS:
+                values = trace[attr]
+                if values is not None and not isinstance(values, str) and len(values) == len(y):
+                    updates[attr] = np.asarray(values)[keep]
+            trace.update(updates)
+    return fig
+
 # ------------------------------- Main Plot --------------------------------
 
 
 def main_plot(df_well, title='Well Prediction', class_col=None, cutoff_dict=None, class_col_compare=None, exclude_marker=False,
-              exclude_xpt=False, exclude_perm=False, exclude_crossover=False, xgrid_intv=0, df_xpt=None, df_well_marker=None, df_marker=None):
+              exclude_xpt=False, exclude_perm=False, exclude_crossover=False, xgrid_intv=0, df_xpt=None, df_well_marker=None, df_marker=None, max_points=None):
     # convert ft to meter:
     # df_well = convert_depth_ft_to_m(df_well, column='DEPTH')
     sequence = ['MARKER', 'GR', 'RT_RHOB', 'NPHI_RHOB', "XPT", 'VCL', 'PHIE_PHIT', 'SW', 'PERM',
@@ -2375,7 +2535,8 @@ def main_plot(df_well, title='Well Prediction', class_col=None, cutoff_dict=None
             fig, axes = plot_line(df_well, fig, axes, key, n_seq)
         elif key == 'NPHI_RHOB':
             fig, axes, counter = plot_xover_log_normal(df_well, fig, axes, key, n_seq, counter, n_plots=subplot_col,
-                                                       y_color='rgba(0,0,0,0)', n_color='yellow', type=2, exclude_crossover=exclude_crossover)
+                                                       y_color='rgba(0,0,0,0)', n_color='yellow', type=2, exclude_crossover=exclude_crossover,
+                                                       max_points=max_points)
         elif key == 'SW':
             fig, axes = plot_line(df_well, fig, axes, key, n_seq)
         elif key == 'PHIE_PHIT':
@@ -2388,13 +2549,15 @@ def main_plot(df_well, title='Well Prediction', class_col=None, cutoff_dict=None
                 df_well, fig, axes, key, n_seq, index=0)
         elif key in ['RT_RO', 'RWAPP_RW', 'RT_F']:
             fig, axes, counter = plot_xover(
-                df_well, fig, axes, key, n_seq, counter, n_plots=subplot_col, y_color='limegreen', n_color='lightgray')
+                df_well, fig, axes, key, n_seq, counter, n_plots=subplot_col, y_color='limegreen', n_color='lightgray',
+                max_points=max_points)
         elif key in ['X_RT_RO', 'X_RWA_RW', 'X_RT_F', 'X_RT_RHOB']:
             fig, axes, counter = plot_xover_thres(
-                df_well, fig, axes, key, n_seq, counter=counter)
+                df_well, fig, axes, key, n_seq, counter=counter, max_points=max_points)
         elif key == 'RT_RHOB':
             fig, axes, counter = plot_xover_log_normal(df_well, fig, axes, key, n_seq, counter, n_plots=subplot_col,
-                                                       y_color='limegreen', n_color='lightgray', type=1, exclude_crossover=exclude_crossover)
+                                                       y_color='limegreen', n_color='lightgray', type=1, exclude_crossover=exclude_crossover,
+                                                       max_points=max_points)
         elif key == 'TEST':
             fig, axes = plot_flag(df_well, fig, axes, key, n_seq)
         elif key == 'CLASS':
@@ -2409,7 +2572,6 @@ def main_plot(df_well, title='Well Prediction', class_col=None, cutoff_dict=None
             fig, axes = plot_xpt(df_well, fig, axes, key, n_seq)
             fig, axes = plot_texts_xpt(df_xpt, fig, axes, key, n_seq)
 
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
 
     fig.update_layout(
         margin=dict(l=20, r=20, t=40, b=20), height=600,
@@ -2427,11 +2589,9 @@ def main_plot(df_well, title='Well Prediction', class_col=None, cutoff_dict=None
                      range=[df_well[depth].max(), df_well[depth].min()])
     fig.update_traces(yaxis='y')
 
-    fig = layout_draw_lines(fig, ratio_plots_seq, df_well, xgrid_intv=0)
-
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df_well, xgrid_intv=0)
 
-    return fig
+    return decimate_figure(fig, max_points)
 
 # @title
 
@@ -2490,8 +2650,8 @@ def extract_markers_customize(df, key):
 
 def normalize_xover(df_well, log_1, log_2):
 
-    # Salin DataFrame untuk menghindari modifikasi pada original
-    df = df_well.copy()
+    # Salinan dangkal: kolom baru tidak mengubah original, kolom lama tidak disalin
+    df = df_well.copy(deep=False)
     log_merge = log_1 + '_' + log_2
     log_1_norm = log_1 + '_NORM'
     log_2_norm = log_2 + '_NORM_' + log_1
@@ -2527,7 +2687,7 @@ def normalize_xover(df_well, log_1, log_2):
 # @title
 
 
-def plot_log_default(df, df_marker, df_well_marker):
+def plot_log_default(df, df_marker, df_well_marker, max_points=None):
     sequence = ['MARKER', 'GR', 'RT_RHOB', 'NPHI_RHOB']
     plot_sequence = {i+1: v for i, v in enumerate(sequence)}
     print(plot_sequence)
@@ -2559,19 +2719,20 @@ def plot_log_default(df, df_marker, df_well_marker):
                 df, fig, axes, base_key='RT', n_seq=n_seq, col=col, label=col)
         elif col == 'NPHI_RHOB':
             fig, axes, counter = plot_xover_log_normal(
-                df, fig, axes, col, n_seq, counter, n_plots=subplot_col, y_color='rgba(0,0,0,0)', n_color='yellow', type=2, exclude_crossover=False)
+                df, fig, axes, col, n_seq, counter, n_plots=subplot_col, y_color='rgba(0,0,0,0)', n_color='yellow', type=2, exclude_crossover=False,
+                max_points=max_points)
         elif col == 'RT_RHOB':
             fig, axes, counter = plot_xover_log_normal(
-                df, fig, axes, col, n_seq, counter, n_plots=subplot_col, y_color='limegreen', n_color='lightgray', type=1, exclude_crossover=False)
+                df, fig, axes, col, n_seq, counter, n_plots=subplot_col, y_color='limegreen', n_color='lightgray', type=1, exclude_crossover=False,
+                max_points=max_points)
         elif col in ['X_RT_RO', 'X_RWA_RW', 'X_RT_F', 'X_RT_RHOB']:
             fig, axes, counter = plot_xover_thres(
-                df, fig, axes, col, n_seq, counter=counter)
+                df, fig, axes, col, n_seq, counter=counter, max_points=max_points)
         elif col == 'MARKER':
             fig, axes = plot_flag(df_well_marker, fig, axes, col, n_seq)
             fig, axes = plot_texts_marker(
                 df_marker, df_well_marker['DEPTH'].max(), fig, axes, col, n_seq)
 
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
 
     fig.update_layout(
         margin=dict(l=20, r=20, t=40, b=20), height=1500,
@@ -2589,13 +2750,11 @@ def plot_log_default(df, df_marker, df_well_marker):
                      range=[df[depth].max(), df[depth].min()])
     fig.update_traces(yaxis='y')
 
-    fig = layout_draw_lines(fig, ratio_plots_seq, df, xgrid_intv=0)
-
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
-    return fig
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df, xgrid_intv=0)
+    return decimate_figure(fig, max_points)
 
 
-def plot_normalization(df):
+def plot_normalization(df, max_points=None):
     df_marker = extract_markers_with_mean_depth(df)
     df_well_marker = df.copy()
     sequence = ['MARKER', 'GR', 'GR_DUAL_2', 'GR_DUAL', 'GR_RAW_NORM']
@@ -2644,7 +2803,6 @@ def plot_normalization(df):
                 fig, axes = plot_line(
                     df, fig, axes, base_key=col, n_seq=n_seq, col=col, label=col)
 
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
 
     fig.update_layout(
         margin=dict(l=20, r=20, t=40, b=20), height=1300,
@@ -2662,16 +2820,14 @@ def plot_normalization(df):
                      range=[df[depth].max(), df[depth].min()])
     fig.update_traces(yaxis='y')
 
-    fig = layout_draw_lines(fig, ratio_plots_seq, df, xgrid_intv=0)
-
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df, xgrid_intv=0)
 
     print(axes)
 
-    return fig
+    return decimate_figure(fig, max_points)
 
 
-def plot_phie_den(df, df_marker, df_well_marker):
+def plot_phie_den(df, df_marker, df_well_marker, max_points=None):
     """
     Membuat plot multi-panel untuk visualisasi hasil kalkulasi Porositas.
     """
@@ -2715,10 +2871,7 @@ def plot_phie_den(df, df_marker, df_well_marker):
         #     fig, axes = plot_flag(df, fig, axes, key, n_seq)
 
     # Panggil fungsi-fungsi layout akhir
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
-    fig = layout_draw_lines(fig, ratio_plots_seq, df,
-                            xgrid_intv=50)  # Memberi grid interval 50
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df, xgrid_intv=50)  # Memberi grid interval 50
 
     # Atur layout global
     fig.update_layout(
@@ -2735,10 +2888,10 @@ def plot_phie_den(df, df_marker, df_well_marker):
                      df[depth].max(), df[depth].min()])
     fig.update_traces(yaxis='y')
 
-    return fig
+    return decimate_figure(fig, max_points)
 
 
-def plot_gsa_main(df_well):
+def plot_gsa_main(df_well, max_points=None):
     """
     Fungsi utama untuk membuat plot komprehensif Gas Show Anomaly.
     """
@@ -2789,17 +2942,15 @@ def plot_gsa_main(df_well):
             fig, axes = plot_line(df_well, fig, axes, key, n_seq)
         elif key in ['NPHI_RHOB', 'RT_RHOB']:
             fig, axes, counter = plot_xover_log_normal(
-                df_well, fig, axes, key, n_seq, counter, subplot_col)
+                df_well, fig, axes, key, n_seq, counter, subplot_col, max_points=max_points)
         elif key in ['RT_RGSA', 'NPHI_NGSA', 'RHOB_DGSA']:
             fig, axes, counter = plot_gsa_crossover(
-                df_well, fig, axes, key, n_seq, counter, subplot_col)
+                df_well, fig, axes, key, n_seq, counter, subplot_col, max_points=max_points)
         elif key == 'ZONA':
             fig, axes = plot_flag(df_well, fig, axes, key, n_seq)
 
     # Finalisasi Layout
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
-    fig = layout_draw_lines(fig, ratio_plots_seq, df_well, xgrid_intv=50)
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df_well, xgrid_intv=50)
 
     fig.update_layout(
         title_text="Gas Show Anomaly (GSA) Analysis",
@@ -2811,10 +2962,10 @@ def plot_gsa_main(df_well):
         height=1600,
     )
 
-    return fig
+    return decimate_figure(fig, max_points)
 
 
-def plot_vsh_linear(df, df_marker, df_well_marker):
+def plot_vsh_linear(df, df_marker, df_well_marker, max_points=None):
     """
     Membuat plot multi-panel untuk visualisasi hasil kalkulasi VSH.
     """
@@ -2849,15 +3000,13 @@ def plot_vsh_linear(df, df_marker, df_well_marker):
                 df, fig, axes, base_key='GR', n_seq=n_seq, col='GR', label='GR')
         elif key in ['NPHI_RHOB', 'RT_RHOB']:
             fig, axes, counter = plot_xover_log_normal(
-                df, fig, axes, key, n_seq, counter, subplot_col)
+                df, fig, axes, key, n_seq, counter, subplot_col, max_points=max_points)
         elif key == 'VSH_LINEAR':
             fig, axes = plot_line(df, fig, axes, base_key='VSH_LINEAR',
                                   n_seq=n_seq, col='VSH_LINEAR', label='VSH_LINEAR')
 
     # Panggil fungsi-fungsi layout akhir
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
-    fig = layout_draw_lines(fig, ratio_plots_seq, df, xgrid_intv=50)
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df, xgrid_intv=50)
 
     # Atur layout global
     fig.update_layout(
@@ -2874,10 +3023,10 @@ def plot_vsh_linear(df, df_marker, df_well_marker):
                      df[depth].max(), df[depth].min()])
     fig.update_traces(yaxis='y')
 
-    return fig
+    return decimate_figure(fig, max_points)
 
 
-def plot_sw_indo(df, df_marker, df_well_marker):
+def plot_sw_indo(df, df_marker, df_well_marker, max_points=None):
     """
     Membuat plot multi-panel untuk visualisasi hasil kalkulasi Saturasi Air (Indonesia).
     """
@@ -2913,7 +3062,7 @@ def plot_sw_indo(df, df_marker, df_well_marker):
                 df, fig, axes, base_key=key, n_seq=n_seq, col=key, label=key)
         elif key == 'RT_RHOB':
             fig, axes, counter = plot_xover_log_normal(
-                df, fig, axes, key, n_seq, counter, subplot_col)
+                df, fig, axes, key, n_seq, counter, subplot_col, max_points=max_points)
         elif key == 'PHIE_DEN':
             fig, axes, counter = plot_two_features_simple(
                 df, fig, axes, 'PHIE_DEN', n_seq, counter, n_plots=subplot_col)
@@ -2922,9 +3071,7 @@ def plot_sw_indo(df, df_marker, df_well_marker):
                 df, fig, axes, base_key=key, n_seq=n_seq, col=key, label=key)
 
     # Finalisasi Layout
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
-    fig = layout_draw_lines(fig, ratio_plots_seq, df, xgrid_intv=50)
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df, xgrid_intv=50)
 
     fig.update_layout(
         title_text="Water Saturation (Indonesia Method) Analysis",
@@ -2932,10 +3079,10 @@ def plot_sw_indo(df, df_marker, df_well_marker):
                    df[depth].max(), df[depth].min()]), showlegend=False,
         hovermode='y unified', template='plotly_white', height=1600,
     )
-    return fig
+    return decimate_figure(fig, max_points)
 
 
-def plot_rwa_indo(df, df_marker, df_well_marker):
+def plot_rwa_indo(df, df_marker, df_well_marker, max_points=None):
     """
     Membuat plot multi-panel untuk visualisasi hasil kalkulasi RWA.
     """
@@ -2968,15 +3115,13 @@ def plot_rwa_indo(df, df_marker, df_well_marker):
                 df, fig, axes, base_key=key, n_seq=n_seq, col=key, label=key)
         elif key == 'RT_RHOB':
             fig, axes, counter = plot_xover_log_normal(
-                df, fig, axes, key, n_seq, counter, subplot_col)
+                df, fig, axes, key, n_seq, counter, subplot_col, max_points=max_points)
         elif key == 'RWA':
             fig, axes, counter = plot_three_features_simple(
                 df, fig, axes, key, n_seq, counter, subplot_col, log_scale=True)
 
     # Finalisasi Layout
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
-    fig = layout_draw_lines(fig, ratio_plots_seq, df, xgrid_intv=50)
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df, xgrid_intv=50)
 
     fig.update_layout(
         title_text="Apparent Water Resistivity (RWA) Analysis",
@@ -2985,10 +3130,10 @@ def plot_rwa_indo(df, df_marker, df_well_marker):
         hovermode='y unified', template='plotly_white', height=1600,
         showlegend=False
     )
-    return fig
+    return decimate_figure(fig, max_points)
 
 
-def plot_smoothing(df, df_marker, df_well_marker):
+def plot_smoothing(df, df_marker, df_well_marker, max_points=None):
     sequence = ['MARKER', 'GR', 'GR_MovingAvg_5', 'GR_MovingAvg_10']
     plot_sequence = {i+1: v for i, v in enumerate(sequence)}
     print(plot_sequence)
@@ -3026,7 +3171,6 @@ def plot_smoothing(df, df_marker, df_well_marker):
             fig, axes = plot_texts_marker(
                 df_marker, df_well_marker['DEPTH'].max(), fig, axes, col, n_seq)
 
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
 
     fig.update_layout(
         margin=dict(l=20, r=20, t=40, b=20), height=1300,
@@ -3044,7 +3188,5 @@ def plot_smoothing(df, df_marker, df_well_marker):
                      range=[df[depth].max(), df[depth].min()])
     fig.update_traces(yaxis='y')
 
-    fig = layout_draw_lines(fig, ratio_plots_seq, df, xgrid_intv=0)
-
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
-    return fig
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df, xgrid_intv=0)
+    return decimate_figure(fig, max_points)
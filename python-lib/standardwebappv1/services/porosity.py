@@ -2,30 +2,38 @@
 import pandas as pd
 import numpy as np
 
+from . import kernels
+
 
 def dn_xplot(rho0, nphi0, rho_ma, rho_max, rho_fl):
-    """(Internal) Menghitung porositas dan densitas matriks dari crossplot D-N."""
-    try:
+    """
+    (Internal) Menghitung porositas dan densitas matriks dari crossplot D-N.
+    Menerima skalar maupun array; kedua cabang dievaluasi dengan np.where dan
+    penyebut yang degenerate (~0 atau NaN) menghasilkan NaN.
+    """
+    if kernels.numba_enabled():
+        return kernels.dn_xplot(rho0, nphi0, rho_ma, rho_max, rho_fl)
+
+    rho0 = np.asarray(rho0, dtype=float)
+    nphi0 = np.asarray(nphi0, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
         phid = (rho_ma - rho0 * 1000) / (rho_ma - rho_fl)
-        if nphi0 >= phid:
-            pda = (rho_ma - rho_max) / (rho_ma - rho_fl)
-            pna = 0.7 - 10 ** (-5 * nphi0 - 0.16)
-        else:
-            pda = 1.0
-            pna = -2.06 * nphi0 - 1.17 + 10 ** (-16 * nphi0 - 0.4)
+        cond = nphi0 >= phid
+        pda = np.where(cond, (rho_ma - rho_max) / (rho_ma - rho_fl), 1.0)
+        pna = np.where(cond,
+                       0.7 - 10 ** (-5 * nphi0 - 0.16),
+                       -2.06 * nphi0 - 1.17 + 10 ** (-16 * nphi0 - 0.4))
 
         denom = pda - pna
-        if np.isclose(denom, 0) or np.isnan(denom):
-            return np.nan, np.nan
+        bad = np.isclose(denom, 0) | np.isnan(denom)
+        phix = np.where(bad, np.nan, (pda * nphi0 - phid * pna) / denom)
 
-        phix = (pda * nphi0 - phid * pna) / denom
-        if np.isclose(1 - phix, 0) or np.isnan(phix):
-            return np.nan, np.nan
+        bad = np.isclose(1 - phix, 0) | np.isnan(phix)
+        phix = np.where(bad, np.nan, phix)
+        rma = np.where(bad, np.nan, (rho0 * 1000 - phix * rho_fl) / (1 - phix))
 
-        rma = (rho0 * 1000 - phix * rho_fl) / (1 - phix)
-        return phix, rma
-    except Exception:
-        return np.nan, np.nan
+    return phix, rma
 
 
 def _klasifikasi_reservoir_numeric(phie):
@@ -46,7 +54,7 @@ def calculate_porosity(df: pd.DataFrame, params: dict) -> pd.DataFrame:
     """
     Menghitung berbagai jenis porositas berdasarkan parameter yang diberikan.
     """
-    df_processed = df.copy()
+    df_processed = df.copy(deep=False)
 
     # Ekstrak parameter dengan nilai default
     RHO_FL = params.get('rho_fl', 1.00)
@@ -75,23 +83,17 @@ def calculate_porosity(df: pd.DataFrame, params: dict) -> pd.DataFrame:
     df_processed["NPHI_SR"] = df_processed["NPHI_SR"].clip(
         lower=-0.015, upper=1)
 
-    phix_vals, rma_vals = [], []
-    for i, row in df_processed.iterrows():
-        if pd.notna(row["RHOB_SR"]) and pd.notna(row["NPHI_SR"]):
-            phix, rma = dn_xplot(
-                row["RHOB_SR"], row["NPHI_SR"], RHO_MA_BASE, RHO_MAX, RHO_FL * 1000)
-        else:
-            phix, rma = np.nan, np.nan
-        phix_vals.append(phix)
-        rma_vals.append(rma)
+    phix_vals, rma_vals = dn_xplot(
+        df_processed["RHOB_SR"].values, df_processed["NPHI_SR"].values,
+        RHO_MA_BASE, RHO_MAX, RHO_FL * 1000)
 
-    df_processed["PHIE_DN"] = np.array(phix_vals) * (1 - df_processed["VSH"])
+    df_processed["PHIE_DN"] = phix_vals * (1 - df_processed["VSH"])
     df_processed["PHIT_DN"] = df_processed["PHIE_DN"] + \
         df_processed["VSH"] * PHIT_SH
     df_processed["PHIE"] = df_processed["PHIE_DN"].clip(
         lower=0, upper=PHIE_MAX * (1 - df_processed["VSH"]))
     df_processed["PHIT"] = df_processed["PHIE"] + df_processed["VSH"] * PHIT_SH
-    df_processed["RHO_MAT"] = np.array(rma_vals) / 1000
+    df_processed["RHO_MAT"] = rma_vals / 1000
 
     df_processed.rename(
         columns={"PHIE_DN": "PHIE_DEN", "PHIT_DN": "PHIT_DEN"}, inplace=True)
@@ -0,0 +1,177 @@
+# Nama file: progress.py
+# Deskripsi: Laporan progres pemrosesan multi-sumur. Service per sumur
+# menerima callback `progress(event)`; ProgressTracker mengisi event dengan
+# indeks sumur, waktu berjalan dan throughput (baris/detik). ProgressBroker
+# menyalurkan event ke stream Server-Sent Events per sesi di backend.
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterator, Optional
+
+# Callback progres: menerima satu event (dict yang bisa di-JSON-kan)
+ProgressCallback = Callable[[dict], None]
+
+# Event terakhir per channel yang diputar ulang untuk klien yang tersambung ulang
+DEFAULT_HISTORY = 200
+# Komentar keep-alive SSE agar proxy tidak menutup koneksi yang diam
+HEARTBEAT_SECONDS = 15.0
+
+
+class ProgressTracker:
+    """
+    Membentuk event progres untuk satu proses multi-sumur.
+
+    Event 'well_done' berisi: label, well, index (1-based, urutan selesai),
+    total, rows, well_elapsed, rows_per_s (sumur itu), elapsed dan
+    overall_rows_per_s (sejak start), status ('ok'/'failed') dan error.
+    Tanpa callback, semua method tidak melakukan apa-apa.
+    """
+
+    def __init__(self, callback: Optional[ProgressCallback], label: str = '',
+                 total: int = 0, **context):
+        self.callback = callback
+        self.label = label
+        self.total = total
+        self.context = context  # field tambahan di setiap event (mis. job_id)
+        self.done = 0
+        self.failed = 0
+        self.rows = 0
+        self.started = time.perf_counter()
+        self._well_started = {}
+        self._lock = threading.Lock()
+        self._emit('start')
+
+    def _emit(self, event: str, **fields) -> None:
+        if self.callback is None:
+            return
+        payload = {'event': event, 'label': self.label, 'total': self.total,
+                   'elapsed': round(time.perf_counter() - self.started, 4)}
+        payload.update(self.context)
+        payload.update(fields)
+        try:
+            self.callback(payload)
+        except Exception as e:
+            # Callback yang rusak tidak boleh menggagalkan kalkulasi
+            print(f"Peringatan: callback progres gagal: {e}")
+
+    def well_started(self, well_name, rows: Optional[int] = None) -> None:
+        with self._lock:
+            self._well_started[well_name] = time.perf_counter()
+            index = self.done + 1
+        self._emit('well_start', well=well_name, index=index, rows=rows)
+
+    def well_finished(self, well_name, rows: int = 0, error: Optional[str] = None,
+                      seconds: Optional[float] = None) -> None:
+        """
+        Mencatat satu sumur selesai. `seconds` (durasi terukur di worker)
+        dipakai jika sumur diproses di proses lain; jika tidak, durasi
+        dihitung sejak well_started.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            started = self._well_started.pop(well_name, None)
+            if seconds is None:
+                seconds = now - started if started is not None else 0.0
+            self.done += 1
+            self.failed += 1 if error else 0
+            self.rows += rows
+            index = self.done
+            elapsed = now - self.started
+            total_rows = self.rows
+        self._emit('well_done', well=well_name, index=index, rows=int(rows),
+                   well_elapsed=round(seconds, 4),
+                   rows_per_s=round(rows / seconds, 1) if seconds > 0 else None,
+                   overall_rows_per_s=round(total_rows / elapsed, 1) if elapsed > 0 else None,
+                   status='failed' if error else 'ok', error=error)
+
+    def finished(self, error: Optional[str] = None) -> None:
+        elapsed = time.perf_counter() - self.started
+        self._emit('done', done=self.done, failed=self.failed, rows=self.rows,
+                   overall_rows_per_s=round(self.rows / elapsed, 1) if elapsed > 0 else None,
+                   status='failed' if error else 'ok', error=error)
+
+
+class _Channel:
+    __slots__ = ('history', 'subscribers', 'next_id')
+
+    def __init__(self, history: int):
+        self.history = deque(maxlen=history)
+        self.subscribers = []
+        self.next_id = 1
+
+
+class ProgressBroker:
+    """
+    Distribusi event progres per channel (mis. session id) ke subscriber SSE.
+    Setiap event diberi id berurutan; subscriber baru bisa meminta event
+    setelah `last_event_id` (header Last-Event-ID saat EventSource tersambung
+    ulang) dari riwayat terbatas.
+    """
+
+    def __init__(self, history: int = DEFAULT_HISTORY):
+        self._history = history
+        self._channels: Dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, event: dict) -> None:
+        with self._lock:
+            ch = self._channels.get(channel)
+            if ch is None:
+                ch = self._channels[channel] = _Channel(self._history)
+            entry = (ch.next_id, event)
+            ch.next_id += 1
+            ch.history.append(entry)
+            subscribers = list(ch.subscribers)
+        for subscriber in subscribers:
+            subscriber.put(entry)
+
+    def callback(self, channel: str) -> ProgressCallback:
+        """Callback progres yang mem-publish ke `channel`."""
+        return lambda event: self.publish(channel, event)
+
+    def subscribe(self, channel: str, last_event_id: Optional[int] = None,
+                  heartbeat: float = HEARTBEAT_SECONDS,
+                  max_seconds: Optional[float] = None) -> Iterator[Optional[tuple]]:
+        """
+        Generator (id, event) untuk channel; None setiap `heartbeat` detik
+        tanpa event. Berhenti setelah `max_seconds` (klien menyambung ulang).
+        """
+        subscriber = queue.Queue()
+        with self._lock:
+            ch = self._channels.get(channel)
+            if ch is None:
+                ch = self._channels[channel] = _Channel(self._history)
+            backlog = [entry for entry in ch.history
+                       if last_event_id is not None and entry[0] > last_event_id]
+            ch.subscribers.append(subscriber)
+        deadline = time.monotonic() + max_seconds if max_seconds else None
+        try:
+            for entry in backlog:
+                yield entry
+            while deadline is None or time.monotonic() < deadline:
+                try:
+                    yield subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield None
+        finally:
+            with self._lock:
+                if subscriber in ch.subscribers:
+                    ch.subscribers.remove(subscriber)
+
+    def drop(self, channel: str) -> None:
+        """Menghapus riwayat channel (mis. saat sesi dibuang)."""
+        with self._lock:
+            ch = self._channels.get(channel)
+            if ch is not None and not ch.subscribers:
+                del self._channels[channel]
+
+
+def sse_message(entry: Optional[tuple], event_name: str = 'progress') -> str:
+    """Satu pesan SSE untuk (id, event); None menjadi komentar keep-alive."""
+    if entry is None:
+        return ': keep-alive\n\n'
+    event_id, event = entry
+    return f"id: {event_id}\nevent: {event_name}\ndata: {json.dumps(event, default=str)}\n\n"
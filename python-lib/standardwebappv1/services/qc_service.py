@@ -7,6 +7,8 @@ import numpy as np
 import io
 import logging
 
+from .progress import ProgressTracker
+
 def add_markers_to_df(df, well_name, all_markers_df, logger):
     """Menambahkan marker ke DataFrame, dengan logging."""
     df['Marker'] = None
@@ -52,8 +54,12 @@ def check_extreme_values(df, column):
         return mask.any()
     return False
 
-def run_full_qc_pipeline(files_data: list, logger):
-    """Fungsi utama dari qc_logic.py Anda, sekarang di dalam service."""
+def run_full_qc_pipeline(files_data: list, logger, progress=None):
+    """
+    Fungsi utama dari qc_logic.py Anda, sekarang di dalam service.
+    `progress` (opsional) menerima event per file LAS: indeks sumur, waktu
+    berjalan dan baris/detik.
+    """
     qc_results = []
     output_files = {}
     required_logs = ['GR', 'NPHI', 'RT', 'RHOB']
@@ -80,6 +86,8 @@ def run_full_qc_pipeline(files_data: list, logger):
         logger.info(f"[Markers] Data marker bersih. {len(all_markers_df)} baris valid dimuat.")
 
     las_files = [f for f in files_data if f['name'].lower().endswith('.las')]
+    qc_files = [f for f in las_files if f['name'].lower() not in skip_files_lower]
+    tracker = ProgressTracker(progress, 'QC', len(qc_files))
     for file_info in las_files:
         filename = file_info['name']
         if filename.lower() in skip_files_lower:
@@ -89,11 +97,14 @@ def run_full_qc_pipeline(files_data: list, logger):
         well_name = os.path.splitext(filename)[0]
         status = "PASS"
         details = {}
+        rows, error = 0, None
+        tracker.well_started(well_name)
         try:
             logger.info(f"--- [Memproses] MULAI: {filename} ---")
             las_content = io.StringIO(file_info['content'])
             las = lasio.read(las_content)
             df = las.df().reset_index()
+            rows = len(df)
             df.rename(columns=lambda c: c.upper(), inplace=True)
             column_mapping = { 'DEPT': 'DEPTH', 'ILD': 'RT', 'LLD': 'RT', 'RESD': 'RT', 'RHOZ': 'RHOB', 'DENS': 'RHOB', 'TNPH': 'NPHI', 'GR_CAL': 'GR' }
             df.rename(columns=column_mapping, inplace=True)
@@ -136,7 +147,12 @@ def run_full_qc_pipeline(files_data: list, logger):
         except Exception as e:
             logger.error(f"Error memproses {filename}: {e}", exc_info=True)
             qc_results.append({'well_name': well_name, 'status': 'ERROR', 'details': str(e)})
+            error = str(e)
+        finally:
+            # Juga dijalankan oleh `continue` pada cabang status di atas
+            tracker.well_finished(well_name, rows, error)
 
+    tracker.finished()
     return {'qc_summary': qc_results, 'output_files': output_files}
 
 
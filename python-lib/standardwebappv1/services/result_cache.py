@@ -0,0 +1,109 @@
+# Nama file: result_cache.py
+# Deskripsi: Cache LRU content-addressed dengan anggaran memori (byte) dan
+# statistik hit/miss. Dipakai backend untuk menyimpan kolom turunan hasil
+# kalkulasi agar kombinasi parameter yang sama tidak dihitung ulang.
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import pandas as pd
+
+
+def params_hash(params: Optional[dict]) -> str:
+    """Hash kanonik parameter (urutan key tidak berpengaruh)."""
+    canonical = json.dumps(params or {}, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def sizeof_value(value: Any) -> int:
+    """Perkiraan ukuran memori (byte) untuk DataFrame, string/bytes, atau tuple keduanya."""
+    if value is None:
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(sizeof_value(v) for v in value)
+    if isinstance(value, dict):
+        return sum(sizeof_value(v) for v in value.values())
+    return 64
+
+
+class LRUCache:
+    """
+    Cache LRU thread-safe yang dibatasi total ukuran (byte), bukan jumlah entri.
+    Entri yang lebih besar dari anggaran tidak disimpan.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024,
+                 sizeof: Callable[[Any], int] = sizeof_value):
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries = OrderedDict()  # {key: (value, ukuran)}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> bool:
+        """Menyimpan value; False jika value melebihi anggaran memori."""
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return False
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+            return True
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Menghapus semua entri yang key-nya memenuhi predicate."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._bytes -= self._entries.pop(key)[1]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import linregress
 from .plotting_service import (
     extract_markers_with_mean_depth,
     extract_markers_customize,
@@ -11,11 +10,15 @@ from .plotting_service import (
     plot_flag,
     plot_text_values,
     plot_texts_marker,
-    layout_range_all_axis,
-    layout_draw_lines,
-    layout_axis
+    apply_layout_template
+)
+from .figure_builder import make_subplots
+from .grouped_regression import (
+    segment_starts,
+    segment_counts,
+    segment_is_constant,
+    segment_linregress
 )
-from plotly.subplots import make_subplots
 
 # Configuration for plot ratios (this should match your existing ratio_plots dictionary)
 ratio_plots = {
@@ -68,32 +71,32 @@ def process_single_well(well_df):
 
     df_grouped = group_by_seq(df_clean, 'IQUAL')
 
-    # Calculate slope & r-squared
-    results_fluid = []
-    for group_id, group in df_grouped.groupby('GROUP_ID'):
-        n = len(group)
-
-        # Skip invalid groups
-        if (group['GR'].nunique() == 1) | (group['PHIE'].nunique() == 1) | (n <= 1):
-            continue
-
-        # Linear regression for slope and r-squared
-        slope_rgbe, _, r_rgbe, _, _ = linregress(group['GR'], group['RT'])
-        slope_rpbe, _, r_rpbe, _, _ = linregress(group['PHIE'], group['RT'])
-
-        # Store results with 1 decimal rounding
-        results_fluid.append({
-            'GROUP_ID': group_id,
-            'RGBE': round(100 * slope_rgbe, 1),
-            'R_RGBE': round(r_rgbe, 1),
-            'RPBE': round(slope_rpbe, 1),
-            'R_RPBE': round(r_rpbe, 1),
-        })
-
-    if not results_fluid:
+    # Calculate slope & r-squared for every IQUAL run at once
+    group_ids = df_grouped['GROUP_ID'].values
+    starts = segment_starts(group_ids)
+    gr = df_grouped['GR'].values
+    rt = df_grouped['RT'].values
+    phie = df_grouped['PHIE'].values
+
+    # Skip invalid groups
+    valid = ~(segment_is_constant(gr, starts) | segment_is_constant(phie, starts) |
+              (segment_counts(starts, len(group_ids)) <= 1))
+
+    if not valid.any():
         return pd.DataFrame()
 
-    df_results_fluid = pd.DataFrame(results_fluid)
+    # Linear regression for slope and r-squared
+    slope_rgbe, _, r_rgbe = segment_linregress(gr, rt, starts)
+    slope_rpbe, _, r_rpbe = segment_linregress(phie, rt, starts)
+
+    # Store results with 1 decimal rounding
+    df_results_fluid = pd.DataFrame({
+        'GROUP_ID': group_ids[starts][valid],
+        'RGBE': np.round(100 * slope_rgbe[valid], 1),
+        'R_RGBE': np.round(r_rgbe[valid], 1),
+        'RPBE': np.round(slope_rpbe[valid], 1),
+        'R_RPBE': np.round(r_rpbe[valid], 1),
+    })
 
     # Merge results with grouped data
     df_results = df_grouped.merge(df_results_fluid, on='GROUP_ID', how='left')
@@ -224,7 +227,6 @@ def plot_rgbe_rpbe(df):
             fig, axes = plot_texts_marker(df_marker, df_well_marker['DEPTH'].max(), fig, axes, col, n_seq)
 
     # Apply layouts
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
 
     # Update figure layout
     fig.update_layout(
@@ -248,7 +250,6 @@ def plot_rgbe_rpbe(df):
     fig.update_traces(yaxis='y')
 
     # Apply final layouts
-    fig = layout_draw_lines(fig, ratio_plots_seq, df, xgrid_intv=0)
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df, xgrid_intv=0)
 
     return fig
@@ -5,9 +5,12 @@
 from typing import Optional
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
 import os
 
+from .gsa_regression import fit_window_coeffs, evaluate_baseline
+from .progress import ProgressCallback
+from .well_executor import process_wells
+
 # FIX: Fungsi inti sekarang menerima dictionary 'params' untuk kustomisasi
 
 
@@ -55,75 +58,23 @@ def process_rgsa_for_well(df_well: pd.DataFrame, params: dict,
     gr_filter = filters.get('GR', (5, 180))
     rt_filter = filters.get('RT', (0.1, 1000))
 
-    coeffs = []
-
-    for start in range(0, len(df_rgsa) - window_size, step):
-        window = df_rgsa.iloc[start:start+window_size]
-        gr = window['GR'].values
-        rt = window['RT'].values
-
-        mask = (gr > gr_filter[0]) & (gr < gr_filter[1]) & (
-            rt > rt_filter[0]) & (rt < rt_filter[1])
-        gr_filtered = gr[mask]
-        rt_filtered = rt[mask]
-
-        if len(gr_filtered) < min_points_in_window:
-            continue
-
-        gr_scaled = 0.01 * gr_filtered
-        log_rt = np.log10(rt_filtered)
-
-        X = np.vstack([gr_scaled, gr_scaled**2, gr_scaled**3]).T
-        y = log_rt
-
-        try:
-            model = LinearRegression().fit(X, y)
-            if hasattr(model, 'coef_') and len(model.coef_) == 3:
-                coeffs.append({
-                    'DEPTH': window['DEPTH'].mean(),
-                    'b0': model.intercept_, 'b1': model.coef_[0],
-                    'b2': model.coef_[1], 'b3': model.coef_[2]
-                })
-        except Exception as e:
-            print(
-                f"Peringatan: Gagal melakukan regresi pada kedalaman sekitar {window['DEPTH'].mean()}: {e}")
-            continue
-
-    if not coeffs:
+    coeff_df = fit_window_coeffs(
+        df_rgsa['DEPTH'].values, df_rgsa['GR'].values, df_rgsa['RT'].values,
+        window_size=window_size, step=step,
+        min_points=min_points_in_window,
+        ref_filter=gr_filter, target_filter=rt_filter,
+        log_target=True)
+
+    if coeff_df.empty:
         print("Peringatan: Tidak ada koefisien regresi yang berhasil dihitung.")
         return None
 
-    coeff_df = pd.DataFrame(coeffs)
-
     # --- STEP 3: INTERPOLASI & HITUNG RGSA ---
-    def interpolate_coeffs(depth):
-        if depth <= coeff_df['DEPTH'].min():
-            return coeff_df.iloc[0]
-        if depth >= coeff_df['DEPTH'].max():
-            return coeff_df.iloc[-1]
-        lower = coeff_df[coeff_df['DEPTH'] <= depth].iloc[-1]
-        upper = coeff_df[coeff_df['DEPTH'] > depth].iloc[0]
-        if upper['DEPTH'] == lower['DEPTH']:
-            return lower
-        weight = (depth - lower['DEPTH']) / (upper['DEPTH'] - lower['DEPTH'])
-        return lower + weight * (upper - lower)
-
-    rgsa_list = []
-    for _, row in df_rgsa.iterrows():
-        depth, gr = row['DEPTH'], row['GR']
-
-        if not (gr_filter[0] < gr < gr_filter[1]):
-            rgsa_list.append(np.nan)
-            continue
-
-        b0, b1, b2, b3 = interpolate_coeffs(
-            depth)[['b0', 'b1', 'b2', 'b3']].values
-        grfix = 0.01 * gr
-        log_rgsa = b0 + b1*grfix + b2*grfix**2 + b3*grfix**3
-        rgsa = 10**log_rgsa
-        rgsa_list.append(rgsa)
-
-    df_rgsa['RGSA'] = rgsa_list
+    gr = df_rgsa['GR'].values
+    rgsa_values = evaluate_baseline(
+        df_rgsa['DEPTH'].values, gr, coeff_df, log_output=True)
+    gr_in_range = (gr > gr_filter[0]) & (gr < gr_filter[1])
+    df_rgsa['RGSA'] = np.where(gr_in_range, rgsa_values, np.nan)
 
     # --- STEP 4: GABUNGKAN HASIL DAN ANALISIS ---
     # Merge hasil RGSA baru ke df_well
@@ -157,42 +108,23 @@ def process_rgsa_for_well(df_well: pd.DataFrame, params: dict,
     return df_merged
 
 
-def process_all_wells_rgsa(df_well: pd.DataFrame, params: dict, selected_intervals: list):
+def process_all_wells_rgsa(df_well: pd.DataFrame, params: dict, selected_intervals: list,
+                           n_jobs: Optional[int] = None, backend: str = 'process',
+                           progress: Optional[ProgressCallback] = None):
     """
     Fungsi orkestrator utama: memproses RGSA untuk semua sumur dengan parameter kustom.
+    Dataset dipecah sekali per WELL_NAME dan sumur diproses paralel oleh
+    `n_jobs` worker (None = semua core, 1 = sekuensial). `progress`
+    menerima event per sumur (indeks, waktu berjalan, baris/detik).
     """
-
-    unique_wells = df_well['WELL_NAME'].unique()
-    print(f"📊 Memproses RGSA untuk {len(unique_wells)} sumur...")
-
-    processed_wells = []
-    failed_wells = []
-
-    for i, well_name in enumerate(unique_wells, 1):
-        print(f"\n🔍 Memproses sumur {i}/{len(unique_wells)}: {well_name}")
-        df_well = df_well[df_well['WELL_NAME'] ==
-                          well_name].copy().reset_index(drop=True)
-
-        # Teruskan dictionary `params` ke fungsi pemrosesan
-        result_df = process_rgsa_for_well(df_well, params,
-                                          marker_column='MARKER',
-                                          selected_intervals=selected_intervals)
-
-        if result_df is not None:
-            processed_wells.append(result_df)
-            print(f"✅ {well_name} - RGSA berhasil dihitung.")
-        else:
-            failed_wells.append(well_name)
-            print(f"❌ {well_name} - RGSA gagal dihitung.")
-
-    if processed_wells:
-        df_final = pd.concat(processed_wells, ignore_index=True)
-        print(
-            f"\n✅ Proses selesai. Hasil gabungan pada file asli.")
-
-        # print_summary_statistics(df_final, len(processed_wells), failed_wells)
-    else:
-        print("\n❌ Tidak ada sumur yang berhasil diproses!")
+    df_final, report = process_wells(
+        df_well, process_rgsa_for_well, params,
+        n_jobs=n_jobs, backend=backend, label='RGSA', progress=progress,
+        marker_column='MARKER', selected_intervals=selected_intervals)
+
+    # Menampilkan ringkasan statistik (opsional)
+    # if df_final is not None:
+    #     print_summary_statistics(df_final, len(report['processed']), report['failed'])
 
     return df_final
 
@@ -2,7 +2,14 @@
 
 import numpy as np
 import pandas as pd
-from scipy.stats import linregress
+
+from . import kernels
+from .grouped_regression import (
+    segment_starts,
+    segment_counts,
+    segment_is_constant,
+    segment_linregress
+)
 
 def calculate_iqual(df):
     """
@@ -19,11 +26,14 @@ def calculate_R0(df):
     Menghitung R0 dan parameter terkait
     """
     rwa = df['RT'] * df['PHIE']**df['M']
-    aa = df['PHIE']**df['M'] / (df['A']*df['RW'])
-    cc = 2 - df['VSH']
-    bb = df['VSH']**cc / df['RTSH']
-
-    R0 = 1 / (aa + 2 * (aa * bb)**0.5 + bb)
+    if kernels.numba_enabled():
+        R0 = kernels.r0(df['PHIE'], df['M'], df['A'], df['RW'], df['VSH'], df['RTSH'])
+    else:
+        aa = df['PHIE']**df['M'] / (df['A']*df['RW'])
+        cc = 2 - df['VSH']
+        bb = df['VSH']**cc / df['RTSH']
+
+        R0 = 1 / (aa + 2 * (aa * bb)**0.5 + bb)
     df['RWA'] = rwa
     df['R0'] = R0
     df['RTR0'] = df['RT'] - df['R0']
@@ -32,46 +42,33 @@ def calculate_R0(df):
 def analyze_rtr0_groups(df):
     """
     Analisis RTR0 untuk setiap group dalam satu well
+    (semua group diregresikan sekaligus per segmen GROUP_ID)
     """
-    results_rtr0 = []
-
-    for group_id, group in df.groupby('GROUP_ID'):
-        n = len(group)
-
-        # Hanya memproses group dengan n > 1
-        if ((group['PHIE'].nunique() == 1) | (group['RT'].nunique() == 1) | (n <= 1)):
-            continue
-
-        try:
-            # Regresi linear untuk slope dan r-squared
-            slope_rt2r0, _, _, _, _ = linregress(group['RT'], group['R0'])
-            slope_phie2rtr0, _, _, _, _ = linregress(group['PHIE'], group['RTR0'])
-
-            # Validasi hasil regresi
-            if np.isnan(slope_phie2rtr0) or np.isinf(slope_phie2rtr0):
-                continue
-
-            # Mengikuti kode acuan persis
-            condition = slope_phie2rtr0 > 0
-            FLUID_RTROPHIE = np.where(condition, 'G', 'W')
-
-            # Pastikan FLUID_RTROPHIE adalah scalar string
-            if isinstance(FLUID_RTROPHIE, np.ndarray):
-                FLUID_RTROPHIE = FLUID_RTROPHIE.item()  # Konversi array ke scalar
-
-            # List hasil
-            results_rtr0.append({
-                'GROUP_ID': group_id,
-                'RT_R0_GRAD': slope_rt2r0,
-                'PHIE_RTR0_GRAD': slope_phie2rtr0,
-                'FLUID_RTROPHIE': FLUID_RTROPHIE
-            })
-
-        except Exception as e:
-            print(f"Warning: Error processing group {group_id}: {str(e)}")
-            continue
-
-    return pd.DataFrame(results_rtr0)
+    group_ids = df['GROUP_ID'].values
+    starts = segment_starts(group_ids)
+    rt = df['RT'].values
+    phie = df['PHIE'].values
+
+    # Hanya memproses group dengan n > 1
+    valid = ~(segment_is_constant(phie, starts) | segment_is_constant(rt, starts) |
+              (segment_counts(starts, len(group_ids)) <= 1))
+
+    # Regresi linear untuk slope
+    slope_rt2r0, _, _ = segment_linregress(rt, df['R0'].values, starts)
+    slope_phie2rtr0, _, _ = segment_linregress(phie, df['RTR0'].values, starts)
+
+    # Validasi hasil regresi
+    valid &= np.isfinite(slope_phie2rtr0)
+    if not valid.any():
+        return pd.DataFrame()
+
+    slope_phie2rtr0 = slope_phie2rtr0[valid]
+    return pd.DataFrame({
+        'GROUP_ID': group_ids[starts][valid],
+        'RT_R0_GRAD': slope_rt2r0[valid],
+        'PHIE_RTR0_GRAD': slope_phie2rtr0,
+        'FLUID_RTROPHIE': np.where(slope_phie2rtr0 > 0, 'G', 'W')
+    })
 
 def process_rt_r0(df, params=None):
     """
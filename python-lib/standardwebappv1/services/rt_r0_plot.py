@@ -1,4 +1,4 @@
-from plotly.subplots import make_subplots
+from .figure_builder import make_subplots
 from .plotting_service import (
     extract_markers_with_mean_depth,
     normalize_xover,
@@ -9,9 +9,7 @@ from .plotting_service import (
     plot_flag,
     plot_text_values,
     plot_texts_marker,
-    layout_range_all_axis,
-    layout_draw_lines,
-    layout_axis
+    apply_layout_template
 )
 
 
@@ -113,7 +111,6 @@ def plot_rt_r0(df, title="RT-R0 Analysis"):
                     df_marker, df_well_marker['DEPTH'].max(), fig, axes, col, n_seq)
 
     # 7. Finalize layout
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
     fig.update_layout(
         margin=dict(l=20, r=20, t=40, b=20),
         height=1800,
@@ -130,7 +127,6 @@ def plot_rt_r0(df, title="RT-R0 Analysis"):
         fig.update_yaxes(showspikes=True,
                          range=[df['DEPTH'].max(), df['DEPTH'].min()])
     fig.update_traces(yaxis='y')
-    fig = layout_draw_lines(fig, ratio_plots_seq, df, xgrid_intv=0)
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df, xgrid_intv=0)
 
     return fig
@@ -0,0 +1,293 @@
+# Nama file: session_workspace.py
+# Deskripsi: State backend multi-sesi. Dataset dasar dimuat sekali dan dibagi
+# read-only oleh semua sesi; setiap sesi browser bekerja di workspace sendiri
+# (fork store dengan kolom turunannya sendiri). Akses workspace diatur dengan
+# read-write lock dan workspace yang lama tidak dipakai dibuang.
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+from .depth_pyramid import WellPyramids
+from .well_store import WellDataStore
+
+# Sesi yang tidak dipakai selama ini (detik) dibuang
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+# Batas jumlah workspace; yang paling lama tidak dipakai dibuang lebih dulu
+DEFAULT_MAX_SESSIONS = 32
+
+
+class ReadWriteLock:
+    """
+    Banyak pembaca atau satu penulis. Penulis yang menunggu didahulukan agar
+    kalkulasi tidak tertahan oleh aliran request plot. Thread pemegang lock
+    tulis boleh mengambil lock baca/tulis lagi (re-entrant).
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                owned = True
+            else:
+                owned = False
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+                self._readers += 1
+        try:
+            yield
+        finally:
+            if not owned:
+                with self._cond:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer != me:
+                self._writers_waiting += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._cond.wait()
+                finally:
+                    self._writers_waiting -= 1
+                self._writer = me
+            self._write_depth += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._writer = None
+                    self._cond.notify_all()
+
+
+class SharedDataset:
+    """
+    Dataset dasar yang dibagi antar sesi. Store dan piramidanya tidak pernah
+    ditulis; sesi memakai workspace() yang berbagi partisi Arrow dengannya.
+
+    Attributes:
+        name (str): Nama dataset sumber.
+        generation (int): Nomor muat; berbeda setiap kali dataset dimuat ulang.
+        store (WellDataStore): Store dasar (read-only).
+        pyramids (WellPyramids): Piramida store dasar yang sudah dibangun.
+    """
+
+    def __init__(self, name: str, generation: int, store: WellDataStore,
+                 cleanup: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.generation = generation
+        self.store = store
+        self.pyramids = WellPyramids(store)
+        if store.is_fully_loaded:
+            self.pyramids.build()
+        self._cleanup = cleanup
+
+    def workspace(self):
+        """(store, pyramids) milik satu sesi; belum ada data yang disalin."""
+        store = self.store.fork()
+        return store, self.pyramids.fork(store)
+
+    def release(self) -> None:
+        if self._cleanup is not None:
+            self._cleanup()
+            self._cleanup = None
+
+
+class SharedDatasets:
+    """Registry dataset dasar per kunci (mis. (nama, lazy)); setiap kunci dimuat sekali."""
+
+    def __init__(self):
+        self._datasets: Dict[Hashable, SharedDataset] = {}
+        self._loading: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._generations = itertools.count(1)
+
+    def get(self, key: Hashable, name: str, load: Callable[[], tuple]) -> SharedDataset:
+        """
+        Dataset dasar untuk `key`; dimuat lewat load() -> (store, cleanup)
+        jika belum ada. Sesi lain yang meminta kunci yang sama menunggu
+        pemuatan yang sedang berjalan, bukan memuat ulang.
+        """
+        with self._lock:
+            dataset = self._datasets.get(key)
+            if dataset is not None:
+                return dataset
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                dataset = self._datasets.get(key)
+            if dataset is None:
+                store, cleanup = load()
+                dataset = SharedDataset(name, next(self._generations), store, cleanup)
+                with self._lock:
+                    self._datasets[key] = dataset
+                    self._loading.pop(key, None)
+        return dataset
+
+    def retain(self, in_use: Iterable[SharedDataset]) -> None:
+        """Melepas dataset yang tidak lagi menjadi dasar workspace mana pun."""
+        in_use = {id(dataset) for dataset in in_use if dataset is not None}
+        with self._lock:
+            dropped = [self._datasets.pop(key) for key, dataset in list(self._datasets.items())
+                       if id(dataset) not in in_use]
+        for dataset in dropped:
+            dataset.release()
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "datasets": [{"name": d.name, "generation": d.generation,
+                              "rows": d.store.num_rows, "pyramid_bytes": d.pyramids.nbytes}
+                             for d in self._datasets.values()],
+            }
+
+
+class _Session:
+    __slots__ = ('workspace', 'lock', 'init_lock', 'active', 'pins', 'last_used')
+
+    def __init__(self):
+        self.workspace = None
+        self.lock = ReadWriteLock()
+        self.init_lock = threading.Lock()
+        self.active = 0
+        self.pins = 0  # job antre/berjalan yang masih membutuhkan workspace ini
+        self.last_used = time.monotonic()
+
+    @property
+    def in_use(self) -> bool:
+        return bool(self.active or self.pins)
+
+
+class SessionWorkspaces:
+    """
+    Workspace per sesi browser, dibuat oleh `factory()` saat pertama dipakai.
+
+    use(session_id) memegang lock baca workspace (plot, daftar sumur, ...);
+    use(session_id, write=True) memegang lock tulis (kalkulasi, ganti
+    dataset). Sesi yang sedang dipakai atau di-pin (mis. selama job-nya
+    antre/berjalan, di antara langkah yang memegang lock) tidak pernah
+    dibuang; sesi yang dibuang diteruskan ke on_evict({session_id: workspace}).
+    """
+
+    def __init__(self, factory: Callable[[], object],
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 on_evict: Optional[Callable[[dict], None]] = None):
+        self._factory = factory
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._on_evict = on_evict
+        self._sessions: Dict[str, _Session] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _evict_locked(self, now: float) -> dict:
+        """(Internal) Membuang sesi idle/berlebih; dipanggil dengan self._lock dipegang."""
+        idle = [sid for sid, s in self._sessions.items()
+                if not s.in_use and now - s.last_used > self.idle_timeout]
+        overflow = len(self._sessions) - len(idle) - self.max_sessions
+        if overflow > 0:
+            candidates = sorted((s.last_used, sid) for sid, s in self._sessions.items()
+                                if not s.in_use and sid not in idle)
+            idle.extend(sid for _, sid in candidates[:overflow])
+        evicted = {sid: self._sessions.pop(sid).workspace for sid in idle}
+        self.evictions += len(evicted)
+        return evicted
+
+    def _acquire(self, session_id: str) -> _Session:
+        now = time.monotonic()
+        with self._lock:
+            evicted = self._evict_locked(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = _Session()
+            session.active += 1
+            session.last_used = now
+        if evicted and self._on_evict is not None:
+            self._on_evict(evicted)
+        if session.workspace is None:
+            with session.init_lock:
+                if session.workspace is None:
+                    try:
+                        session.workspace = self._factory()
+                    except Exception:
+                        self._release(session)
+                        raise
+        return session
+
+    def _release(self, session: _Session) -> None:
+        with self._lock:
+            session.active -= 1
+            session.last_used = time.monotonic()
+
+    @contextmanager
+    def use(self, session_id: str, write: bool = False):
+        """Workspace sesi dengan lock baca (default) atau tulis dipegang."""
+        session = self._acquire(session_id)
+        try:
+            with (session.lock.write() if write else session.lock.read()):
+                yield session.workspace
+        finally:
+            self._release(session)
+
+    def pin(self, session_id: str) -> None:
+        """Menahan sesi dari eviction sampai unpin() (dipanggil sekali per pin)."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = _Session()
+            session.pins += 1
+            session.last_used = time.monotonic()
+
+    def unpin(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None and session.pins:
+                session.pins -= 1
+                session.last_used = time.monotonic()
+
+    def workspaces(self) -> list:
+        with self._lock:
+            return [s.workspace for s in self._sessions.values() if s.workspace is not None]
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            evicted = self._evict_locked(time.monotonic())
+        if evicted and self._on_evict is not None:
+            self._on_evict(evicted)
+        return len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "active": sum(1 for s in self._sessions.values() if s.active),
+                "pinned": sum(1 for s in self._sessions.values() if s.pins),
+                "idle_seconds": sorted(round(now - s.last_used, 1) for s in self._sessions.values()),
+                "evictions": self.evictions,
+                "idle_timeout": self.idle_timeout,
+                "max_sessions": self.max_sessions,
+            }
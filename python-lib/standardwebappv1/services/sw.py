@@ -1,12 +1,14 @@
 import pandas as pd
 import numpy as np
 
+from . import kernels
+
 
 def calculate_sw(df: pd.DataFrame, params: dict) -> pd.DataFrame:
     """
     Main function to calculate Water Saturation (SW Indonesia) and reservoir classification.
     """
-    df_processed = df.copy()
+    df_processed = df.copy(deep=False)
 
     # Extract parameters from frontend with safe defaults
     RWS = float(params.get('RWS', 0.529))
@@ -31,22 +33,27 @@ def calculate_sw(df: pd.DataFrame, params: dict) -> pd.DataFrame:
     df_processed["RW_TEMP"] = RWS * (RWT + 21.5) / (FTEMP + 21.5)
 
     print("Calculating Water Saturation (SW Indonesia)...")
-    v = df_processed[VSH] ** 2
-    ff = A / df_processed[PHIE] ** M
-
-    # Avoid division by zero
-    ff_times_rw_temp = ff * df_processed["RW_TEMP"]
-    ff_times_rw_temp[ff_times_rw_temp == 0] = np.nan
-
-    f1 = 1 / ff_times_rw_temp
-    f2 = 2 * np.sqrt(v / (ff_times_rw_temp * RT_SH))
-    f3 = v / RT_SH
-
-    denom = f1 + f2 + f3
-    denom[denom == 0] = np.nan
-
-    df_processed[SW] = (1 / (df_processed[RT] * denom)) ** (1 / N)
-    df_processed.loc[df_processed[PHIE] < 0.005, SW] = 1.0
-    df_processed[SW] = df_processed[SW].clip(lower=0, upper=1)
+    if kernels.numba_enabled():
+        df_processed[SW] = kernels.sw_indonesia(
+            df_processed[RT], df_processed[PHIE], df_processed[VSH],
+            RWS * (RWT + 21.5) / (FTEMP + 21.5), A, M, N, RT_SH)
+    else:
+        v = df_processed[VSH] ** 2
+        ff = A / df_processed[PHIE] ** M
+
+        # Avoid division by zero
+        ff_times_rw_temp = ff * df_processed["RW_TEMP"]
+        ff_times_rw_temp[ff_times_rw_temp == 0] = np.nan
+
+        f1 = 1 / ff_times_rw_temp
+        f2 = 2 * np.sqrt(v / (ff_times_rw_temp * RT_SH))
+        f3 = v / RT_SH
+
+        denom = f1 + f2 + f3
+        denom[denom == 0] = np.nan
+
+        df_processed[SW] = (1 / (df_processed[RT] * denom)) ** (1 / N)
+        df_processed.loc[df_processed[PHIE] < 0.005, SW] = 1.0
+        df_processed[SW] = df_processed[SW].clip(lower=0, upper=1)
 
     return df_processed
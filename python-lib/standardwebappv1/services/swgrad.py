@@ -1,6 +1,11 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import linregress
+
+from . import kernels
+
+# Salinitas 1k-25k ppm dan titik SWGRAD (10k, 15k, 20k, 25k ppm)
+SALINITIES = np.arange(1, 26) * 1000
+SWGRAD_SAL = np.array([10, 15, 20, 25])
 
 def indonesia_computation(rw_in, phie, ct, a, m, n, rtsh, vsh):
     """
@@ -18,6 +23,26 @@ def indonesia_computation(rw_in, phie, ct, a, m, n, rtsh, vsh):
     swe = (ct / denominator) ** (1 / n)
     return max(0.0, min(1.0, swe))
 
+def indonesia_computation_array(rw_in, phie, ct, a, m, n, rtsh, vsh):
+    """
+    Versi array (broadcast) dari indonesia_computation.
+    Penyebut nol menghasilkan 1.0 dan hasil NaN ikut di-clamp ke 1.0,
+    sama seperti perilaku max(0, min(1, swe)) pada versi skalar.
+    """
+    dd = 2 - vsh
+    vsh_dd = vsh**dd
+    phie_m = phie**m
+    aa = vsh_dd / rtsh
+    bb = phie_m / (a * rw_in)
+    cc = 2 * np.sqrt((vsh_dd * phie_m) / (a * rw_in * rtsh))
+    denominator = aa + bb + cc
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        swe = (ct / denominator) ** (1 / n)
+    swe = np.where(denominator == 0, 1.0, swe)
+    swe = np.where(np.isnan(swe), 1.0, swe)
+    return np.clip(swe, 0.0, 1.0)
+
 def process_swgrad(df, params=None):
     """
     Proses perhitungan untuk seluruh dataset
@@ -26,63 +51,47 @@ def process_swgrad(df, params=None):
         params = {}
 
     try:
-        # Initialize SWARRAY columns
-        for i in range(1, 26):
-            df[f'SWARRAY_{i}'] = np.nan
-        df['SWGRAD'] = np.nan
-
-        # Data non dummy
-        df['CT'] = 1 / df['RT']
-
         # Konstanta dummy per zona
         a = params.get('A_PARAM', 1)
         m = params.get('M_PARAM', 1.8)
         n = params.get('N_PARAM', 1.8)
         rtsh = params.get('RTSH', 1)
 
-        # Data dari kolom dataframe
-        vsh = df['VSH'].values  # VSH dari kolom dataframe
-        phie = df['PHIE'].values  # PHIE dari kolom dataframe
+        # Data dari kolom dataframe, dibentuk (N, 1) agar broadcast ke 25 salinitas
+        vsh = df['VSH'].values.astype(float)[:, None]
+        phie = df['PHIE'].values.astype(float)[:, None]
         ftemp = 75 + 0.05 * df['DEPTH'].values  # formation temperature (fahrenheit)
-        ct = df['CT'].values
+        with np.errstate(divide='ignore'):
+            ct = 1 / df['RT'].values.astype(float)
+
+        # Matriks rw (N x 25) untuk seluruh salinitas
+        x = 0.0123 + 3647.5 / SALINITIES**0.955
+        rw_in = x[None, :] * 81.77 / (ftemp[:, None] + 6.77)
+
+        if kernels.numba_enabled():
+            swarray = kernels.indonesia_sweep(rw_in, phie, ct, vsh, a, m, n, rtsh)
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                swarray = indonesia_computation_array(
+                    rw_in, phie, ct[:, None], a, m, n, rtsh, vsh)
+
+        # HITUNG SWGRAD: slope least-squares SW terhadap salinitas 10k-25k ppm
+        # (bentuk tertutup dari linregress untuk x = [10, 15, 20, 25])
+        data_SW = swarray[:, SWGRAD_SAL - 1]
+        sal_centered = SWGRAD_SAL - SWGRAD_SAL.mean()
+        swgrad = data_SW @ sal_centered / np.sum(sal_centered**2)
+
+        # Simpan ke SWARRAY & kolom pendukung
+        for j in range(1, 26):
+            df[f'SWARRAY_{j}'] = swarray[:, j - 1]
+        df['SWGRAD'] = swgrad
+        df['CT'] = ct
         df['FTEMP'] = ftemp
         df['A_PARAM'] = a
         df['M_PARAM'] = m
         df['N_PARAM'] = n
         df['RTSH'] = rtsh
 
-        # Proses perhitungan untuk setiap baris dalam well ini
-        for i in range(len(df)):
-            sal = np.zeros(26)
-            x = np.zeros(26)
-            sw = np.zeros(26)
-
-            # Loop untuk setiap salinitas (1-25)
-            for j in range(1, 26):
-                sal[j] = j * 1000
-                x[j] = 0.0123 + 3647.5 / sal[j]**0.955
-                rw_in = x[j] * 81.77 / (ftemp[i] + 6.77)
-
-                # Hitung water saturation
-                sw[j] = indonesia_computation(rw_in, phie[i], ct[i], a, m, n, rtsh, vsh[i])
-
-                # Simpan ke SWARRAY
-                df.iloc[i, df.columns.get_loc(f'SWARRAY_{j}')] = sw[j]
-
-            # HITUNG SWGRAD SETELAH SEMUA SW DIHITUNG
-            # Gunakan data SW pada salinitas 10k, 15k, 20k, 25k ppm (indeks 10, 15, 20, 25)
-            try:
-                data_SW = np.array([sw[5*k] for k in range(2, 6)])  # sw[10], sw[15], sw[20], sw[25]
-                data_SAL = np.array([5*k for k in range(2, 6)])     # [10, 15, 20, 25]
-
-                # Hitung gradient menggunakan linear regression
-                SWGRAD, _, _, _, _ = linregress(data_SAL, data_SW)
-                df.iloc[i, df.columns.get_loc('SWGRAD')] = SWGRAD
-
-            except Exception as e:
-                print(f"Error calculating SWGRAD for row {i}: {str(e)}")
-                df.iloc[i, df.columns.get_loc('SWGRAD')] = np.nan
-
         return df
 
     except Exception as e:
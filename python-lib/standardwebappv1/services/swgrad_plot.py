@@ -1,5 +1,5 @@
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from .figure_builder import make_subplots
 from .plotting_service import (
     extract_markers_with_mean_depth,
     normalize_xover,
@@ -8,9 +8,7 @@ from .plotting_service import (
     plot_four_features_simple, 
     plot_flag,
     plot_texts_marker,
-    layout_range_all_axis,
-    layout_draw_lines,
-    layout_axis
+    apply_layout_template
 )
 
 def plot_swgrad(df, title='SWGRAD Analysis'):
@@ -66,7 +64,6 @@ def plot_swgrad(df, title='SWGRAD Analysis'):
             fig, axes, counter = plot_four_features_simple(df, fig, axes, key, n_seq, counter, n_plots=len(plot_sequence))
 
     # 5. Finalize Layout
-    fig = layout_range_all_axis(fig, axes, plot_sequence)
     fig.update_layout(
         margin=dict(l=20, r=20, t=40, b=20),
         height=1800,
@@ -83,7 +80,6 @@ def plot_swgrad(df, title='SWGRAD Analysis'):
         autorange=False 
     )
     fig.update_traces(yaxis='y')
-    fig = layout_draw_lines(fig, ratio_plots_seq, df, xgrid_intv=50)
-    fig = layout_axis(fig, axes, ratio_plots_seq, plot_sequence)
+    fig = apply_layout_template(fig, axes, ratio_plots_seq, df, xgrid_intv=50)
 
     return fig
\ No newline at end of file
@@ -6,7 +6,7 @@ def calculate_vsh_dn(df: pd.DataFrame, params: dict) -> pd.DataFrame:
     """
     Menghitung VSH dari crossplot Density-Neutron.
     """
-    df_processed = df.copy()
+    df_processed = df.copy(deep=False)
 
     # Ekstrak parameter dari frontend, dengan nilai default yang sesuai
     RHO_MA = float(params.get('RHO_MA', 2.645))
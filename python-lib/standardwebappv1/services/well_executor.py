@@ -0,0 +1,136 @@
+# Nama file: well_executor.py
+# Deskripsi: Lapisan eksekusi multi-sumur. Dataset dipecah sekali per WELL_NAME
+# lalu setiap sumur diproses paralel (ProcessPoolExecutor atau joblib).
+# Progres per sumur dilaporkan lewat callback `progress` (lihat progress.py).
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from typing import Callable, Optional, Tuple
+
+import pandas as pd
+
+from .progress import ProgressCallback, ProgressTracker
+
+
+def _run_single_well(well_func: Callable, well_name, df_well: pd.DataFrame,
+                     args: tuple, kwargs: dict):
+    """
+    (Internal) Menjalankan well_func untuk satu sumur dan menangkap error-nya.
+    Mengembalikan (sumur, hasil, error, durasi_detik).
+    """
+    start = time.perf_counter()
+    try:
+        result = well_func(df_well, *args, **kwargs)
+        return well_name, result, None, time.perf_counter() - start
+    except Exception as e:
+        return well_name, None, str(e), time.perf_counter() - start
+
+
+def split_wells(df: pd.DataFrame, well_column: str = 'WELL_NAME') -> list:
+    """
+    Memecah DataFrame menjadi list (nama_sumur, df_sumur) dengan satu kali groupby.
+    Urutan sumur mengikuti urutan kemunculan pertama di data.
+    """
+    return [(well_name, df_group.reset_index(drop=True))
+            for well_name, df_group in df.groupby(well_column, sort=False)]
+
+
+def process_wells(df: pd.DataFrame, well_func: Callable, *args,
+                  n_jobs: Optional[int] = None,
+                  backend: str = 'process',
+                  well_column: str = 'WELL_NAME',
+                  label: str = '',
+                  progress: Optional[ProgressCallback] = None,
+                  **kwargs) -> Tuple[Optional[pd.DataFrame], dict]:
+    """
+    Menjalankan well_func(df_sumur, *args, **kwargs) untuk setiap sumur.
+
+    Args:
+        df (pd.DataFrame): Dataset multi-sumur.
+        well_func (Callable): Fungsi per sumur (harus bisa di-pickle, yaitu
+            fungsi level modul). Mengembalikan DataFrame atau None jika gagal.
+        n_jobs (int): Jumlah worker; None = semua core, 1 = sekuensial.
+        backend (str): 'process' (ProcessPoolExecutor) atau 'joblib'.
+        well_column (str): Nama kolom identitas sumur.
+        label (str): Nama kalkulasi untuk pesan log.
+        progress (Callable, optional): Callback event progres per sumur
+            (indeks, waktu berjalan, baris/detik); lihat ProgressTracker.
+            Pada backend paralel, event 'well_start' dikirim saat sumur
+            diserahkan ke worker (bukan saat worker mulai memprosesnya).
+
+    Worker 'process' dibuat dengan start method 'spawn': pemanggil bisa
+    berupa proses multi-thread (backend webapp), dan fork dari proses seperti
+    itu dapat mewarisi lock yang sedang dipegang thread lain.
+
+    Returns:
+        Tuple[Optional[pd.DataFrame], dict]: Gabungan hasil (urutan sumur
+        stabil, None jika tidak ada yang berhasil) dan laporan
+        {'processed': [...], 'failed': [...], 'errors': {sumur: pesan}}.
+    """
+    wells = split_wells(df, well_column)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(wells)))
+
+    print(f"📊 Memproses {label} untuk {len(wells)} sumur dengan {n_jobs} worker...")
+    tracker = ProgressTracker(progress, label, len(wells))
+    well_rows = {well_name: len(df_well) for well_name, df_well in wells}
+
+    def report_done(outcome):
+        well_name, _, error, seconds = outcome
+        tracker.well_finished(well_name, well_rows[well_name], error, seconds)
+        return outcome
+
+    if n_jobs == 1:
+        outcomes = []
+        for well_name, df_well in wells:
+            tracker.well_started(well_name, len(df_well))
+            outcomes.append(report_done(_run_single_well(well_func, well_name, df_well, args, kwargs)))
+    elif backend == 'joblib':
+        from joblib import Parallel, delayed
+        for well_name, df_well in wells:
+            tracker.well_started(well_name, len(df_well))
+        outcomes = Parallel(n_jobs=n_jobs)(
+            delayed(_run_single_well)(well_func, well_name, df_well, args, kwargs)
+            for well_name, df_well in wells)
+        for outcome in outcomes:
+            report_done(outcome)
+    elif backend == 'process':
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=get_context('spawn')) as executor:
+            futures = []
+            for well_name, df_well in wells:
+                futures.append(executor.submit(_run_single_well, well_func, well_name,
+                                               df_well, args, kwargs))
+                tracker.well_started(well_name, len(df_well))
+            # Progres dilaporkan saat setiap sumur selesai; hasil tetap urut sumur
+            for future in as_completed(futures):
+                report_done(future.result())
+            outcomes = [future.result() for future in futures]
+    else:
+        raise ValueError(f"Backend tidak dikenal: {backend}")
+
+    processed_wells = []
+    report = {'processed': [], 'failed': [], 'errors': {}}
+
+    for well_name, result_df, error, _ in outcomes:
+        if result_df is not None:
+            processed_wells.append(result_df)
+            report['processed'].append(well_name)
+            print(f"✅ {well_name} - {label} berhasil dihitung.")
+        else:
+            report['failed'].append(well_name)
+            if error:
+                report['errors'][well_name] = error
+            print(f"❌ {well_name} - {label} gagal dihitung. {error or ''}".rstrip())
+
+    if not processed_wells:
+        print("\n❌ Tidak ada sumur yang berhasil diproses!")
+        tracker.finished(error='Tidak ada sumur yang berhasil diproses')
+        return None, report
+
+    df_final = pd.concat(processed_wells, ignore_index=True)
+    print(f"\n✅ Proses selesai. {len(report['processed'])} sumur berhasil, "
+          f"{len(report['failed'])} sumur gagal.")
+    tracker.finished()
+    return df_final, report
@@ -0,0 +1,453 @@
+# Nama file: well_store.py
+# Deskripsi: Penyimpanan data sumur kolumnar (Apache Arrow) yang dipartisi
+# per WELL_NAME. Dataset dimuat sekali, lalu setiap sumur diambil lewat indeks
+# partisi sehingga biayanya O(ukuran sumur), bukan O(ukuran dataset).
+# Mode lazy: hanya kolom proyeksi (WELL_NAME, MARKER, DEPTH) yang dimuat di
+# awal; kolom log dimuat per sumur saat dibutuhkan lewat `loader`.
+# Store turunan (fork) berbagi partisi Arrow yang immutable dengan store dasar
+# dan hanya menyimpan kolom turunan miliknya sendiri.
+
+import itertools
+import os
+import shutil
+import threading
+from typing import Callable, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+# Kolom yang cukup untuk daftar sumur, daftar marker dan rentang kedalaman
+PROJECTION_COLUMNS = ['WELL_NAME', 'MARKER', 'DEPTH']
+
+
+def _partition_key(value):
+    """Kunci partisi yang aman dipakai di dict (NaN/None -> None)."""
+    return None if pd.isna(value) else value
+
+
+class WellDataStore:
+    """
+    Data multi-sumur dalam bentuk partisi Arrow {nama_sumur: pa.Table}.
+
+    Urutan sumur mengikuti urutan kemunculan pertama di dataset sumber dan
+    urutan baris di dalam setiap sumur dipertahankan. Semua partisi hasil
+    from_dataframe berbagi schema yang sama; partisi yang diganti lewat
+    set_well boleh memiliki kolom tambahan.
+
+    Store lazy (from_projection) awalnya hanya berisi kolom proyeksi. Partisi
+    sumur dilengkapi lewat `loader(list_sumur) -> pd.DataFrame` saat kolom
+    lain diminta.
+
+    fork() menghasilkan store turunan (mis. workspace per sesi) yang berbagi
+    partisi dengan store ini tanpa salinan; penulisan di store turunan hanya
+    mengganti referensi partisinya sendiri.
+    """
+
+    def __init__(self, well_column: str = 'WELL_NAME',
+                 loader: Optional[Callable[[list], pd.DataFrame]] = None,
+                 schema_columns: Optional[List[str]] = None):
+        self.well_column = well_column
+        self._partitions = {}
+        self._loader = loader
+        self._schema_columns = list(schema_columns) if schema_columns else []
+        self._pending = set()  # sumur yang partisinya baru berisi proyeksi
+        # Versi kolom per sumur {sumur: {kolom: versi}}; naik setiap kali
+        # kolom ditulis ulang. Kolom yang belum pernah ditulis = versi 0.
+        # Sumber versi dibagi dengan semua fork, sehingga versi unik lintas
+        # store dan aman dipakai sebagai kunci cache bersama.
+        self._versions = {}
+        self._version_source = itertools.count(1)
+        self._base = None  # store asal partisi lazy (untuk fork)
+        self._load_lock = threading.RLock()
+        # Indeks depth terurut per sumur {sumur: (versi_depth, depth_terurut, urutan)}
+        self._depth_indexes = {}
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, well_column: str = 'WELL_NAME') -> 'WellDataStore':
+        """Membangun store dari DataFrame dengan satu kali konversi ke Arrow."""
+        store = cls(well_column)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        if well_column not in df.columns:
+            store._partitions[None] = table
+            return store
+
+        codes, uniques = pd.factorize(df[well_column], use_na_sentinel=False)
+        if len(codes) == 0:
+            return store
+
+        # Urutkan baris per sumur (stabil) lalu potong menjadi slice zero-copy
+        order = np.argsort(codes, kind='stable')
+        sorted_table = table.take(pa.array(order))
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        for code, well in enumerate(uniques):
+            start, stop = bounds[code], bounds[code + 1]
+            store._partitions[_partition_key(well)] = sorted_table.slice(start, stop - start)
+        return store
+
+    @classmethod
+    def from_projection(cls, df_projection: pd.DataFrame,
+                        loader: Callable[[list], pd.DataFrame],
+                        schema_columns: List[str],
+                        well_column: str = 'WELL_NAME') -> 'WellDataStore':
+        """
+        Membangun store lazy dari DataFrame proyeksi. `schema_columns` adalah
+        daftar kolom lengkap dataset sumber; kolom di luar proyeksi dimuat
+        per sumur lewat `loader` saat pertama kali dibutuhkan.
+        """
+        store = cls.from_dataframe(df_projection, well_column)
+        store._loader = loader
+        store._schema_columns = list(schema_columns)
+        store._pending = set(store._partitions)
+        return store
+
+    def fork(self) -> 'WellDataStore':
+        """
+        Store turunan yang berbagi partisi (dan partisi lazy yang belum dimuat)
+        dengan store ini. Perubahan di salah satu tidak terlihat di yang lain.
+        """
+        store = WellDataStore(self.well_column, schema_columns=self._schema_columns)
+        with self._load_lock:
+            store._partitions = dict(self._partitions)
+            store._pending = set(self._pending)
+        store._versions = {key: dict(versions) for key, versions in self._versions.items()}
+        store._version_source = self._version_source
+        store._depth_indexes = dict(self._depth_indexes)
+        store._base = self if store._pending else None
+        return store
+
+    @property
+    def is_fully_loaded(self) -> bool:
+        return not self._pending
+
+    def _ensure_loaded(self, keys: Iterable, columns: Optional[Iterable[str]] = None) -> None:
+        """(Internal) Memuat partisi lengkap untuk sumur `keys` yang masih proyeksi."""
+        if not self._pending or (self._loader is None and self._base is None):
+            return
+        with self._load_lock:
+            needed = [key for key in keys if key in self._pending]
+            if columns is not None:
+                columns = list(columns)
+                needed = [key for key in needed
+                          if any(c not in self._partitions[key].column_names for c in columns)]
+            if not needed:
+                return
+
+            if self._base is not None:
+                # Partisi pending di fork belum pernah ditulis: pakai milik store dasar
+                self._base._ensure_loaded(needed, columns)
+                loaded = [key for key in needed if key not in self._base._pending]
+                for key in loaded:
+                    self._partitions[key] = self._base._partitions[key]
+                self._pending.difference_update(loaded)
+                return
+
+            # Hanya sumur yang partisinya benar-benar diganti yang dianggap
+            # termuat; sisanya tetap pending dan dicoba lagi di akses berikutnya
+            loaded = set()
+            df_loaded = self._loader(needed)
+            if df_loaded is not None and not df_loaded.empty:
+                for well_name, df_well in df_loaded.groupby(self.well_column, sort=False, dropna=False):
+                    key = _partition_key(well_name)
+                    if key in self._pending:
+                        self._partitions[key] = pa.Table.from_pandas(df_well, preserve_index=False)
+                        loaded.add(key)
+            self._pending.difference_update(loaded)
+
+    # -----------------------------
+    # Metadata
+    # -----------------------------
+    @property
+    def wells(self) -> list:
+        """Daftar sumur (kosong jika dataset tidak memiliki kolom sumur)."""
+        if self.well_column not in self.columns:
+            return []
+        return list(self._partitions)
+
+    @property
+    def columns(self) -> List[str]:
+        """Gabungan nama kolom seluruh partisi, urutan kemunculan pertama."""
+        columns = list(self._schema_columns)
+        seen = set(columns)
+        for table in self._partitions.values():
+            for name in table.column_names:
+                if name not in seen:
+                    seen.add(name)
+                    columns.append(name)
+        return columns
+
+    @property
+    def num_rows(self) -> int:
+        return sum(table.num_rows for table in self._partitions.values())
+
+    def has_well(self, well_name) -> bool:
+        return _partition_key(well_name) in self._partitions
+
+    def well_num_rows(self, well_name) -> int:
+        table = self._partitions.get(_partition_key(well_name))
+        return 0 if table is None else table.num_rows
+
+    def well_columns(self, well_name) -> List[str]:
+        """Kolom yang dimiliki satu sumur (tanpa memuat partisi lazy)."""
+        key = _partition_key(well_name)
+        if key not in self._partitions:
+            return []
+        names = self._partitions[key].column_names
+        if key in self._pending:
+            return list(self._schema_columns) + [c for c in names if c not in self._schema_columns]
+        return names
+
+    def column_versions(self, well_name) -> dict:
+        """Versi setiap kolom milik satu sumur, untuk kunci cache/invalidasi."""
+        versions = self._versions.get(_partition_key(well_name), {})
+        return {col: versions.get(col, 0) for col in self.well_columns(well_name)}
+
+    def _bump_versions(self, key, columns: Iterable[str]) -> None:
+        version = next(self._version_source)
+        versions = self._versions.setdefault(key, {})
+        for col in columns:
+            versions[col] = version
+
+    def unique_values(self, column: str) -> list:
+        """Nilai unik sebuah kolom di seluruh sumur (urutan kemunculan pertama)."""
+        self._ensure_loaded(list(self._partitions), [column])
+        values = {}
+        for table in self._partitions.values():
+            if column in table.column_names:
+                for value in pc.unique(table.column(column)).to_pylist():
+                    values.setdefault(value)
+        return list(values)
+
+    def column_range(self, column: str, wells: Optional[Iterable] = None) -> tuple:
+        """(min, max) sebuah kolom numerik di seluruh sumur (atau `wells`); (None, None) jika kosong."""
+        keys = list(self._partitions) if wells is None else [
+            _partition_key(w) for w in wells if self.has_well(w)]
+        self._ensure_loaded(keys, [column])
+        lows, highs = [], []
+        for key in keys:
+            table = self._partitions[key]
+            if column not in table.column_names:
+                continue
+            result = pc.min_max(table.column(column))
+            if result['min'].is_valid:
+                lows.append(result['min'].as_py())
+                highs.append(result['max'].as_py())
+        if not lows:
+            return None, None
+        return min(lows), max(highs)
+
+    # -----------------------------
+    # Akses data
+    # -----------------------------
+    def well_table(self, well_name, columns: Optional[Iterable[str]] = None) -> pa.Table:
+        """Partisi Arrow satu sumur (zero-copy); KeyError jika sumur tidak ada."""
+        key = _partition_key(well_name)
+        self._ensure_loaded([key], columns)
+        table = self._partitions[key]
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        return table
+
+    def get_well(self, well_name, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """DataFrame satu sumur; DataFrame kosong jika sumur tidak ada."""
+        if not self.has_well(well_name):
+            return pd.DataFrame(columns=self.columns)
+        return self.well_table(well_name, columns).to_pandas()
+
+    def _depth_index(self, key, depth_column: str):
+        """
+        (Internal) Depth terurut milik satu sumur dan urutan barisnya (None jika
+        baris sudah terurut). Dibangun sekali per versi kolom depth.
+        """
+        version = self._versions.get(key, {}).get(depth_column, 0)
+        cached = self._depth_indexes.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+
+        depth = self._partitions[key].column(depth_column).to_numpy(zero_copy_only=False).astype(float)
+        if np.all(depth[1:] >= depth[:-1]):
+            order = None
+            sorted_depth = depth
+        else:
+            # NaN (mis. depth kosong) diletakkan di akhir oleh argsort
+            order = np.argsort(depth, kind='stable')
+            sorted_depth = depth[order]
+        self._depth_indexes[key] = (version, sorted_depth, order)
+        return sorted_depth, order
+
+    def depth_window(self, well_name, top: Optional[float] = None, bottom: Optional[float] = None,
+                     columns: Optional[Iterable[str]] = None,
+                     depth_column: str = 'DEPTH') -> pd.DataFrame:
+        """
+        Baris satu sumur dengan depth di [top, bottom] (None = tanpa batas),
+        ditambah satu sampel di luar setiap tepi, terurut menurut depth.
+        Pencarian batas memakai indeks depth terurut (O(log N)); untuk sumur
+        yang sudah terurut hasilnya slice zero-copy dari partisi.
+        """
+        if not self.has_well(well_name):
+            return pd.DataFrame(columns=self.columns if columns is None else list(columns))
+        key = _partition_key(well_name)
+        if depth_column not in self._partitions[key].column_names:
+            raise KeyError(f"Kolom {depth_column} tidak ditemukan untuk sumur {well_name}.")
+
+        sorted_depth, order = self._depth_index(key, depth_column)
+        num_valid = len(sorted_depth) - int(np.isnan(sorted_depth).sum())
+        start = 0 if top is None else int(np.searchsorted(sorted_depth[:num_valid], top, side='left'))
+        stop = num_valid if bottom is None else int(np.searchsorted(sorted_depth[:num_valid], bottom, side='right'))
+        start = max(start - 1, 0)
+        stop = min(stop + 1, num_valid)
+
+        table = self.well_table(well_name, columns)
+        if stop <= start:
+            return table.slice(0, 0).to_pandas()
+        if order is None:
+            return table.slice(start, stop - start).to_pandas()
+        return table.take(pa.array(order[start:stop])).to_pandas()
+
+    def to_pandas(self, wells: Optional[Iterable] = None,
+                  columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Menggabungkan partisi (semua sumur, atau hanya `wells`) menjadi satu
+        DataFrame dengan RangeIndex. Kolom yang tidak dimiliki sebuah partisi
+        diisi NaN.
+        """
+        keys = list(self._partitions) if wells is None else [
+            _partition_key(w) for w in wells if self.has_well(w)]
+        # Muat semua sumur yang dibutuhkan dalam satu panggilan loader
+        self._ensure_loaded(keys, columns)
+        frames = [self.well_table(key, columns).to_pandas() for key in keys]
+        if not frames:
+            return pd.DataFrame(columns=self.columns if columns is None else list(columns))
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    # -----------------------------
+    # Pembaruan
+    # -----------------------------
+    def set_well(self, well_name, df: pd.DataFrame) -> None:
+        """Mengganti (atau menambah) partisi satu sumur."""
+        key = _partition_key(well_name)
+        self._partitions[key] = pa.Table.from_pandas(df, preserve_index=False)
+        self._pending.discard(key)
+        self._bump_versions(key, df.columns)
+
+    def apply_columns(self, df_columns: pd.DataFrame, wells: Optional[Iterable] = None) -> None:
+        """
+        Menulis kolom baru/berubah ke partisi tanpa menyalin kolom lain.
+        Baris `df_columns` harus berurutan seperti to_pandas(wells).
+        """
+        keys = list(self._partitions) if wells is None else [
+            _partition_key(w) for w in wells if self.has_well(w)]
+        # Partisi lazy dilengkapi dulu agar kolom baru tidak tertimpa saat dimuat
+        self._ensure_loaded(keys)
+        offset = 0
+        for key in keys:
+            table = self._partitions[key]
+            part = df_columns.iloc[offset:offset + table.num_rows]
+            offset += table.num_rows
+            for col in part.columns:
+                values = pa.Array.from_pandas(part[col])
+                index = table.schema.get_field_index(col)
+                if index >= 0:
+                    table = table.set_column(index, col, values)
+                else:
+                    table = table.append_column(col, values)
+            self._partitions[key] = table
+            self._bump_versions(key, part.columns)
+
+    def update_from_dataframe(self, df: pd.DataFrame) -> None:
+        """
+        Mengganti partisi setiap sumur yang muncul di `df`; sumur lain tidak
+        berubah. Tanpa kolom sumur, seluruh store diganti.
+        """
+        if self.well_column not in df.columns:
+            self._partitions = WellDataStore.from_dataframe(df, self.well_column)._partitions
+            self._pending = set()
+            for key in self._partitions:
+                self._bump_versions(key, df.columns)
+            return
+        for well_name, df_well in df.groupby(self.well_column, sort=False, dropna=False):
+            self.set_well(well_name, df_well)
+
+
+class ParquetWellCache:
+    """
+    Cache Parquet lokal yang dipartisi per sumur (hive: WELL_NAME=<nama>/).
+    Dataset sumber ditulis sekali secara streaming per chunk, lalu setiap
+    pembacaan hanya menyentuh file milik sumur yang diminta.
+    """
+
+    def __init__(self, cache_dir: str, well_column: str = 'WELL_NAME'):
+        self.cache_dir = cache_dir
+        self.well_column = well_column
+        self._partitioning = ds.partitioning(pa.schema([(well_column, pa.string())]), flavor='hive')
+        self._schema = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._schema is not None
+
+    def build(self, chunks: Iterable[pd.DataFrame]) -> None:
+        """Menulis ulang cache dari iterable DataFrame (mis. iter_dataframes)."""
+        self.clear()
+        schemas = []
+        for i, chunk in enumerate(chunks):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            schemas.append(table.schema)
+            # Nama file berurutan agar urutan baris terjaga saat dibaca ulang
+            ds.write_dataset(table, self.cache_dir, format='parquet',
+                             partitioning=self._partitioning,
+                             basename_template=f'chunk-{i:06d}-{{i}}.parquet',
+                             existing_data_behavior='overwrite_or_ignore')
+        if not schemas:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._schema = pa.schema([(self.well_column, pa.string())])
+            return
+        try:
+            self._schema = pa.unify_schemas(schemas, promote_options='permissive')
+        except TypeError:
+            # pyarrow < 14 tidak mengenal promote_options
+            self._schema = pa.unify_schemas(schemas)
+
+    def read_wells(self, wells: list, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Membaca baris milik `wells` saja (partition pruning)."""
+        if not self.is_built:
+            raise RuntimeError("Parquet cache belum dibangun.")
+        dataset = ds.dataset(self.cache_dir, format='parquet',
+                             partitioning=self._partitioning, schema=self._schema)
+        field = ds.field(self.well_column)
+        names = [w for w in wells if w is not None]
+        well_type = self._schema.field(self.well_column).type
+        if pa.types.is_string(well_type) or pa.types.is_large_string(well_type):
+            condition = field.isin([str(w) for w in names])
+        else:
+            condition = field.isin(names)
+        if any(w is None for w in wells):
+            condition = condition | field.is_null()
+        columns = list(columns) if columns is not None else self._schema.names
+        df = dataset.to_table(filter=condition, columns=columns).to_pandas()
+        if self.well_column in df.columns:
+            df[self.well_column] = self._restore_keys(df[self.well_column], names)
+        return df
+
+    @staticmethod
+    def _restore_keys(values: pd.Series, wells: list) -> pd.Series:
+        """
+        (Internal) Mengembalikan nama sumur ke tipe kunci yang diminta (mis.
+        id int), karena kolom partisi hive bisa terbaca sebagai string.
+        """
+        codes, uniques = pd.factorize(values)
+        lookup = {str(w): w for w in wells}
+        restored = [lookup.get(str(u), u) for u in uniques]
+        if all(type(r) is type(u) and r == u for r, u in zip(restored, uniques)):
+            return values
+        restored = np.asarray(restored + [None], dtype=object)
+        return pd.Series(restored[codes], index=values.index, name=values.name)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._schema = None
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Service plugin diimpor dari python-lib, sama seperti di runtime Dataiku
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'python-lib'))
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('dataiku')
+pytest.importorskip('flask')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'webapps', 'webappv1'))
+
+import backend  # noqa: E402
+from standardwebappv1.services.depth_pyramid import WellPyramids  # noqa: E402
+from standardwebappv1.services.well_store import WellDataStore  # noqa: E402
+
+
+def make_well(name, rows, seed, top):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'WELL_NAME': name,
+        'DEPTH': top + 0.5 * np.arange(rows),
+        'MARKER': 'A',
+        'GR': rng.uniform(20, 150, rows),
+        'RT': 10 ** rng.normal(1, 0.3, rows),
+        'NPHI': rng.uniform(0.05, 0.45, rows),
+        'RHOB': rng.uniform(1.9, 2.8, rows),
+    })
+
+
+@pytest.fixture
+def analysis():
+    analysis = backend.WellLogAnalysis()
+    # SHORT gagal di RGSA (< 100 baris); sumur lain berhasil
+    df = pd.concat([make_well('LONG_1', 400, 1, 1000.0), make_well('SHORT', 50, 2, 2000.0),
+                    make_well('LONG_2', 300, 3, 3000.0)], ignore_index=True)
+    analysis.current_dataset = 'test_wells'
+    analysis.well_store = WellDataStore.from_dataframe(df)
+    analysis.depth_pyramids = WellPyramids(analysis.well_store)
+    return analysis
+
+
+@pytest.mark.parametrize('calculation_type, output', [('rgsa', 'RGSA'), ('ngsa', 'NGSA'), ('dgsa', 'DGSA')])
+def test_failed_well_is_left_unchanged(analysis, calculation_type, output):
+    before = analysis.well_store.to_pandas()
+    result = analysis.run_calculation(calculation_type, {'n_jobs': 1})
+    assert result['status'] == 'success', result.get('message')
+
+    after = analysis.well_store.to_pandas()
+    for col in before.columns:
+        pd.testing.assert_series_equal(after[col], before[col])
+
+    short = analysis.well_store.to_pandas(['SHORT'])
+    assert short[output].isna().all()
+    for well in ('LONG_1', 'LONG_2'):
+        values = analysis.well_store.to_pandas([well])
+        assert (values['WELL_NAME'] == well).all()
+        assert values[output].notna().any()
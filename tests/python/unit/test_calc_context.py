@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from standardwebappv1.services.calc_context import CalculationContext
+from standardwebappv1.services.rgsa import process_all_wells_rgsa
+from standardwebappv1.services.well_store import WellDataStore
+
+
+def make_well(name, rows, seed, top=1000.0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'WELL_NAME': name,
+        'DEPTH': top + 0.5 * np.arange(rows),
+        'MARKER': 'A',
+        'GR': rng.uniform(20, 150, rows),
+        'RT': 10 ** rng.normal(1, 0.3, rows),
+    })
+
+
+@pytest.fixture
+def store():
+    # SHORT terlalu pendek untuk RGSA (< 100 baris) sehingga dibuang orkestrator
+    return WellDataStore.from_dataframe(pd.concat(
+        [make_well('SHORT', 50, 1), make_well('LONG', 400, 2, top=2000.0)], ignore_index=True))
+
+
+def test_dropped_well_keeps_its_rows(store):
+    before = store.to_pandas(['SHORT'])
+    context = CalculationContext(store)
+    delta = context.run(process_all_wells_rgsa, {}, ['A'], n_jobs=1)
+    context.commit(delta)
+
+    short = store.to_pandas(['SHORT'])
+    pd.testing.assert_series_equal(short['DEPTH'], before['DEPTH'])
+    assert (short['WELL_NAME'] == 'SHORT').all()
+    assert short['RGSA'].isna().all()
+
+    long = store.to_pandas(['LONG'])
+    expected = process_all_wells_rgsa(make_well('LONG', 400, 2, top=2000.0), {}, ['A'], n_jobs=1)
+    np.testing.assert_allclose(long['RGSA'].to_numpy(), expected['RGSA'].to_numpy(), equal_nan=True)
+    assert long['RGSA'].notna().any()
+
+
+def test_fresh_index_is_not_taken_as_store_rows(store):
+    context = CalculationContext(store)
+    result = context.frame.iloc[50:].reset_index(drop=True)
+    result['OUT'] = 1.0
+    context.commit(context.diff(result))
+
+    assert store.to_pandas(['SHORT'])['OUT'].isna().all()
+    assert (store.to_pandas(['LONG'])['OUT'] == 1.0).all()
+
+
+def test_dropna_keeps_row_labels(store):
+    context = CalculationContext(store)
+    frame = context.frame
+    frame['OUT'] = np.where(frame['WELL_NAME'] == 'SHORT', np.nan, 2.0)
+    context.commit(context.diff(frame.dropna(subset=['OUT'])))
+
+    assert store.to_pandas(['SHORT'])['OUT'].isna().all()
+    assert (store.to_pandas(['LONG'])['OUT'] == 2.0).all()
+
+
+def test_unmappable_rows_are_refused(store):
+    context = CalculationContext(store, markers=['A'])
+    result = context.frame.iloc[10:].reset_index(drop=True).drop(columns=['DEPTH'])
+    with pytest.raises(ValueError):
+        context.diff(result)
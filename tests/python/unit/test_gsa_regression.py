@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from standardwebappv1.services.gsa_regression import COEFF_COLS, fit_window_coeffs
+
+WINDOW = 106
+STEP = 20
+MIN_POINTS = 30
+
+
+def reference_coeffs(depth, ref, target, log_target):
+    """LinearRegression().fit() per window, seperti implementasi per-window lama."""
+    rows = []
+    for start in range(0, len(depth) - WINDOW, STEP):
+        sl = slice(start, start + WINDOW)
+        gr, tg = ref[sl], target[sl]
+        mask = (gr > 5) & (gr < 180) & (tg > 0.1) & (tg < 1000)
+        if mask.sum() < MIN_POINTS:
+            continue
+        x = 0.01 * gr[mask]
+        y = np.log10(tg[mask]) if log_target else tg[mask]
+        model = LinearRegression().fit(np.column_stack([x, x**2, x**3]), y)
+        rows.append([depth[sl].mean(), model.intercept_, *model.coef_])
+    return np.array(rows)
+
+
+@pytest.fixture
+def well():
+    rng = np.random.default_rng(51)
+    n = 1200
+    depth = 1000 + 0.5 * np.arange(n)
+    gr = rng.uniform(20, 150, n)
+    rt = 10 ** rng.normal(1, 0.3, n)
+    return depth, gr, rt, rng
+
+
+@pytest.mark.parametrize('log_target', [True, False])
+def test_matches_linear_regression(well, log_target):
+    depth, gr, rt, _ = well
+    expected = reference_coeffs(depth, gr, rt, log_target)
+    result = fit_window_coeffs(depth, gr, rt, log_target=log_target)
+    np.testing.assert_allclose(result[['DEPTH'] + COEFF_COLS].to_numpy(), expected,
+                               rtol=1e-8, atol=1e-8)
+
+
+def test_flat_gr_windows(well):
+    # Seperti ABB-051: GR konstan di sebagian interval
+    depth, gr, rt, _ = well
+    gr[200:420] = 75.0
+    expected = reference_coeffs(depth, gr, rt, True)
+    result = fit_window_coeffs(depth, gr, rt, log_target=True)
+    coeffs = result[['DEPTH'] + COEFF_COLS].to_numpy()
+
+    np.testing.assert_allclose(coeffs, expected, rtol=1e-8, atol=1e-8)
+    flat = (result['DEPTH'] > depth[200 + WINDOW]) & (result['DEPTH'] < depth[420 - WINDOW])
+    assert flat.any()
+    np.testing.assert_array_equal(result.loc[flat, ['b1', 'b2', 'b3']].to_numpy(), 0.0)
+
+
+def test_near_flat_gr_windows(well):
+    depth, gr, rt, rng = well
+    gr[500:700] = 75.0 + rng.normal(0, 1e-7, 200)
+    expected = reference_coeffs(depth, gr, rt, True)
+    coeffs = fit_window_coeffs(depth, gr, rt, log_target=True)[['DEPTH'] + COEFF_COLS].to_numpy()
+
+    assert np.isfinite(coeffs).all()
+    np.testing.assert_allclose(coeffs, expected, rtol=1e-6)
+
+
+def test_nan_samples_are_masked(well):
+    depth, gr, rt, _ = well
+    gr[300:340] = np.nan
+    rt[600:620] = np.nan
+    expected = reference_coeffs(depth, gr, rt, True)
+    coeffs = fit_window_coeffs(depth, gr, rt, log_target=True)[['DEPTH'] + COEFF_COLS].to_numpy()
+
+    assert np.isfinite(coeffs).all()
+    np.testing.assert_allclose(coeffs, expected, rtol=1e-8, atol=1e-8)
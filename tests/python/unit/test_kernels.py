@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('numba')
+
+from standardwebappv1.services import kernels
+from standardwebappv1.services.porosity import calculate_porosity
+from standardwebappv1.services.rt_r0 import calculate_R0
+from standardwebappv1.services.rwa import calculate_rwa
+from standardwebappv1.services.sw import calculate_sw
+from standardwebappv1.services.swgrad import process_swgrad
+
+N_SAMPLES = 2000
+
+
+@pytest.fixture(scope='module')
+def logs():
+    """Log sintetis dengan NaN, nol dan nilai di luar rentang fisik."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'DEPTH': np.arange(N_SAMPLES) * 0.1524 + 1000,
+        'GR': rng.uniform(10, 150, N_SAMPLES),
+        'RT': 10 ** rng.normal(0.8, 0.6, N_SAMPLES),
+        'PHIE': rng.uniform(-0.02, 0.35, N_SAMPLES),
+        'VSH': rng.uniform(0, 1, N_SAMPLES),
+        'RHOB': rng.uniform(1.8, 2.9, N_SAMPLES),
+        'NPHI': rng.uniform(-0.02, 0.5, N_SAMPLES),
+        'A': 1.0, 'M': 1.8, 'RW': 0.2, 'RTSH': 2.0,
+    })
+    df.loc[::53, 'PHIE'] = np.nan
+    df.loc[::47, 'RT'] = np.nan
+    df.loc[::59, 'RT'] = 0.0
+    df.loc[::61, 'VSH'] = 0.0
+    df.loc[::67, 'PHIE'] = 0.0
+    df.loc[::71, 'VSH'] = 1.3
+    df.loc[::73, 'RT'] = -5.0
+    df.loc[::79, 'RHOB'] = np.nan
+    df.loc[::83, 'NPHI'] = -0.3
+    return df
+
+
+@pytest.fixture
+def numba_backend():
+    previous = kernels.numba_enabled()
+    yield
+    kernels.set_numba_enabled(previous)
+
+
+@pytest.mark.parametrize('func, columns', [
+    (process_swgrad, ['SWARRAY_1', 'SWARRAY_13', 'SWARRAY_25', 'SWGRAD']),
+    (lambda df: calculate_porosity(df, {}), ['PHIE', 'PHIT', 'RHO_MAT']),
+    (calculate_R0, ['R0', 'RTR0']),
+    (lambda df: calculate_sw(df, {}), ['SW']),
+    (lambda df: calculate_rwa(df, {}), ['RWA_FULL', 'RWA_SIMPLE', 'RWA_TAR']),
+], ids=['swgrad', 'porosity', 'rt_r0', 'sw', 'rwa'])
+def test_numba_matches_numpy(logs, numba_backend, func, columns):
+    with np.errstate(all='ignore'):
+        kernels.set_numba_enabled(False)
+        expected = func(logs.copy())
+        assert kernels.set_numba_enabled(True)
+        actual = func(logs.copy())
+
+    for col in columns:
+        np.testing.assert_allclose(actual[col].to_numpy(dtype=float),
+                                   expected[col].to_numpy(dtype=float),
+                                   rtol=1e-9, atol=1e-12, equal_nan=True, err_msg=col)
+
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from standardwebappv1.services.well_store import ParquetWellCache, WellDataStore
+
+
+def make_wells(names, rows=5):
+    return pd.DataFrame({
+        'WELL_NAME': np.repeat(names, rows),
+        'DEPTH': np.arange(len(names) * rows, dtype=float),
+        'MARKER': 'A',
+        'GR': np.arange(len(names) * rows, dtype=float),
+    })
+
+
+def test_read_wells_keeps_requested_key_type(tmp_path):
+    # Nama sumur tersimpan sebagai string, tetapi diminta dengan id int
+    cache = ParquetWellCache(str(tmp_path / 'cache'))
+    cache.build([make_wells(['101', '102'])])
+
+    df = cache.read_wells([101])
+    assert len(df) == 5
+    assert df['WELL_NAME'].tolist() == [101] * 5
+
+
+def test_int_well_ids_load_lazily(tmp_path):
+    df = make_wells([101, 102])
+    cache = ParquetWellCache(str(tmp_path / 'cache'))
+    cache.build([df])
+    store = WellDataStore.from_projection(df[['WELL_NAME', 'DEPTH', 'MARKER']], cache.read_wells,
+                                          list(df.columns))
+
+    well = store.to_pandas([101])
+    assert well['GR'].tolist() == df.loc[df['WELL_NAME'] == 101, 'GR'].tolist()
+    assert store._pending == {102}
+
+
+def test_unmatched_loader_rows_stay_pending():
+    df = make_wells([101, 102])
+
+    def loader(wells):
+        # Loader yang mengembalikan nama sebagai string tidak cocok dengan kunci int
+        loaded = df[df['WELL_NAME'].isin(wells)].copy()
+        loaded['WELL_NAME'] = loaded['WELL_NAME'].astype(str)
+        return loaded
+
+    store = WellDataStore.from_projection(df[['WELL_NAME', 'DEPTH', 'MARKER']], loader, list(df.columns))
+    store.to_pandas([101])
+    assert 101 in store._pending
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('plotly')
+
+from standardwebappv1.services.figure_builder import make_subplots
+from standardwebappv1.services.plotting_service import add_xover_fill, decimate_figure
+
+N_SAMPLES = 100000
+MAX_POINTS = 2000
+
+
+@pytest.fixture(scope='module')
+def well():
+    rng = np.random.default_rng(19)
+    i = np.arange(N_SAMPLES)
+    df = pd.DataFrame({
+        'DEPTH': 1000 + 0.1524 * i,
+        'LEFT': np.sin(i / 500) + rng.normal(0, 0.02, N_SAMPLES),
+        'RIGHT': np.cos(i / 700),
+    })
+    df.loc[4000:4100, 'LEFT'] = np.nan
+    return df
+
+
+def build(df, max_points):
+    fig = make_subplots(rows=1, cols=1)
+    left, right = df['LEFT'].to_numpy(), df['RIGHT'].to_numpy()
+    return add_xover_fill(fig, df, 'X', {1: 'red'}, 'x1', 'y1', left=left, right=right,
+                          label=(left > right).astype(np.int8), max_points=max_points)
+
+
+def test_polygon_is_bounded_by_max_points(well):
+    full = build(well, None).data[0]
+    decimated = build(well, MAX_POINTS).data[0]
+    assert len(full.x) > 2 * N_SAMPLES // 3
+    assert len(decimated.x) <= MAX_POINTS
+
+    # Titik poligon tetap berasal dari kurva asli dan mencakup rentang depth yang sama
+    y = np.asarray(decimated.y, dtype=float)
+    assert np.isin(y[~np.isnan(y)], well['DEPTH'].to_numpy()).all()
+    full_y = np.asarray(full.y, dtype=float)
+    assert np.nanmax(y) - np.nanmin(y) > 0.95 * (np.nanmax(full_y) - np.nanmin(full_y))
+
+
+def test_decimate_figure_keeps_run_separators(well):
+    fig = decimate_figure(build(well, MAX_POINTS), MAX_POINTS, depth_range=[2000, 4000])
+    y = np.asarray(fig.data[0].y, dtype=float)
+    assert np.isnan(y).any()
+    inside = y[~np.isnan(y)]
+    # Hanya satu sampel di luar setiap tepi rentang yang ikut dikirim
+    assert ((inside < 2000) | (inside > 4000)).sum() <= 2
@@ -14,8 +14,13 @@ var appState = {
     currentStructure: null,
     selectedFilePath: null, // Added for file-based plots
     plotFigure: { data: [], layout: {} }, // Added for plot state
+    plotView: null, // { wellName, plotType } of the plot shown, for depth window loading
     error: null, // Added for error handling
-    wellColumns: {} // Added for well columns
+    wellColumns: {}, // Added for well columns
+    sessionId: null, // Backend session id when sessionStorage is unavailable
+    currentJobId: null, // Background calculation job being polled
+    progressStream: null, // EventSource of /progress_stream
+    wellTimings: {} // Last per-well timing { label: { well: event } } from the progress stream
 };
 
 // Mock data untuk testing ketika backend tidak tersedia
@@ -750,6 +755,27 @@ function setupAnalysisTools() {
     });
 }
 
+// Backend workspace of this browser tab: derived columns and the selected
+// dataset are kept per session id, so analysts do not overwrite each other
+function getSessionId() {
+    var key = 'wellLogSessionId';
+    var id = null;
+    try {
+        id = window.sessionStorage.getItem(key);
+    } catch (e) {
+        id = appState.sessionId || null;
+    }
+    if (!id) {
+        id = Date.now().toString(36) + '-' + Math.random().toString(36).slice(2, 10);
+        try {
+            window.sessionStorage.setItem(key, id);
+        } catch (e) {
+            appState.sessionId = id;
+        }
+    }
+    return id;
+}
+
 // Improved fetchJson with Dataiku backend URL support, better error handling, and fallback
 function fetchJson(endpoint, options) {
     options = options || {};
@@ -757,6 +783,7 @@ function fetchJson(endpoint, options) {
     var defaultOptions = {
         headers: {
             'Content-Type': 'application/json',
+            'X-Session-Id': getSessionId()
         },
         credentials: 'include'
     };
@@ -1202,7 +1229,8 @@ function loadWellPlot(wellName) {
     
     // Prepare request data with structure context
     var requestData = {
-        well_name: wellName
+        well_name: wellName,
+        max_points: plotMaxPoints()
     };
     
     // Add structure context if available
@@ -1238,7 +1266,7 @@ function loadWellPlot(wellName) {
                 layout: plotObject.layout || {}
             };
             
-            createPlot(plotObject);
+            createPlot(plotObject, { wellName: wellName, plotType: 'default' });
             
             var contextMsg = appState.currentStructure ? 
                 ' from ' + appState.currentStructure.structureName : '';
@@ -1504,8 +1532,129 @@ function clearIntervals() {
     updateBadges();
 }
 
+// Typed array decoding for figure payloads ({dtype, bdata, shape} from the backend)
+var TYPED_ARRAY_CTORS = {
+    f8: Float64Array, f4: Float32Array,
+    i4: Int32Array, u4: Uint32Array,
+    i2: Int16Array, u2: Uint16Array,
+    i1: Int8Array, u1: Uint8Array
+};
+
+function decodeTypedArray(spec) {
+    var Ctor = TYPED_ARRAY_CTORS[spec.dtype];
+    var binary = atob(spec.bdata);
+    var bytes = new Uint8Array(binary.length);
+    for (var i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    var values = new Ctor(bytes.buffer);
+    if (!spec.shape) return values;
+
+    // 2D arrays (e.g. heatmap z) become an array of row views
+    var dims = String(spec.shape).split(',').map(function(n) { return parseInt(n, 10); });
+    var rows = [];
+    for (var r = 0; r < dims[0]; r++) {
+        rows.push(values.subarray(r * dims[1], (r + 1) * dims[1]));
+    }
+    return rows;
+}
+
+function decodeFigureArrays(value) {
+    if (Array.isArray(value)) {
+        for (var i = 0; i < value.length; i++) {
+            value[i] = decodeFigureArrays(value[i]);
+        }
+        return value;
+    }
+    if (value && typeof value === 'object') {
+        if (typeof value.bdata === 'string' && TYPED_ARRAY_CTORS[value.dtype]) {
+            return decodeTypedArray(value);
+        }
+        Object.keys(value).forEach(function(key) {
+            value[key] = decodeFigureArrays(value[key]);
+        });
+    }
+    return value;
+}
+
+// Points per curve requested from the backend: min + max per pixel row of the
+// plot area (the backend decimates each curve to this many points)
+function plotMaxPoints() {
+    var plotArea = document.getElementById('plotArea');
+    var height = plotArea ? (plotArea.clientHeight || plotArea.getBoundingClientRect().height) : 0;
+    return Math.max(2 * Math.round(height || 1800), 1000);
+}
+
+// Depth window loading: after zoom/pan only the visible depth range (plus
+// half a window of padding on each side) is fetched again at full detail
+var DEPTH_WINDOW_DEBOUNCE_MS = 250;
+var depthWindowTimer = null;
+var depthWindowRequestId = 0;
+
+function getRelayoutDepthRange(eventData) {
+    if (eventData['yaxis.range[0]'] !== undefined && eventData['yaxis.range[1]'] !== undefined) {
+        return [Number(eventData['yaxis.range[0]']), Number(eventData['yaxis.range[1]'])];
+    }
+    if (Array.isArray(eventData['yaxis.range'])) {
+        return [Number(eventData['yaxis.range'][0]), Number(eventData['yaxis.range'][1])];
+    }
+    return null;
+}
+
+function onPlotRelayout(eventData) {
+    if (!appState.plotView || !eventData) return;
+    var range = getRelayoutDepthRange(eventData);
+    // Autoscale/reset goes back to the whole well
+    if (!range && !eventData['yaxis.autorange']) return;
+
+    clearTimeout(depthWindowTimer);
+    depthWindowTimer = setTimeout(function() {
+        loadDepthWindow(range);
+    }, DEPTH_WINDOW_DEBOUNCE_MS);
+}
+
+function loadDepthWindow(range) {
+    var plotArea = document.getElementById('plotArea');
+    var view = appState.plotView;
+    if (!plotArea || !view) return;
+
+    var requestId = ++depthWindowRequestId;
+    var requestData = {
+        well: view.wellName,
+        plot_type: view.plotType,
+        resolution: plotMaxPoints()
+    };
+    if (range) {
+        var top = Math.min(range[0], range[1]);
+        var bottom = Math.max(range[0], range[1]);
+        var padding = (bottom - top) / 2;
+        requestData.top = top - padding;
+        requestData.bottom = bottom + padding;
+        requestData.resolution = 2 * plotMaxPoints();
+    }
+
+    fetchJson('/get_depth_window', {
+        method: 'POST',
+        body: JSON.stringify(requestData)
+    })
+    .then(function(response) {
+        // A newer zoom/pan already superseded this request
+        if (requestId !== depthWindowRequestId || appState.plotView !== view) return;
+        if (response.status !== 'success' || !response.figure) {
+            console.warn('Depth window not loaded:', response.message);
+            return;
+        }
+        // Keep the current layout so the user's zoom stays where it is
+        var data = decodeFigureArrays(response.figure.data || []);
+        Plotly.react(plotArea, data, plotArea.layout);
+    })
+    .catch(function(error) {
+        console.error('Error loading depth window:', error);
+    });
+}
+
 // Plot Management Functions
-function createPlot(figureData) {
+function createPlot(figureData, view) {
     var plotArea = document.getElementById('plotArea');
     
     if (!plotArea) {
@@ -1515,10 +1664,13 @@ function createPlot(figureData) {
     
     // Clear existing content
     plotArea.innerHTML = '';
+    appState.plotView = view || null;
+    clearTimeout(depthWindowTimer);
     
     try {
         // Normalize layout to fit container height
         figureData = figureData || { data: [], layout: {} };
+        figureData.data = decodeFigureArrays(figureData.data || []);
         figureData.layout = figureData.layout || {};
         // Remove any fixed width/height from backend
         if (figureData.layout.height) delete figureData.layout.height;
@@ -1556,6 +1708,7 @@ function createPlot(figureData) {
                 }
             }
             window.addEventListener('resize', handleResize);
+            plotArea.on('plotly_relayout', onPlotRelayout);
         });
         console.log('Plot created successfully');
     } catch (error) {
@@ -1671,6 +1824,15 @@ function submitCalculationParameters() {
         params: params
     };
     
+    // Limit the run to the selected wells / marker intervals so a parameter
+    // tweak does not reprocess the whole field
+    if (appState.selectedWells.length > 0) {
+        requestData.wells = appState.selectedWells;
+    }
+    if (appState.selectedIntervals.length > 0 && appState.currentCalculationType !== 'normalization') {
+        requestData.intervals = appState.selectedIntervals;
+    }
+    
     // Add structure context if available
     if (appState.currentStructure) {
         requestData.structure_context = appState.currentStructure;
@@ -1678,10 +1840,7 @@ function submitCalculationParameters() {
     
     setIsLoading(true);
     
-    fetchJson('/run_calculation_endpoint', {
-        method: 'POST',
-        body: JSON.stringify(requestData)
-    })
+    runCalculationJob(requestData)
     .then(function(response) {
         if (response.status === 'success') {
             showSuccess(response.message);
@@ -1754,7 +1913,8 @@ function loadModule(moduleName) {
 function handleLogPlot(wellName) {
     var requestData = {
         calculation_type: 'default',
-        well_name: wellName
+        well_name: wellName,
+        max_points: plotMaxPoints()
     };
     
     // Add structure context if available
@@ -1768,7 +1928,7 @@ function handleLogPlot(wellName) {
     })
     .then(function(response) {
         if (response.status === 'success' && response.figure) {
-            createPlot(response.figure);
+            createPlot(response.figure, { wellName: wellName, plotType: 'default' });
             showSuccess('Log plot created for ' + wellName);
         } else {
             throw new Error(response.message || 'Failed to create log plot');
@@ -1856,10 +2016,7 @@ function handleVshDnCalculation() {
         requestData.structure_context = appState.currentStructure;
     }
     
-    fetchJson('/run_calculation_endpoint', {
-        method: 'POST',
-        body: JSON.stringify(requestData)
-    })
+    runCalculationJob(requestData)
     .then(function(response) {
         if (response.status === 'success') {
             showSuccess('VSH-DN calculation completed');
@@ -1895,10 +2052,7 @@ function handleSwSimandouxCalculation() {
         requestData.structure_context = appState.currentStructure;
     }
     
-    fetchJson('/run_calculation_endpoint', {
-        method: 'POST',
-        body: JSON.stringify(requestData)
-    })
+    runCalculationJob(requestData)
     .then(function(response) {
         if (response.status === 'success') {
             showSuccess('SW Simandoux calculation completed');
@@ -1920,12 +2074,152 @@ function handleHistogram() {
     hideLoading();
 }
 
+// Calculations run as backend jobs: start one, poll its per-well progress
+// and resolve with the calculation result once it has finished
+var JOB_POLL_INTERVAL_MS = 1000;
+
+function formatJobProgress(job) {
+    var progress = job.progress || {};
+    var text = (job.kind || 'Calculation') + ': ' + job.job_status;
+    if (progress.wells_total) {
+        text += ' (' + progress.wells_done + '/' + progress.wells_total + ' wells';
+        if (progress.current_well) {
+            text += ', ' + progress.current_well;
+        }
+        text += ')';
+    }
+    return text;
+}
+
+function pollJob(jobId) {
+    return new Promise(function(resolve, reject) {
+        function poll() {
+            fetchJson('/job_status', {
+                method: 'POST',
+                body: JSON.stringify({ job_id: jobId })
+            })
+            .then(function(job) {
+                if (job.status !== 'success') {
+                    throw new Error(job.message || 'Job status unavailable');
+                }
+                // The progress stream gives richer per-well status when connected
+                if (!isProgressStreamOpen()) {
+                    updateStatus(formatJobProgress(job));
+                }
+                if (['completed', 'failed', 'cancelled'].indexOf(job.job_status) === -1) {
+                    setTimeout(poll, JOB_POLL_INTERVAL_MS);
+                    return;
+                }
+                return fetchJson('/job_result', {
+                    method: 'POST',
+                    body: JSON.stringify({ job_id: jobId })
+                }).then(resolve);
+            })
+            .catch(reject);
+        }
+        poll();
+    });
+}
+
+// Live per-well progress (well index, elapsed time, rows/s) pushed by the
+// backend as server-sent events; EventSource reconnects on its own
+function isProgressStreamOpen() {
+    return !!appState.progressStream && appState.progressStream.readyState === 1;
+}
+
+function formatProgressEvent(event) {
+    var text = event.label + ': ';
+    if (event.event === 'well_start') {
+        return text + event.well + ' (' + event.index + '/' + event.total + ')';
+    }
+    if (event.event === 'well_done') {
+        text += event.well + ' done (' + event.index + '/' + event.total + ') in ' +
+            event.well_elapsed.toFixed(2) + ' s';
+        if (event.rows_per_s) {
+            text += ', ' + Math.round(event.rows_per_s).toLocaleString() + ' rows/s';
+        }
+        return event.error ? text + ' - ' + event.error : text;
+    }
+    if (event.event === 'done') {
+        text += event.done + ' wells in ' + event.elapsed.toFixed(1) + ' s';
+        if (event.overall_rows_per_s) {
+            text += ' (' + Math.round(event.overall_rows_per_s).toLocaleString() + ' rows/s)';
+        }
+        return text;
+    }
+    return text + 'started';
+}
+
+function openProgressStream() {
+    if (typeof window === 'undefined' || typeof window.EventSource === 'undefined' || appState.progressStream) {
+        return;
+    }
+    var useDataiku = window.dataiku && typeof window.dataiku.getWebAppBackendUrl === 'function';
+    var url = useDataiku ? window.dataiku.getWebAppBackendUrl('/progress_stream') : '/progress_stream';
+    url += (url.indexOf('?') === -1 ? '?' : '&') + 'session_id=' + encodeURIComponent(getSessionId());
+
+    var stream = new EventSource(url);
+    stream.addEventListener('progress', function(message) {
+        var event;
+        try {
+            event = JSON.parse(message.data);
+        } catch (e) {
+            return;
+        }
+        if (event.event === 'well_done') {
+            var timings = appState.wellTimings[event.label] = appState.wellTimings[event.label] || {};
+            timings[event.well] = event;
+            console.log('[progress] ' + formatProgressEvent(event));
+        }
+        updateStatus(formatProgressEvent(event));
+    });
+    stream.onerror = function() {
+        console.warn('Progress stream interrupted; the browser will reconnect');
+    };
+    appState.progressStream = stream;
+}
+
+function runCalculationJob(requestData) {
+    return fetchJson('/run_calculation_endpoint', {
+        method: 'POST',
+        body: JSON.stringify(requestData)
+    })
+    .then(function(response) {
+        // Mock/synchronous responses carry the result directly
+        if (response.status !== 'success' || !response.job_id) {
+            return response;
+        }
+        appState.currentJobId = response.job_id;
+        return pollJob(response.job_id);
+    })
+    .finally(function() {
+        appState.currentJobId = null;
+    });
+}
+
+function cancelCurrentJob() {
+    if (!appState.currentJobId) {
+        return Promise.resolve(null);
+    }
+    return fetchJson('/cancel_job', {
+        method: 'POST',
+        body: JSON.stringify({ job_id: appState.currentJobId })
+    })
+    .then(function(job) {
+        if (job.status === 'success') {
+            updateStatus(formatJobProgress(job));
+        }
+        return job;
+    });
+}
+
 function createCalculationPlot(calculationType) {
     var wellName = appState.selectedWells.length > 0 ? appState.selectedWells[0] : null;
     
     var requestData = {
         calculation_type: calculationType,
-        well_name: wellName
+        well_name: wellName,
+        max_points: plotMaxPoints()
     };
     
     // Add structure context if available
@@ -1939,7 +2233,7 @@ function createCalculationPlot(calculationType) {
     })
     .then(function(response) {
         if (response.status === 'success' && response.figure) {
-            createPlot(response.figure);
+            createPlot(response.figure, wellName ? { wellName: wellName, plotType: calculationType } : null);
         } else {
             console.error('Failed to create calculation plot:', response.message);
         }
@@ -2055,6 +2349,7 @@ function initializeApp() {
             .then(function(response) {
                 console.log('Backend connection established:', response);
                 setupEventListeners();
+                openProgressStream();
                 updateStatus('Ready');
             })
             .catch(function(error) {
@@ -2104,6 +2399,13 @@ function setupEventListeners() {
     // Setup analysis tools
     setupAnalysisTools();
     
+    // Escape cancels the running calculation job
+    document.addEventListener('keydown', function(event) {
+        if (event.key === 'Escape' && appState.currentJobId) {
+            cancelCurrentJob();
+        }
+    });
+    
     // Select All checkboxes
     var selectAllWells = document.getElementById('selectAllWells');
     if (selectAllWells) {
@@ -2,11 +2,14 @@
 try:
     from dataiku.customwebapp import *  # provides `app` in Dataiku runtime
 except Exception:
-    from flask import Flask, request  # type: ignore
+    from flask import Flask, Response, request, stream_with_context  # type: ignore
     app = Flask(__name__)  # minimal fallback so module can import outside Dataiku
 else:
-    from flask import request  # type: ignore
+    from flask import Response, request, stream_with_context  # type: ignore
 import json
+import logging
+import os
+import tempfile
 import traceback
 from datetime import datetime
 import dataiku
@@ -15,6 +18,14 @@ import numpy as np
 from dataiku import pandasutils as pdu
 from scipy.stats import linregress
 
+from standardwebappv1.services.calc_context import CalculationContext
+from standardwebappv1.services.figure_serialization import dumps_figure
+from standardwebappv1.services.job_queue import COMPLETED, JobCancelled, JobQueue
+from standardwebappv1.services.progress import ProgressBroker, ProgressTracker, sse_message
+from standardwebappv1.services.result_cache import LRUCache, params_hash
+from standardwebappv1.services.session_workspace import SessionWorkspaces, SharedDatasets
+from standardwebappv1.services.well_store import PROJECTION_COLUMNS, ParquetWellCache, WellDataStore
+
 # Import your services (assuming they exist)
 try:
     from standardwebappv1.services.vsh_calculation import calculate_vsh_from_gr
@@ -23,6 +34,7 @@ try:
     from standardwebappv1.services.rgsa import process_all_wells_rgsa
     from standardwebappv1.services.dgsa import process_all_wells_dgsa
     from standardwebappv1.services.ngsa import process_all_wells_ngsa
+    from standardwebappv1.services.qc_service import run_full_qc_pipeline
     from standardwebappv1.services.rgbe_rpbe import process_rgbe_rpbe
     from standardwebappv1.services.rt_r0 import process_rt_r0
     from standardwebappv1.services.swgrad import process_swgrad
@@ -51,7 +63,7 @@ except ImportError as e:
     def normalize_xover(df, col1, col2):
         return df
     
-    def plot_log_default(df, df_marker=None, df_well_marker=None):
+    def plot_log_default(df, df_marker=None, df_well_marker=None, max_points=None):
         import plotly.graph_objects as go
         from plotly.subplots import make_subplots
         
@@ -75,35 +87,75 @@ except ImportError as e:
         return fig
 
     # Minimal placeholders for plotting functions referenced below
-    def plot_vsh_linear(df=None, df_marker=None, df_well_marker=None):
+    def plot_vsh_linear(df=None, df_marker=None, df_well_marker=None, max_points=None):
         return plot_log_default(df)
 
-    def plot_phie_den(df=None, df_marker=None, df_well_marker=None):
+    def plot_phie_den(df=None, df_marker=None, df_well_marker=None, max_points=None):
         return plot_log_default(df)
 
-    def plot_gsa_main(df=None):
+    def plot_gsa_main(df=None, max_points=None):
         return plot_log_default(df)
 
-    def plot_normalization(df=None, df_marker=None, df_well_marker=None):
+    def plot_normalization(df=None, df_marker=None, df_well_marker=None, max_points=None):
         return plot_log_default(df)
 
-    def plot_sw_indo(df=None, df_marker=None, df_well_marker=None):
+    def plot_sw_indo(df=None, df_marker=None, df_well_marker=None, max_points=None):
         return plot_log_default(df)
 
-    def plot_rwa_indo(df=None, df_marker=None, df_well_marker=None):
+    def plot_rwa_indo(df=None, df_marker=None, df_well_marker=None, max_points=None):
         return plot_log_default(df)
 
-    def plot_smoothing(df=None, df_marker=None, df_well_marker=None):
+    def plot_smoothing(df=None, df_marker=None, df_well_marker=None, max_points=None):
         return plot_log_default(df)
 
+# Calculations whose result for a well only depends on that well's rows;
+# background jobs run them one well at a time (progress + cancel per well)
+PER_WELL_CALCULATIONS = {"vsh", "porosity", "gsa", "sw", "swgrad", "dns_dnsv"}
+# Calculations whose service runs all wells in parallel and reports per-well
+# progress itself (see well_executor.process_wells)
+SELF_REPORTING_CALCULATIONS = {"rgsa", "ngsa", "dgsa"}
+# Worker processes of one self-reporting calculation (params "n_jobs"
+# overrides); bounded because several sessions may run jobs at once
+DEFAULT_WELL_WORKERS = min(4, os.cpu_count() or 1)
+
+# Points per curve sent to the browser: min/max of ~2000 depth buckets,
+# about one bucket per pixel row of a tall log plot
+DEFAULT_PLOT_MAX_POINTS = 4000
+
 class WellLogAnalysis:
-    def __init__(self, project_key=None):
-        """Initialize with optional project key and auto-load fix_pass_qc dataset"""
+    def __init__(self, project_key=None, lazy_load=True, datasets=None,
+                 result_cache=None, figure_cache=None, calculation_outputs=None):
+        """Initialize with optional project key and auto-load fix_pass_qc dataset.
+
+        With lazy_load=True only WELL_NAME/MARKER/DEPTH are read at start-up;
+        log columns are fetched per well through a local Parquet cache.
+
+        `datasets` (SharedDatasets), the two caches and the calculation
+        output registry may be shared between session workspaces: base
+        datasets are then loaded once and every instance works on its own
+        fork of them.
+        """
         self.project_key = project_key
         if project_key:
             self.project = dataiku.Project(project_key)
+        self.lazy_load = lazy_load
+        self.datasets = datasets if datasets is not None else SharedDatasets()
+        self.base_dataset = None  # SharedDataset this workspace was forked from
         self.current_dataset = None
-        self.current_well_data = None
+        self.dataset_version = 0  # generation of the loaded base dataset
+        self.well_store = None  # WellDataStore: partisi Arrow per WELL_NAME
+        self.depth_pyramids = None  # WellPyramids: min/max/mean per depth bucket, per well
+        # Derived columns per (dataset, version, well, calculation, params, input versions)
+        self.result_cache = result_cache if result_cache is not None else LRUCache(max_bytes=512 * 1024 * 1024)
+        # Serialized figure JSON per (dataset, version, well, plot type, column versions)
+        self.figure_cache = figure_cache if figure_cache is not None else LRUCache(max_bytes=256 * 1024 * 1024)
+        # Column versions are unique across forks, so stale figures can never
+        # be hit; a shared cache leaves them to LRU eviction instead of
+        # dropping entries other sessions are still viewing
+        self._owns_figure_cache = figure_cache is None
+        # (calculation_type, params hash) -> columns it writes; shared along
+        # with the result cache, whose keys depend on it
+        self._calculation_outputs = calculation_outputs if calculation_outputs is not None else {}
         self.available_datasets = []
         
         # Auto-load the fix_pass_qc dataset
@@ -112,11 +164,10 @@ class WellLogAnalysis:
     # -----------------------------
     # Internal helpers
     # -----------------------------
-    def _normalize_series(self, s):
+    def _normalize_series(self, s, bounds=None):
         try:
             s = pd.to_numeric(s, errors='coerce')
-            min_v = s.min()
-            max_v = s.max()
+            min_v, max_v = bounds if bounds is not None else (s.min(), s.max())
             if pd.isna(min_v) or pd.isna(max_v) or max_v == min_v:
                 return pd.Series(np.zeros(len(s)), index=s.index)
             return (s - min_v) / (max_v - min_v)
@@ -124,29 +175,33 @@ class WellLogAnalysis:
             # Fallback to zeros on error to avoid breaking plots
             return pd.Series(np.zeros(len(s)), index=s.index)
 
-    def _ensure_crossplot_norms(self, df):
+    def _ensure_crossplot_norms(self, df, bounds=None):
         """Ensure columns expected by plotting_service data_col exist.
         This covers pairs: RT-RHOB, NPHI-RHOB, RT-GR.
+
+        bounds ({column: (min, max)}) normalizes a partial frame, such as a
+        depth window, against the whole well instead of the frame itself.
         """
-        new_df = df.copy()
+        bounds = bounds or {}
+        new_df = df.copy(deep=False)
         # RT vs RHOB -> expects RT_NORM, RHOB_NORM_RT
         if 'RT' in new_df.columns and 'RHOB' in new_df.columns:
             if 'RT_NORM' not in new_df.columns:
-                new_df['RT_NORM'] = self._normalize_series(new_df['RT'])
+                new_df['RT_NORM'] = self._normalize_series(new_df['RT'], bounds.get('RT'))
             if 'RHOB_NORM_RT' not in new_df.columns:
-                new_df['RHOB_NORM_RT'] = self._normalize_series(new_df['RHOB'])
+                new_df['RHOB_NORM_RT'] = self._normalize_series(new_df['RHOB'], bounds.get('RHOB'))
         # NPHI vs RHOB -> expects NPHI_NORM, RHOB_NORM_NPHI
         if 'NPHI' in new_df.columns and 'RHOB' in new_df.columns:
             if 'NPHI_NORM' not in new_df.columns:
-                new_df['NPHI_NORM'] = self._normalize_series(new_df['NPHI'])
+                new_df['NPHI_NORM'] = self._normalize_series(new_df['NPHI'], bounds.get('NPHI'))
             if 'RHOB_NORM_NPHI' not in new_df.columns:
-                new_df['RHOB_NORM_NPHI'] = self._normalize_series(new_df['RHOB'])
+                new_df['RHOB_NORM_NPHI'] = self._normalize_series(new_df['RHOB'], bounds.get('RHOB'))
         # RT vs GR -> expects RT_NORM (already above), GR_NORM_RT
         if 'RT' in new_df.columns and 'GR' in new_df.columns:
             if 'RT_NORM' not in new_df.columns:
-                new_df['RT_NORM'] = self._normalize_series(new_df['RT'])
+                new_df['RT_NORM'] = self._normalize_series(new_df['RT'], bounds.get('RT'))
             if 'GR_NORM_RT' not in new_df.columns:
-                new_df['GR_NORM_RT'] = self._normalize_series(new_df['GR'])
+                new_df['GR_NORM_RT'] = self._normalize_series(new_df['GR'], bounds.get('GR'))
         return new_df
     
     def auto_load_default_dataset(self):
@@ -181,20 +236,54 @@ class WellLogAnalysis:
         except Exception as e:
             return {"status": "error", "message": f"Error getting datasets: {str(e)}"}
     
-    def select_dataset(self, dataset_name):
+    def _build_lazy_store(self, dataset, dataset_name):
+        """Read only the projection columns; log columns load on demand per well.
+
+        Returns (store, cleanup); cleanup removes the local Parquet cache.
+        """
+        schema_columns = [col['name'] for col in dataset.read_schema()]
+        projection = [col for col in PROJECTION_COLUMNS if col in schema_columns]
+        df_projection = dataset.get_dataframe(columns=projection)
+
+        cache_dir = tempfile.mkdtemp(prefix=f'standardwebappv1_{dataset_name}_')
+        cache = ParquetWellCache(cache_dir)
+
+        def load_wells(wells):
+            # First access streams the dataset once into per-well Parquet files
+            if not cache.is_built:
+                cache.build(dataset.iter_dataframes(chunksize=100000))
+            return cache.read_wells(wells)
+
+        return WellDataStore.from_projection(df_projection, load_wells, schema_columns), cache.clear
+
+    def _load_base_store(self, dataset_name, lazy):
+        """(store, cleanup) of a base dataset shared by all sessions"""
+        dataset = dataiku.Dataset(dataset_name)
+        if lazy:
+            return self._build_lazy_store(dataset, dataset_name)
+        return WellDataStore.from_dataframe(dataset.get_dataframe()), None
+
+    def select_dataset(self, dataset_name, lazy=None):
         """Select a dataset and load its basic info"""
         try:
-            dataset = dataiku.Dataset(dataset_name)
-            df = dataset.get_dataframe()
+            lazy = self.lazy_load if lazy is None else lazy
             
-            # Store current dataset info
+            # Base data is loaded once per dataset (partitioned per well) and
+            # shared; this workspace only gets a fork for its derived columns
+            base = self.datasets.get((dataset_name, lazy), dataset_name,
+                                     lambda: self._load_base_store(dataset_name, lazy))
+            store, pyramids = base.workspace()
+            self.base_dataset = base
             self.current_dataset = dataset_name
-            self.current_well_data = df
+            self.dataset_version = base.generation
+            self.well_store = store
+            # Level-of-detail pyramids; a lazy store builds them per well on first plot
+            self.depth_pyramids = pyramids
             
             # Get basic info
-            wells = df['WELL_NAME'].unique().tolist() if 'WELL_NAME' in df.columns else []
-            markers = df['MARKER'].unique().tolist() if 'MARKER' in df.columns else []
-            columns = df.columns.tolist()
+            wells = self.well_store.wells
+            markers = self.well_store.unique_values('MARKER')
+            columns = self.well_store.columns
             
             return {
                 "status": "success",
@@ -202,7 +291,7 @@ class WellLogAnalysis:
                 "wells": wells,
                 "markers": markers,
                 "columns": columns,
-                "total_rows": len(df),
+                "total_rows": self.well_store.num_rows,
                 "message": f"Dataset {dataset_name} selected successfully"
             }
         except Exception as e:
@@ -211,13 +300,13 @@ class WellLogAnalysis:
     def get_well_list(self):
         """Get list of wells from current dataset"""
         try:
-            if self.current_well_data is None:
+            if self.well_store is None:
                 return {"status": "error", "message": "No dataset selected"}
             
-            if 'WELL_NAME' not in self.current_well_data.columns:
+            if 'WELL_NAME' not in self.well_store.columns:
                 return {"status": "error", "message": "WELL_NAME column not found in dataset"}
             
-            wells = self.current_well_data['WELL_NAME'].unique().tolist()
+            wells = self.well_store.wells
             return {
                 "status": "success",
                 "wells": wells,
@@ -226,20 +315,77 @@ class WellLogAnalysis:
         except Exception as e:
             return {"status": "error", "message": f"Error getting well list: {str(e)}"}
     
-    def create_log_plot(self, well_name):
-        """Create log plot for a specific well"""
+    # -----------------------------
+    # Figure cache helpers
+    # -----------------------------
+    def _serialize_figure(self, fig):
+        """Serialize a Plotly figure to JSON with numeric arrays as base64 typed arrays.
+
+        NaN samples stay NaN inside the typed arrays (plotly.js draws them as
+        gaps, like null); only plain JSON values turn NaN into null.
+        """
+        return dumps_figure(fig)
+
+    def _figure_cache_key(self, well_name, plot_type, max_points=None):
+        """Key changes whenever any column of the well is rewritten"""
+        if not well_name or not self.well_store.has_well(well_name):
+            return None
+        versions = tuple(sorted(self.well_store.column_versions(well_name).items()))
+        return (self.current_dataset, self.dataset_version, well_name, plot_type, versions, max_points)
+
+    @staticmethod
+    def _plot_max_points(max_points):
+        """Points per curve for a plot request; <= 0 sends every sample"""
+        if max_points is None:
+            return DEFAULT_PLOT_MAX_POINTS
+        max_points = int(max_points)
+        return max_points if max_points > 0 else None
+
+    def _invalidate_figures(self, wells):
+        """Drop cached figures of wells whose columns were changed"""
+        if not self._owns_figure_cache:
+            return
+        wells = set(wells)
+        self.figure_cache.invalidate(lambda key: key[2] in wells)
+
+    def _well_plot_frame(self, well_name, max_points=None, top=None, bottom=None):
+        """Rows to plot for a well (optionally a depth window).
+
+        The coarsest pyramid level that still gives max_points per curve is
+        used when the raw rows would exceed it; otherwise raw rows are read.
+        """
+        frame = self.depth_pyramids.frame(well_name, max_points, top, bottom) if self.depth_pyramids is not None else None
+        if frame is None:
+            if top is None and bottom is None:
+                return self.well_store.get_well(well_name)
+            frame = self.well_store.depth_window(well_name, top, bottom)
+        if top is not None or bottom is not None:
+            bounds = {col: self.well_store.column_range(col, [well_name])
+                      for col in ['RT', 'RHOB', 'NPHI', 'GR'] if col in frame.columns}
+            frame = self._ensure_crossplot_norms(frame, bounds)
+        return frame
+
+    def create_log_plot(self, well_name, max_points=None):
+        """Create log plot for a specific well, decimated to max_points per curve"""
         try:
             print(f"Creating log plot for well: {well_name}")
             
-            if self.current_well_data is None:
+            if self.well_store is None:
                 return {"status": "error", "message": "No dataset selected"}
             
-            # Get well data
-            well_data = self.current_well_data[self.current_well_data['WELL_NAME'] == well_name]
+            # Repeat views are a single cache lookup
+            max_points = self._plot_max_points(max_points)
+            cache_key = self._figure_cache_key(well_name, "default", max_points)
+            figure_json = self.figure_cache.get(cache_key) if cache_key else None
+            if figure_json is not None:
+                return {"status": "success", "figure_json": figure_json, "well_name": well_name}
+            
+            # Get well data (single partition lookup)
+            well_data = self._well_plot_frame(well_name, max_points)
             print(f"Found {len(well_data)} rows for well {well_name}")
             
             if well_data.empty:
-                available_wells = self.current_well_data['WELL_NAME'].unique().tolist()
+                available_wells = self.well_store.wells
                 return {"status": "error", "message": f"No data found for well {well_name}. Available wells: {available_wells}"}
             
             # Check if we have essential columns
@@ -257,12 +403,17 @@ class WellLogAnalysis:
             fig = plot_log_default(
                 df=well_data_normalized,
                 df_marker=df_marker,
-                df_well_marker=well_data_normalized
+                df_well_marker=well_data_normalized,
+                max_points=max_points
             )
             
+            figure_json = self._serialize_figure(fig)
+            if cache_key:
+                self.figure_cache.put(cache_key, figure_json)
+            
             return {
                 "status": "success",
-                "figure": fig.to_dict(),
+                "figure_json": figure_json,
                 "well_name": well_name
             }
         except Exception as e:
@@ -273,14 +424,14 @@ class WellLogAnalysis:
     def get_markers_list(self):
         """Get list of markers from current dataset"""
         try:
-            if self.current_well_data is None:
+            if self.well_store is None:
                 return {"status": "error", "message": "No dataset selected"}
             
-            if 'MARKER' not in self.current_well_data.columns:
+            if 'MARKER' not in self.well_store.columns:
                 return {"status": "error", "message": "MARKER column not found"}
             
             # Get unique markers and filter out NaN/null values
-            markers_series = self.current_well_data['MARKER'].dropna().unique()
+            markers_series = self.well_store.unique_values('MARKER')
             markers = [str(marker) for marker in markers_series if pd.notna(marker) and str(marker).strip() != '']
             
             return {
@@ -324,6 +475,30 @@ class WellLogAnalysis:
                         {"name": "min_samples", "type": "int", "default": 10, "label": "Minimum Samples", "min": 5, "max": 50}
                     ]
                 },
+                "rgsa": {
+                    "title": "RGSA Baseline Parameters",
+                    "parameters": [
+                        {"name": "window_size", "type": "int", "default": 106, "label": "Window Size", "min": 30, "max": 500},
+                        {"name": "step", "type": "int", "default": 20, "label": "Step", "min": 1, "max": 200},
+                        {"name": "min_points_in_window", "type": "int", "default": 30, "label": "Minimum Points in Window", "min": 5, "max": 200}
+                    ]
+                },
+                "ngsa": {
+                    "title": "NGSA Baseline Parameters",
+                    "parameters": [
+                        {"name": "window_size", "type": "int", "default": 106, "label": "Window Size", "min": 30, "max": 500},
+                        {"name": "step", "type": "int", "default": 20, "label": "Step", "min": 1, "max": 200},
+                        {"name": "min_points_in_window", "type": "int", "default": 30, "label": "Minimum Points in Window", "min": 5, "max": 200}
+                    ]
+                },
+                "dgsa": {
+                    "title": "DGSA Baseline Parameters",
+                    "parameters": [
+                        {"name": "window_size", "type": "int", "default": 106, "label": "Window Size", "min": 30, "max": 500},
+                        {"name": "step", "type": "int", "default": 20, "label": "Step", "min": 1, "max": 200},
+                        {"name": "min_points_in_window", "type": "int", "default": 30, "label": "Minimum Points in Window", "min": 5, "max": 200}
+                    ]
+                },
                 "sw": {
                     "title": "Water Saturation Calculation Parameters",
                     "parameters": [
@@ -369,25 +544,26 @@ class WellLogAnalysis:
 
     def get_available_columns(self):
         try:
-            if self.current_well_data is None:
+            if self.well_store is None:
                 return {"status": "error", "message": "No dataset selected"}
-            return {"status": "success", "columns": self.current_well_data.columns.tolist()}
+            return {"status": "success", "columns": self.well_store.columns}
         except Exception as e:
             return {"status": "error", "message": f"Error getting columns: {str(e)}"}
 
     def get_dataset_info(self):
         try:
-            if self.current_well_data is None:
+            if self.well_store is None:
                 return {"status": "error", "message": "No dataset selected"}
+            depth_min, depth_max = self.well_store.column_range('DEPTH')
             info = {
                 "dataset_name": self.current_dataset,
-                "total_rows": len(self.current_well_data),
-                "columns": self.current_well_data.columns.tolist(),
-                "wells": self.current_well_data['WELL_NAME'].unique().tolist() if 'WELL_NAME' in self.current_well_data.columns else [],
-                "markers": self.current_well_data['MARKER'].unique().tolist() if 'MARKER' in self.current_well_data.columns else [],
+                "total_rows": self.well_store.num_rows,
+                "columns": self.well_store.columns,
+                "wells": self.well_store.wells,
+                "markers": self.well_store.unique_values('MARKER'),
                 "depth_range": {
-                    "min": float(self.current_well_data['DEPTH'].min()) if 'DEPTH' in self.current_well_data.columns else None,
-                    "max": float(self.current_well_data['DEPTH'].max()) if 'DEPTH' in self.current_well_data.columns else None
+                    "min": float(depth_min) if depth_min is not None else None,
+                    "max": float(depth_max) if depth_max is not None else None
                 }
             }
             return {"status": "success", "info": info}
@@ -396,12 +572,15 @@ class WellLogAnalysis:
 
     def validate_calculation_requirements(self, calculation_type):
         try:
-            if self.current_well_data is None:
+            if self.well_store is None:
                 return {"status": "error", "message": "No dataset selected"}
             requirements = {
                 "vsh": ["GR"],
                 "porosity": ["NPHI", "RHOB"],
                 "gsa": ["GR", "RT", "NPHI", "RHOB"],
+                "rgsa": ["DEPTH", "GR", "RT"],
+                "ngsa": ["DEPTH", "GR", "NPHI"],
+                "dgsa": ["DEPTH", "GR", "RHOB"],
                 "sw": ["RT", "PHIE"],
                 "rwa": ["RT", "PHIE", "VSH"],
                 "normalization": ["GR", "MARKER"]
@@ -409,7 +588,8 @@ class WellLogAnalysis:
             if calculation_type not in requirements:
                 return {"status": "error", "message": f"Unknown calculation type: {calculation_type}"}
             required_cols = requirements[calculation_type]
-            missing = [c for c in required_cols if c not in self.current_well_data.columns]
+            available = self.well_store.columns
+            missing = [c for c in required_cols if c not in available]
             if missing:
                 return {
                     "status": "error",
@@ -427,9 +607,9 @@ class WellLogAnalysis:
 
     def save_results_to_new_dataset(self, dataset_name, data_dict=None):
         try:
-            if data_dict is None and self.current_well_data is None:
+            if data_dict is None and self.well_store is None:
                 return {"status": "error", "message": "No data to save"}
-            df_to_save = pd.DataFrame(data_dict) if data_dict else self.current_well_data
+            df_to_save = pd.DataFrame(data_dict) if data_dict else self.well_store.to_pandas()
             new_dataset = dataiku.Dataset(dataset_name)
             new_dataset.write_with_schema(df_to_save)
             return {
@@ -441,14 +621,61 @@ class WellLogAnalysis:
         except Exception as e:
             return {"status": "error", "message": f"Error saving dataset: {str(e)}"}
     
-    def run_calculation(self, calculation_type, params, output_dataset_name=None):
-        """Run calculation with parameters on current dataset"""
+    def run_calculation(self, calculation_type, params, output_dataset_name=None,
+                        wells=None, intervals=None, progress=None):
+        """Run calculation with parameters on current dataset.
+
+        `wells` and/or `intervals` (marker names) restrict the run to those
+        partitions/rows; results are merged back in place and everything else
+        is left untouched. `progress` receives the per-well events of
+        calculations in SELF_REPORTING_CALCULATIONS.
+        """
         try:
-            if self.current_well_data is None:
+            if self.well_store is None:
                 return {"status": "error", "message": "No dataset selected"}
             
-            # Make a copy of current data
-            df = self.current_well_data.copy()
+            if wells:
+                unknown = [w for w in wells if not self.well_store.has_well(w)]
+                if unknown:
+                    return {"status": "error", "message": f"Unknown wells: {unknown}"}
+            
+            # Result cache: every well in scope must hit. Interval-scoped runs
+            # are not cached because they only rewrite part of a well.
+            scope_wells = list(wells) if wells else self.well_store.wells
+            use_cache = not intervals and bool(scope_wells)
+            input_versions = {}
+            if use_cache:
+                input_versions = {w: self.well_store.column_versions(w) for w in scope_wells}
+                entries = [self.result_cache.get(self._result_cache_key(
+                    w, calculation_type, params, input_versions[w])) for w in scope_wells]
+                if all(entry is not None for entry in entries):
+                    changed_columns = self._apply_cached_results(scope_wells, entries)
+                    self._invalidate_figures(scope_wells)
+                    self.depth_pyramids.refresh(scope_wells)
+                    return {
+                        "status": "success",
+                        "message": f"{calculation_type.upper()} calculation loaded from cache",
+                        "calculation_type": calculation_type,
+                        "rows_processed": sum(len(frame) for _, frame in entries),
+                        "changed_columns": changed_columns,
+                        "wells": scope_wells,
+                        "intervals": [],
+                        "cached": True
+                    }
+            
+            # Single working frame, projected to the columns the service
+            # reads; services add columns to it directly and only the columns
+            # they wrote are written back to the store. Self-reporting
+            # services filter intervals themselves and drop failed wells, so
+            # they get whole partitions; their rows are merged back on
+            # (WELL_NAME, DEPTH) and dropped wells are left unchanged.
+            self_reporting = calculation_type in SELF_REPORTING_CALCULATIONS
+            context = CalculationContext(self.well_store, wells=wells or None,
+                                         markers=None if self_reporting else intervals or None,
+                                         columns=self._calculation_inputs(calculation_type, params))
+            df = context.frame
+            if df.empty:
+                return {"status": "error", "message": "No rows in the selected wells/intervals"}
             
             # Run calculation based on type
             if calculation_type == "vsh":
@@ -457,6 +684,9 @@ class WellLogAnalysis:
                 result_df = self._run_porosity_calculation(df, params)
             elif calculation_type == "gsa":
                 result_df = self._run_gsa_calculation(df, params)
+            elif self_reporting:
+                result_df = self._run_gsa_baseline_calculation(calculation_type, df, params,
+                                                               intervals, progress)
             elif calculation_type == "rgbe_rpbe":
                 result_df = self._run_rgbe_rpbe_calculation(df, params)
             elif calculation_type == "rt_r0":
@@ -474,18 +704,93 @@ class WellLogAnalysis:
             else:
                 return {"status": "error", "message": f"Unknown calculation type: {calculation_type}"}
             
-            # Update current data
-            self.current_well_data = result_df
+            # Update current data with the delta only
+            delta = context.diff(result_df)
+            if use_cache:
+                # Entries hold the full output columns, not the store-relative
+                # delta, so replaying them restores this run's values whatever
+                # another parameter set wrote in between
+                outputs = self._calculation_outputs.setdefault(
+                    (calculation_type, params_hash(params)), set())
+                outputs.update(context.written_columns(delta))
+                cached_columns = None if delta.is_replacement else \
+                    [col for col in delta.result.columns if col in outputs]
+                for well, entry in context.split_by_well(delta, cached_columns).items():
+                    if well in input_versions:
+                        self.result_cache.put(self._result_cache_key(
+                            well, calculation_type, params, input_versions[well]), entry)
+            changed_columns = context.commit(delta)
+            if changed_columns:
+                changed_wells = context.wells if context.wells is not None else self.well_store.wells
+                self._invalidate_figures(changed_wells)
+                # Only the new/changed columns are re-summarized
+                self.depth_pyramids.refresh(changed_wells)
             
             return {
                 "status": "success",
                 "message": f"{calculation_type.upper()} calculation completed",
                 "calculation_type": calculation_type,
-                "rows_processed": len(result_df)
+                "rows_processed": delta.num_rows,
+                "changed_columns": changed_columns,
+                "wells": context.wells if context.wells is not None else self.well_store.wells,
+                "intervals": intervals or [],
+                "cached": False
             }
         except Exception as e:
             return {"status": "error", "message": f"Error running calculation: {str(e)}"}
     
+    @staticmethod
+    def _calculation_inputs(calculation_type, params):
+        """Store columns a calculation reads (None = all columns)."""
+        if calculation_type == "vsh":
+            return [params.get('input_log', 'GR')]
+        if calculation_type == "porosity":
+            return ['RHOB']
+        if calculation_type == "gsa":
+            return ['GR', 'RT', 'NPHI', 'RHOB']
+        if calculation_type == "sw":
+            return ['RT', 'PHIE']
+        if calculation_type == "normalization":
+            return [params.get('LOG_IN', 'GR')]
+        if calculation_type == "swgrad":
+            return ['VSH', 'PHIE', 'RT']
+        if calculation_type == "dns_dnsv":
+            return ['RHOB', 'NPHI', 'VSH', 'VSH_LINEAR']
+        return None
+    
+    def _result_cache_key(self, well_name, calculation_type, params, column_versions):
+        """Cache key; the columns this calculation writes are left out of the
+        input fingerprint so flipping between parameter sets still hits (the
+        entry carries their full values)."""
+        outputs = self._calculation_outputs.get((calculation_type, params_hash(params)), set())
+        inputs = tuple(sorted((col, version) for col, version in column_versions.items()
+                              if col not in outputs))
+        return (self.current_dataset, self.dataset_version, well_name,
+                calculation_type, params_hash(params), inputs)
+    
+    def _apply_cached_results(self, wells, entries):
+        """Write cached derived columns (or whole partitions) back to the store"""
+        changed = []
+        for well_name, (kind, frame) in zip(wells, entries):
+            if kind == 'replace':
+                self.well_store.set_well(well_name, frame)
+            else:
+                self.well_store.apply_columns(frame, [well_name])
+            changed.extend(col for col in frame.columns if col not in changed)
+        return changed
+    
+    def get_cache_stats(self):
+        """Hit/miss statistics of the calculation result and figure caches"""
+        return {
+            "status": "success",
+            "result_cache": self.result_cache.stats(),
+            "figure_cache": self.figure_cache.stats(),
+            "depth_pyramids": {
+                "wells": len(self.depth_pyramids) if self.depth_pyramids is not None else 0,
+                "bytes": self.depth_pyramids.nbytes if self.depth_pyramids is not None else 0
+            }
+        }
+    
     def _run_vsh_calculation(self, df, params):
         """Run VSH calculation"""
         try:
@@ -529,16 +834,41 @@ class WellLogAnalysis:
             if missing_cols:
                 raise ValueError(f"Missing required columns: {missing_cols}")
             
-            # Simple moving averages as GSA approximation
+            # Simple moving averages as GSA approximation (per well, so the
+            # window never spans two wells)
             window = params.get('window_size', 50)
-            df['RGSA'] = df['RT'].rolling(window=window, center=True).mean()
-            df['NGSA'] = df['NPHI'].rolling(window=window, center=True).mean()
-            df['DGSA'] = df['RHOB'].rolling(window=window, center=True).mean()
+            groups = df.groupby('WELL_NAME', sort=False) if 'WELL_NAME' in df.columns else None
+            for source, target in (('RT', 'RGSA'), ('NPHI', 'NGSA'), ('RHOB', 'DGSA')):
+                if groups is None:
+                    df[target] = df[source].rolling(window=window, center=True).mean()
+                else:
+                    df[target] = groups[source].transform(
+                        lambda s: s.rolling(window=window, center=True).mean())
             
             return df
         except Exception as e:
             raise Exception(f"GSA calculation error: {str(e)}")
 
+    def _run_gsa_baseline_calculation(self, calculation_type, df, params, intervals=None,
+                                      progress=None):
+        """Run the RGSA/NGSA/DGSA regression baseline over all wells in parallel"""
+        orchestrators = {
+            "rgsa": process_all_wells_rgsa,
+            "ngsa": process_all_wells_ngsa,
+            "dgsa": process_all_wells_dgsa,
+        }
+        try:
+            selected = list(intervals) if intervals else \
+                df['MARKER'].dropna().unique().tolist() if 'MARKER' in df.columns else []
+            result = orchestrators[calculation_type](
+                df, params, selected, n_jobs=int(params.get('n_jobs') or DEFAULT_WELL_WORKERS),
+                progress=progress)
+            if result is None:
+                raise ValueError("No well could be processed")
+            return result
+        except Exception as e:
+            raise Exception(f"{calculation_type.upper()} calculation error: {str(e)}")
+
     def _run_rgbe_rpbe_calculation(self, df, params):
         try:
             return process_rgbe_rpbe(df, params)
@@ -610,44 +940,96 @@ class WellLogAnalysis:
         except Exception as e:
             raise Exception(f"Normalization error: {str(e)}")
     
-    def create_plot_for_calculation(self, calculation_type, well_name=None):
-        """Create plot based on calculation type"""
+    def _plot_builders(self):
+        """Plot type -> builder(df, max_points) returning a figure result dict"""
+        return {
+            "default": self._create_default_log_plot,
+            "log": self._create_default_log_plot,
+            "vsh": self._create_vsh_plot,
+            "porosity": self._create_porosity_plot,
+            "gsa": self._create_gsa_plot,
+            "normalization": self._create_normalization_plot,
+            "sw": self._create_sw_plot,
+            "rwa": self._create_rwa_plot,
+            "smoothing": self._create_smoothing_plot,
+        }
+
+    def get_depth_window(self, well_name, top=None, bottom=None, resolution=None, plot_type="default"):
+        """Build the plot of one well restricted to the depth window [top, bottom].
+
+        Rows are sliced through the well's sorted-DEPTH index, so the cost
+        depends on the window size rather than the well length. `resolution`
+        is the points-per-curve budget for the window (see _plot_max_points).
+        """
         try:
-            if self.current_well_data is None:
+            if self.well_store is None:
                 return {"status": "error", "message": "No dataset selected"}
+            if not self.well_store.has_well(well_name):
+                return {"status": "error", "message": f"Well {well_name} not found"}
+
+            builders = self._plot_builders()
+            if plot_type not in builders:
+                return {"status": "error", "message": f"Unknown plot type: {plot_type}"}
+
+            top = float(top) if top is not None else None
+            bottom = float(bottom) if bottom is not None else None
+            if top is not None and bottom is not None and top > bottom:
+                top, bottom = bottom, top
+
+            max_points = self._plot_max_points(resolution)
+            df = self._well_plot_frame(well_name, max_points, top, bottom)
+            if df.empty:
+                return {"status": "error", "message": f"No data for well {well_name} between {top} and {bottom}"}
+
+            result = builders[plot_type](df, max_points)
+            if result.get("status") == "success":
+                result.update({
+                    "well_name": well_name,
+                    "top": float(df['DEPTH'].min()),
+                    "bottom": float(df['DEPTH'].max()),
+                    "rows": len(df),
+                })
+            return result
+        except Exception as e:
+            traceback.print_exc()
+            return {"status": "error", "message": f"Error creating depth window: {str(e)}"}
+
+    def create_plot_for_calculation(self, calculation_type, well_name=None, max_points=None):
+        """Create plot based on calculation type, decimated to max_points per curve"""
+        try:
+            if self.well_store is None:
+                return {"status": "error", "message": "No dataset selected"}
+            
+            builders = self._plot_builders()
+            if calculation_type not in builders:
+                return {"status": "error", "message": f"Unknown plot type: {calculation_type}"}
             
-            # Filter by well if specified
+            # "log" and "default" build the same figure
+            plot_type = "default" if calculation_type == "log" else calculation_type
+            max_points = self._plot_max_points(max_points)
+            cache_key = self._figure_cache_key(well_name, plot_type, max_points)
+            figure_json = self.figure_cache.get(cache_key) if cache_key else None
+            if figure_json is not None:
+                return {"status": "success", "figure_json": figure_json}
+            
+            # Filter by well if specified (single partition lookup)
             if well_name:
-                df = self.current_well_data[self.current_well_data['WELL_NAME'] == well_name]
+                df = self._well_plot_frame(well_name, max_points)
                 if df.empty:
                     return {"status": "error", "message": f"No data found for well {well_name}"}
             else:
-                df = self.current_well_data
+                df = self.well_store.to_pandas()
             
             # Create plot based on calculation type
-            if calculation_type in ["default", "log"]:
-                return self._create_default_log_plot(df)
-            elif calculation_type == "vsh":
-                return self._create_vsh_plot(df)
-            elif calculation_type == "porosity":
-                return self._create_porosity_plot(df)
-            elif calculation_type == "gsa":
-                return self._create_gsa_plot(df)
-            elif calculation_type == "normalization":
-                return self._create_normalization_plot(df)
-            elif calculation_type == "sw":
-                return self._create_sw_plot(df)
-            elif calculation_type == "rwa":
-                return self._create_rwa_plot(df)
-            elif calculation_type == "smoothing":
-                return self._create_smoothing_plot(df)
-            else:
-                return {"status": "error", "message": f"Unknown plot type: {calculation_type}"}
+            result = builders[calculation_type](df, max_points)
+            if cache_key and result.get("status") == "success":
+                self.figure_cache.put(cache_key, result["figure_json"])
+            return result
                 
         except Exception as e:
             return {"status": "error", "message": f"Error creating plot: {str(e)}"}
     
-    def _create_default_log_plot(self, df):
+    def _create_default_log_plot(self, df, max_points=None):
         """Create default log plot"""
         try:
             # Extract markers and ensure cross-plot normalized columns exist
@@ -658,116 +1040,262 @@ class WellLogAnalysis:
             fig = plot_log_default(
                 df=df_normalized,
                 df_marker=df_marker,
-                df_well_marker=df_normalized
+                df_well_marker=df_normalized,
+                max_points=max_points
             )
             
-            return {"status": "success", "figure": fig.to_dict()}
+            return {"status": "success", "figure_json": self._serialize_figure(fig)}
         except Exception as e:
             return {"status": "error", "message": f"Error creating default plot: {str(e)}"}
     
-    def _create_vsh_plot(self, df):
+    def _create_vsh_plot(self, df, max_points=None):
         """Create VSH plot"""
         try:
             vsh_col = 'VSH_LINEAR' if 'VSH_LINEAR' in df.columns else ('VSH_GR' if 'VSH_GR' in df.columns else None)
             if not vsh_col:
                 return {"status": "error", "message": "No VSH data found"}
             df_marker = extract_markers_with_mean_depth(df)
-            fig = plot_vsh_linear(df=df, df_marker=df_marker, df_well_marker=df)
+            fig = plot_vsh_linear(df=df, df_marker=df_marker, df_well_marker=df, max_points=max_points)
             
-            return {"status": "success", "figure": fig.to_dict()}
+            return {"status": "success", "figure_json": self._serialize_figure(fig)}
         except Exception as e:
             return {"status": "error", "message": f"Error creating VSH plot: {str(e)}"}
     
-    def _create_porosity_plot(self, df):
+    def _create_porosity_plot(self, df, max_points=None):
         """Create porosity plot"""
         try:
             required_cols = ['VSH', 'PHIE', 'PHIT', 'PHIE_DEN', 'PHIT_DEN']
             if not all(col in df.columns for col in required_cols):
                 return {"status": "error", "message": "Missing required porosity data"}
             df_marker = extract_markers_with_mean_depth(df)
-            fig = plot_phie_den(df=df, df_marker=df_marker, df_well_marker=df)
+            fig = plot_phie_den(df=df, df_marker=df_marker, df_well_marker=df, max_points=max_points)
             
-            return {"status": "success", "figure": fig.to_dict()}
+            return {"status": "success", "figure_json": self._serialize_figure(fig)}
         except Exception as e:
             return {"status": "error", "message": f"Error creating porosity plot: {str(e)}"}
     
-    def _create_gsa_plot(self, df):
+    def _create_gsa_plot(self, df, max_points=None):
         """Create GSA plot"""
         try:
             required_cols = ['RGSA', 'NGSA', 'DGSA']
             if not all(col in df.columns for col in required_cols):
                 return {"status": "error", "message": "Missing GSA data"}
-            fig = plot_gsa_main(df)
-            return {"status": "success", "figure": fig.to_dict()}
+            fig = plot_gsa_main(df, max_points=max_points)
+            return {"status": "success", "figure_json": self._serialize_figure(fig)}
         except Exception as e:
             return {"status": "error", "message": f"Error creating GSA plot: {str(e)}"}
     
-    def _create_normalization_plot(self, df):
+    def _create_normalization_plot(self, df, max_points=None):
         """Create normalization plot"""
         try:
             if 'GR_NORM' not in df.columns:
                 return {"status": "error", "message": "No normalization data found"}
             df_marker = extract_markers_with_mean_depth(df)
-            fig = plot_normalization(df=df, df_marker=df_marker, df_well_marker=df)
+            fig = plot_normalization(df=df, df_marker=df_marker, df_well_marker=df, max_points=max_points)
             
-            return {"status": "success", "figure": fig.to_dict()}
+            return {"status": "success", "figure_json": self._serialize_figure(fig)}
         except Exception as e:
             return {"status": "error", "message": f"Error creating normalization plot: {str(e)}"}
     
-    def _create_sw_plot(self, df):
+    def _create_sw_plot(self, df, max_points=None):
         """Create water saturation plot"""
         try:
             if 'SWE_INDO' not in df.columns and 'SW' not in df.columns:
                 return {"status": "error", "message": "Missing water saturation data"}
             df_marker = extract_markers_with_mean_depth(df)
-            fig = plot_sw_indo(df=df, df_marker=df_marker, df_well_marker=df)
+            fig = plot_sw_indo(df=df, df_marker=df_marker, df_well_marker=df, max_points=max_points)
             
-            return {"status": "success", "figure": fig.to_dict()}
+            return {"status": "success", "figure_json": self._serialize_figure(fig)}
         except Exception as e:
             return {"status": "error", "message": f"Error creating SW plot: {str(e)}"}
 
-    def _create_rwa_plot(self, df):
+    def _create_rwa_plot(self, df, max_points=None):
         """Create RWA plot"""
         try:
             required_cols = ['RWA_FULL', 'RWA_SIMPLE', 'RWA_TAR']
             if not all(col in df.columns for col in required_cols):
                 return {"status": "error", "message": "Missing RWA data"}
             df_marker = extract_markers_with_mean_depth(df)
-            fig = plot_rwa_indo(df=df, df_marker=df_marker, df_well_marker=df)
-            return {"status": "success", "figure": fig.to_dict()}
+            fig = plot_rwa_indo(df=df, df_marker=df_marker, df_well_marker=df, max_points=max_points)
+            return {"status": "success", "figure_json": self._serialize_figure(fig)}
         except Exception as e:
             return {"status": "error", "message": f"Error creating RWA plot: {str(e)}"}
 
-    def _create_smoothing_plot(self, df):
+    def _create_smoothing_plot(self, df, max_points=None):
         """Create smoothing plot"""
         try:
             required_cols = ['GR', 'GR_MovingAvg_5', 'GR_MovingAvg_10']
             if not all(col in df.columns for col in required_cols):
                 return {"status": "error", "message": "Missing smoothing data"}
             df_marker = extract_markers_with_mean_depth(df)
-            fig = plot_smoothing(df=df, df_marker=df_marker, df_well_marker=df)
-            return {"status": "success", "figure": fig.to_dict()}
+            fig = plot_smoothing(df=df, df_marker=df_marker, df_well_marker=df, max_points=max_points)
+            return {"status": "success", "figure_json": self._serialize_figure(fig)}
         except Exception as e:
             return {"status": "error", "message": f"Error creating smoothing plot: {str(e)}"}
 
-# Global instance for webapp session management
-_analysis_instance = None
+def _dumps_result(result):
+    """json.dumps for API results; a pre-serialized figure ("figure_json") is
+    spliced in verbatim instead of being decoded and re-encoded."""
+    figure_json = result.pop("figure_json", None)
+    if figure_json is None:
+        return json.dumps(result)
+    body = json.dumps(result)
+    return body[:-1] + (', ' if result else '') + '"figure": ' + figure_json + '}'
+
+# Per-session workspaces: every browser session forks the shared base
+# datasets and keeps its own derived columns; caches are shared because their
+# keys only use globally unique column versions
+SESSION_HEADER = 'X-Session-Id'
+DEFAULT_SESSION = 'default'
+_shared_datasets = SharedDatasets()
+_result_cache = LRUCache(max_bytes=512 * 1024 * 1024)
+_figure_cache = LRUCache(max_bytes=256 * 1024 * 1024)
+_calculation_outputs = {}
+
+def _new_workspace():
+    return WellLogAnalysis(datasets=_shared_datasets, result_cache=_result_cache,
+                           figure_cache=_figure_cache, calculation_outputs=_calculation_outputs)
+
+def _release_unused_datasets(evicted):
+    """Drop base datasets that no remaining workspace was forked from"""
+    _shared_datasets.retain(ws.base_dataset for ws in _workspaces.workspaces())
+    for session_id in evicted:
+        _progress.drop(session_id)
+
+_workspaces = SessionWorkspaces(_new_workspace, on_evict=_release_unused_datasets)
+
+def _session_id():
+    """Session of the current request: header sent by app.js, or ?session_id=
+    (EventSource cannot send headers); shared default otherwise"""
+    return (request.headers.get(SESSION_HEADER)
+            or request.args.get('session_id')
+            or DEFAULT_SESSION)
+
+_jobs = JobQueue()
+# Per-well progress events of each session, streamed by /progress_stream
+_progress = ProgressBroker()
+# An SSE response ends after this long; EventSource reconnects with Last-Event-ID
+PROGRESS_STREAM_SECONDS = 300
+
+def session_workspace(write=False):
+    """Workspace of the requesting session, read-locked (or write-locked) while in use"""
+    return _workspaces.use(_session_id(), write=write)
+
+def get_analysis_instance(session_id=DEFAULT_SESSION):
+    """Workspace of a session without holding its lock (scripts/notebooks)"""
+    with _workspaces.use(session_id) as analysis:
+        return analysis
+
+def _calculation_job(job, session_id, calculation_type, params, output_dataset=None,
+                     wells=None, intervals=None):
+    """Body of a background calculation job.
+
+    Each step (one well, or the whole scope for calculations that span
+    wells) holds the session's write lock only while it runs, so plot
+    requests of the session are served between steps.
+    """
+    with _workspaces.use(session_id) as analysis:
+        if analysis.well_store is None:
+            return {"status": "error", "message": "No dataset selected"}
+        dataset_version = analysis.dataset_version
+        scope = list(wells) if wells else analysis.well_store.wells
+    job.set_total(len(scope))
+
+    per_well = calculation_type in PER_WELL_CALCULATIONS and bool(scope)
+    steps = [[well] for well in scope] if per_well else [wells]
+    # Self-reporting services publish their own per-well events
+    self_reporting = calculation_type in SELF_REPORTING_CALCULATIONS
+    progress = _job_progress(job, session_id) if self_reporting else None
+    tracker = ProgressTracker(None if self_reporting else _progress.callback(session_id),
+                              calculation_type, len(steps), job_id=job.id)
+    results = []
+    try:
+        for step in steps:
+            job.check_cancelled()
+            step_wells = step if step is not None else scope
+            label = step_wells[0] if per_well else f"{len(step_wells)} wells"
+            if not self_reporting:
+                for well in step_wells:
+                    job.start_well(well)
+            tracker.well_started(label)
+            with _workspaces.use(session_id, write=True) as analysis:
+                if analysis.dataset_version != dataset_version:
+                    raise RuntimeError("Dataset changed while the calculation was running")
+                result = analysis.run_calculation(calculation_type, params, output_dataset,
+                                                  wells=step, intervals=intervals,
+                                                  progress=progress)
+            error = None if result.get("status") == "success" else result.get("message")
+            if not self_reporting:
+                for well in step_wells:
+                    job.finish_well(well, error)
+            tracker.well_finished(label, result.get("rows_processed", 0), error)
+            results.append(result)
+    except JobCancelled:
+        tracker.finished(error="cancelled")
+        raise
+    except Exception as e:
+        tracker.finished(error=str(e))
+        raise
+    tracker.finished()
+
+    succeeded = [r for r in results if r.get("status") == "success"]
+    if not succeeded:
+        return results[0] if results else {"status": "error", "message": "No wells to process"}
+    changed_columns = []
+    for r in succeeded:
+        changed_columns.extend(c for c in r.get("changed_columns", []) if c not in changed_columns)
+    return {
+        "status": "success",
+        "message": f"{calculation_type.upper()} calculation completed",
+        "calculation_type": calculation_type,
+        "rows_processed": sum(r.get("rows_processed", 0) for r in succeeded),
+        "changed_columns": changed_columns,
+        "wells": [w for r in succeeded for w in r.get("wells", [])],
+        "intervals": intervals or [],
+        "cached": all(r.get("cached") for r in succeeded),
+        "failed_wells": dict(job.failed_wells)
+    }
+
+def _job_progress(job, session_id):
+    """Progress callback for self-reporting services: publishes their per-well
+    events to the session's stream and mirrors them into the job status"""
+    publish = _progress.callback(session_id)
+    def callback(event):
+        event = dict(event, job_id=job.id)
+        if event.get("event") == "start" and event.get("total"):
+            job.set_total(event["total"])
+        elif event.get("event") == "well_start":
+            job.start_well(event.get("well"))
+        elif event.get("event") == "well_done":
+            job.finish_well(event.get("well"), event.get("error"))
+        publish(event)
+    return callback
+
+def _qc_job(job, session_id, files):
+    """Body of a background QC job; each LAS file is reported as one well"""
+    result = run_full_qc_pipeline(files, logging.getLogger(__name__),
+                                  progress=_job_progress(job, session_id))
+    return {
+        "status": "success",
+        "message": f"QC finished for {len(result['qc_summary'])} files",
+        "qc_summary": result["qc_summary"],
+        "output_files": result["output_files"]
+    }
 
-def get_analysis_instance():
-    """Get or create analysis instance"""
-    global _analysis_instance
-    if _analysis_instance is None:
-        _analysis_instance = WellLogAnalysis()
-    return _analysis_instance
+def _request_job():
+    """Job named by the request (JSON body or ?job_id=), if it belongs to the session"""
+    data = request.get_json(silent=True) or {}
+    job_id = data.get('job_id') or request.args.get('job_id')
+    return _jobs.get(job_id, owner=_session_id()) if job_id else None
 
 # API Endpoints for Dataiku WebApp
 @app.route('/get_datasets')
 def get_datasets():
     """API endpoint to get available datasets"""
     try:
-        analysis = get_analysis_instance()
-        result = analysis.get_available_datasets()
-        return json.dumps(result)
+        with session_workspace() as analysis:
+            result = analysis.get_available_datasets()
+            return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
 
@@ -777,9 +1305,9 @@ def select_dataset():
     try:
         data = request.get_json()
         dataset_name = data.get('dataset_name')
-        analysis = get_analysis_instance()
-        result = analysis.select_dataset(dataset_name)
-        return json.dumps(result)
+        with session_workspace(write=True) as analysis:
+            result = analysis.select_dataset(dataset_name)
+            return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
 
@@ -787,9 +1315,9 @@ def select_dataset():
 def get_wells():
     """API endpoint to get wells from selected dataset"""
     try:
-        analysis = get_analysis_instance()
-        result = analysis.get_well_list()
-        return json.dumps(result)
+        with session_workspace() as analysis:
+            result = analysis.get_well_list()
+            return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
 
@@ -799,9 +1327,9 @@ def get_well_plot():
     try:
         data = request.get_json()
         well_name = data.get('well_name')
-        analysis = get_analysis_instance()
-        result = analysis.create_log_plot(well_name)
-        return json.dumps(result)
+        with session_workspace() as analysis:
+            result = analysis.create_log_plot(well_name, data.get('max_points'))
+            return _dumps_result(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
 
@@ -811,22 +1339,114 @@ def get_calculation_params():
     try:
         data = request.get_json()
         calculation_type = data.get('calculation_type')
-        analysis = get_analysis_instance()
-        result = analysis.get_calculation_parameters(calculation_type)
-        return json.dumps(result)
+        with session_workspace() as analysis:
+            result = analysis.get_calculation_parameters(calculation_type)
+            return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
 
 @app.route('/run_calculation_endpoint', methods=['POST'])
 def run_calculation_endpoint():
-    """API endpoint to run calculation"""
+    """API endpoint to start a calculation as a background job.
+
+    Returns the job id at once; poll /job_status and fetch /job_result.
+    With "wait": true the calculation runs in the request (scripts).
+    """
     try:
         data = request.get_json()
         calculation_type = data.get('calculation_type')
         params = data.get('params', {})
         output_dataset = data.get('output_dataset')
-        analysis = get_analysis_instance()
-        result = analysis.run_calculation(calculation_type, params, output_dataset)
+        wells = data.get('wells') or None
+        intervals = data.get('intervals') or None
+        if data.get('wait'):
+            with session_workspace(write=True) as analysis:
+                result = analysis.run_calculation(calculation_type, params, output_dataset,
+                                                  wells=wells, intervals=intervals,
+                                                  progress=_progress.callback(_session_id()))
+            return json.dumps(result)
+        session_id = _session_id()
+        # The workspace must outlive the job, also between its locked steps
+        _workspaces.pin(session_id)
+        try:
+            job = _jobs.submit(_calculation_job, session_id, calculation_type, params, output_dataset,
+                               wells=wells, intervals=intervals, kind=calculation_type, owner=session_id)
+        except Exception:
+            _workspaces.unpin(session_id)
+            raise
+        # Runs when the job finishes or is cancelled before it started
+        job.future.add_done_callback(lambda _: _workspaces.unpin(session_id))
+        result = {"status": "success", "message": f"{calculation_type} calculation queued"}
+        result.update(job.status_dict())
+        return json.dumps(result)
+    except Exception as e:
+        return json.dumps({"status": "error", "message": str(e)})
+
+@app.route('/job_status', methods=['GET', 'POST'])
+def job_status():
+    """API endpoint to get the state and per-well progress of a job"""
+    try:
+        job = _request_job()
+        if job is None:
+            return json.dumps({"status": "error", "message": "Unknown job"})
+        result = {"status": "success"}
+        result.update(job.status_dict())
+        return json.dumps(result)
+    except Exception as e:
+        return json.dumps({"status": "error", "message": str(e)})
+
+@app.route('/job_result', methods=['GET', 'POST'])
+def job_result():
+    """API endpoint to get the result of a finished job"""
+    try:
+        job = _request_job()
+        if job is None:
+            return json.dumps({"status": "error", "message": "Unknown job"})
+        if not job.is_finished:
+            result = {"status": "pending", "message": f"Job is {job.status}"}
+            result.update(job.status_dict())
+            return json.dumps(result)
+        if job.status == COMPLETED:
+            result = dict(job.result or {})
+        else:
+            result = {"status": "error", "message": job.error or f"Job {job.status}"}
+        result["job_id"] = job.id
+        result["job_status"] = job.status
+        return json.dumps(result)
+    except Exception as e:
+        return json.dumps({"status": "error", "message": str(e)})
+
+@app.route('/cancel_job', methods=['POST'])
+def cancel_job():
+    """API endpoint to cancel a queued or running job (stops between wells)"""
+    try:
+        job = _request_job()
+        if job is None:
+            return json.dumps({"status": "error", "message": "Unknown job"})
+        _jobs.cancel(job.id)
+        result = {"status": "success"}
+        result.update(job.status_dict())
+        return json.dumps(result)
+    except Exception as e:
+        return json.dumps({"status": "error", "message": str(e)})
+
+@app.route('/run_qc', methods=['POST'])
+def run_qc():
+    """API endpoint to start the LAS quality-control pipeline as a background job.
+
+    Body: {"files": [{"name": ..., "content": ...}]} with the LAS files and
+    optional marker CSVs. Per-file progress goes to /progress_stream; poll
+    /job_status and fetch the QC summary and output CSVs from /job_result.
+    """
+    try:
+        data = request.get_json()
+        files = data.get('files') or []
+        if not any(f.get('name', '').lower().endswith('.las') for f in files):
+            return json.dumps({"status": "error", "message": "No LAS files provided"})
+        session_id = _session_id()
+        job = _jobs.submit(_qc_job, session_id, files, kind="qc", owner=session_id)
+        result = {"status": "success", "message": "QC queued"}
+        result.update(job.status_dict())
         return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
@@ -838,8 +1458,54 @@ def get_plot_for_calculation():
         data = request.get_json()
         calculation_type = data.get('calculation_type')
         well_name = data.get('well_name')
-        analysis = get_analysis_instance()
-        result = analysis.create_plot_for_calculation(calculation_type, well_name)
+        with session_workspace() as analysis:
+            result = analysis.create_plot_for_calculation(calculation_type, well_name, data.get('max_points'))
+            return _dumps_result(result)
+    except Exception as e:
+        return json.dumps({"status": "error", "message": str(e)})
+
+@app.route('/get_depth_window', methods=['POST'])
+def get_depth_window():
+    """API endpoint to get the plot of a well for a depth window"""
+    try:
+        data = request.get_json()
+        with session_workspace() as analysis:
+            result = analysis.get_depth_window(
+                data.get('well'),
+                top=data.get('top'),
+                bottom=data.get('bottom'),
+                resolution=data.get('resolution'),
+                plot_type=data.get('plot_type', 'default')
+            )
+            return _dumps_result(result)
+    except Exception as e:
+        return json.dumps({"status": "error", "message": str(e)})
+
+def _progress_events(events):
+    yield 'retry: 3000\n\n'
+    for entry in events:
+        yield sse_message(entry)
+
+@app.route('/progress_stream')
+def progress_stream():
+    """Server-sent events: per-well progress (index, elapsed, rows/s) of the session's jobs"""
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    events = _progress.subscribe(_session_id(),
+                                 int(last_event_id) if last_event_id.isdigit() else None,
+                                 max_seconds=PROGRESS_STREAM_SECONDS)
+    return Response(stream_with_context(_progress_events(events)),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/get_cache_stats')
+def get_cache_stats():
+    """API endpoint to get cache hit/miss statistics"""
+    try:
+        with session_workspace() as analysis:
+            result = analysis.get_cache_stats()
+        result["sessions"] = _workspaces.stats()
+        result["shared_datasets"] = _shared_datasets.stats()["datasets"]
+        result["jobs"] = _jobs.stats()
         return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
@@ -848,9 +1514,9 @@ def get_plot_for_calculation():
 def get_markers():
     """API endpoint to get markers"""
     try:
-        analysis = get_analysis_instance()
-        result = analysis.get_markers_list()
-        return json.dumps(result)
+        with session_workspace() as analysis:
+            result = analysis.get_markers_list()
+            return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
 
@@ -858,9 +1524,9 @@ def get_markers():
 def get_dataset_info():
     """API endpoint to get dataset info"""
     try:
-        analysis = get_analysis_instance()
-        result = analysis.get_dataset_info()
-        return json.dumps(result)
+        with session_workspace() as analysis:
+            result = analysis.get_dataset_info()
+            return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
 
@@ -868,9 +1534,9 @@ def get_dataset_info():
 def get_available_columns():
     """API endpoint to get available columns"""
     try:
-        analysis = get_analysis_instance()
-        result = analysis.get_available_columns()
-        return json.dumps(result)
+        with session_workspace() as analysis:
+            result = analysis.get_available_columns()
+            return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
 
@@ -880,9 +1546,9 @@ def validate_calculation():
     try:
         data = request.get_json()
         calculation_type = data.get('calculation_type')
-        analysis = get_analysis_instance()
-        result = analysis.validate_calculation_requirements(calculation_type)
-        return json.dumps(result)
+        with session_workspace() as analysis:
+            result = analysis.validate_calculation_requirements(calculation_type)
+            return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
 
@@ -893,9 +1559,9 @@ def save_dataset():
         data = request.get_json()
         dataset_name = data.get('dataset_name')
         dataset_data = data.get('data')
-        analysis = get_analysis_instance()
-        result = analysis.save_results_to_new_dataset(dataset_name, dataset_data)
-        return json.dumps(result)
+        with session_workspace() as analysis:
+            result = analysis.save_results_to_new_dataset(dataset_name, dataset_data)
+            return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
 
@@ -903,28 +1569,28 @@ def save_dataset():
 def get_current_status():
     """Get current dataset and well loading status"""
     try:
-        analysis = get_analysis_instance()
-        if not analysis.current_dataset:
+        with session_workspace() as analysis:
+            if not analysis.current_dataset:
+                return json.dumps({
+                    "status": "success",
+                    "dataset_loaded": False,
+                    "message": "No dataset currently loaded"
+                })
+            wells = []
+            markers = []
+            if analysis.well_store is not None:
+                wells = analysis.well_store.wells
+                markers = analysis.well_store.unique_values('MARKER')
             return json.dumps({
                 "status": "success",
-                "dataset_loaded": False,
-                "message": "No dataset currently loaded"
+                "dataset_loaded": True,
+                "current_dataset": analysis.current_dataset,
+                "wells": wells,
+                "well_count": len(wells),
+                "markers": markers,
+                "marker_count": len(markers),
+                "total_rows": analysis.well_store.num_rows if analysis.well_store is not None else 0
             })
-        wells = []
-        markers = []
-        if analysis.current_well_data is not None:
-            wells = analysis.current_well_data['WELL_NAME'].unique().tolist() if 'WELL_NAME' in analysis.current_well_data.columns else []
-            markers = analysis.current_well_data['MARKER'].unique().tolist() if 'MARKER' in analysis.current_well_data.columns else []
-        return json.dumps({
-            "status": "success",
-            "dataset_loaded": True,
-            "current_dataset": analysis.current_dataset,
-            "wells": wells,
-            "well_count": len(wells),
-            "markers": markers,
-            "marker_count": len(markers),
-            "total_rows": len(analysis.current_well_data) if analysis.current_well_data is not None else 0
-        })
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})
 
@@ -932,24 +1598,24 @@ def get_current_status():
 def first_api_call():
     """First API call endpoint for webapp initialization"""
     try:
-        analysis = get_analysis_instance()
+        with session_workspace() as analysis:
         
-        result = {
-            "status": "success",
-            "message": "Well Log Analysis backend is running",
-            "timestamp": datetime.now().isoformat(),
-            "backend_version": "1.0.0",
-            "current_dataset": analysis.current_dataset,
-            "dataset_loaded": analysis.current_dataset is not None
-        }
+            result = {
+                "status": "success",
+                "message": "Well Log Analysis backend is running",
+                "timestamp": datetime.now().isoformat(),
+                "backend_version": "1.0.0",
+                "current_dataset": analysis.current_dataset,
+                "dataset_loaded": analysis.current_dataset is not None
+            }
         
-        # If dataset is loaded, include basic info
-        if analysis.current_dataset and analysis.current_well_data is not None:
-            wells = analysis.current_well_data['WELL_NAME'].unique().tolist() if 'WELL_NAME' in analysis.current_well_data.columns else []
-            result["wells"] = wells
-            result["well_count"] = len(wells)
-            result["total_rows"] = len(analysis.current_well_data)
+            # If dataset is loaded, include basic info
+            if analysis.current_dataset and analysis.well_store is not None:
+                wells = analysis.well_store.wells
+                result["wells"] = wells
+                result["well_count"] = len(wells)
+                result["total_rows"] = analysis.well_store.num_rows
         
-        return json.dumps(result)
+            return json.dumps(result)
     except Exception as e:
         return json.dumps({"status": "error", "message": str(e)})